@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""증분 문장 분리 벤치마크: 버퍼가 길어져도 flush 당 분리 비용이 일정한지 확인.
+
+마침표 없는 긴 독백을 STT delta(단어 하나씩)로 SentenceSeparator 에 흘려 넣고,
+버퍼 길이 구간별로 flush 한 번에 분리기에 넘어간 글자 수와 분리 시간을 잰다.
+  - full        : 매 flush 마다 버퍼 전체를 다시 분리 (split_lookback_chars 무한대)
+  - incremental : 이미 확인한 꼬리는 lookback 만큼만 다시 분리 (기본값)
+
+기본은 KSS 없이 순수 파이썬 분리기(입력 길이에 비례하는 비용)를 쓰고,
+--kss 를 주면 실제 KSS 로 잰다.
+
+실행:
+  cd services/python && uv run python ../../scripts/bench_incremental_split.py [--kss]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "python"))
+
+from src.dto.translationDto import TranslationRequestDto  # noqa: E402
+from src.separator.kss_separator import SentenceSeparator  # noqa: E402
+
+WORDS = ['오늘', '우리가', '함께', '읽을', '본문은', '요한복음', '삼장', '십육절', '말씀과',
+         '하나님이', '세상을', '이처럼', '사랑하사', '독생자를', '주셨으니']
+BUCKETS = (250, 500, 1000, 2000, 4000)
+
+
+def python_split(text: str) -> list[str]:
+    """KSS 대용: 글자 단위로 훑어 마침표에서 자른다 (입력 길이에 비례)."""
+    out, buf = [], []
+    for ch in text:
+        buf.append(ch)
+        if ch == '.':
+            out.append(''.join(buf))
+            buf = []
+    if buf:
+        out.append(''.join(buf))
+    return out
+
+
+class TimedSplitter:
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.samples: list[tuple[int, float]] = []  # (입력 길이, 초)
+
+    def __call__(self, text: str) -> list[str]:
+        started = time.perf_counter()
+        try:
+            return self.inner(text)
+        finally:
+            self.samples.append((len(text), time.perf_counter() - started))
+
+
+class NullPusher:
+    async def push_to_client(self, *args, **kwargs) -> None:
+        return None
+
+
+class NullTranslator:
+    async def translate(self, source_text, target_language):
+        return source_text
+
+
+async def run(lookback: int, use_kss: bool, words: int) -> list[tuple[int, int, float]]:
+    if use_kss:
+        separator = SentenceSeparator(NullTranslator(), NullPusher(), split_lookback_chars=lookback)
+        splitter = TimedSplitter(separator.splitter)
+    else:
+        with mock.patch('src.separator.kss_separator.Kss'):
+            separator = SentenceSeparator(NullTranslator(), NullPusher(), split_lookback_chars=lookback)
+        splitter = TimedSplitter(python_split)
+    separator.splitter = splitter
+    # 타임아웃 flush 가 끼어들지 않도록.
+    separator._flush_timeout = 3600
+
+    await separator.start()
+    buffer_len = 0
+    rows = []
+    try:
+        for i in range(words):
+            delta = WORDS[i % len(WORDS)] if i == 0 else ' ' + WORDS[i % len(WORDS)]
+            buffer_len += len(delta)
+            await separator.offer(TranslationRequestDto('bench', 1, i + 1, delta, 'en-US', 'ko-KR', 0.9))
+            # 분리가 끝나고 꼬리가 버퍼에 다시 합쳐질 때까지 기다린다.
+            while (len(splitter.samples) < i + 1
+                   or not separator.state_by_key[('bench', 1)].buffer):
+                await asyncio.sleep(0)
+            chars, seconds = splitter.samples[-1]
+            rows.append((buffer_len, chars, seconds))
+    finally:
+        await separator.stop()
+    return rows
+
+
+def summarize(rows: list[tuple[int, int, float]]) -> dict[int, tuple[float, float]]:
+    out = {}
+    for bucket in BUCKETS:
+        window = [(c, s) for length, c, s in rows if bucket * 0.9 <= length <= bucket * 1.1]
+        if window:
+            out[bucket] = (
+                sum(c for c, _ in window) / len(window),
+                sum(s for _, s in window) / len(window) * 1e6,
+            )
+    return out
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--kss', action='store_true', help='실제 KSS 로 분리')
+    parser.add_argument('--words', type=int, default=1200)
+    args = parser.parse_args()
+
+    full = summarize(await run(10**9, args.kss, args.words))
+    incremental = summarize(await run(64, args.kss, args.words))
+    print(f'{"buffer":>8} | {"full chars":>10} {"full µs":>9} | {"incr chars":>10} {"incr µs":>9}')
+    for bucket in BUCKETS:
+        if bucket in full and bucket in incremental:
+            fc, fs = full[bucket]
+            ic, is_ = incremental[bucket]
+            print(f'{bucket:>8} | {fc:>10.0f} {fs:>9.1f} | {ic:>10.0f} {is_:>9.1f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
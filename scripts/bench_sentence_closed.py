@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""_is_sentence_closed 마이크로벤치마크: 정규식 18회 검사 vs 단일 패스 접미사 검사.
+
+flush 마다 세그먼트별로 호출되는 함수라, 이전 구현(미컴파일 패턴 re.search 최대
+18회)과 현재 구현(str.endswith 한 번)을 같은 한국어 입력으로 돌려 호출당
+시간을 비교한다. 두 구현의 결과가 모두 같은지도 함께 확인한다.
+
+실행:
+  cd services/python && uv run python ../../scripts/bench_sentence_closed.py
+"""
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "python"))
+
+from src.separator.kss_separator import _is_sentence_closed  # noqa: E402
+
+
+def legacy_is_sentence_closed(text: str) -> bool:
+    text = text.strip()
+    if not text:
+        return False
+    if re.search(r'[\.!\?…]\s*$', text):
+        return True
+    endings = [
+        r'[다요죠네]\s*$', r'어요\s*$', r'아요\s*$', r'는데요\s*$', r'은데요\s*$',
+        r'습니다\s*$', r'습니까\s*$', r'지요\s*$', r'게요\s*$', r'을게요\s*$',
+        r'을까요\s*$', r'으니까요\s*$', r'네요\s*$', r'인데요\s*$', r'래요\s*$',
+        r'거예요\s*$', r'니다\s*$',
+    ]
+    for ending in endings:
+        if re.search(ending, text):
+            return True
+    return False
+
+
+WORDS = ['오늘', '예배에', '오신', '여러분을', '하나님께서', '말씀하시기를', '우리가',
+         '함께', '기도하겠습니다', '찬양합니다', '그리고', '본문은', '요한복음', '3장']
+ENDINGS = ['', '.', '?', '습니다', '습니까', '요', '는데', '고', ' ']
+
+
+def corpus(size: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choices(WORDS, k=rng.randint(2, 30))) + rng.choice(ENDINGS)
+        for _ in range(size)
+    ]
+
+
+def main() -> None:
+    texts = corpus(2000)
+    mismatches = [t for t in texts if legacy_is_sentence_closed(t) != _is_sentence_closed(t)]
+    if mismatches:
+        print(f'MISMATCH: {len(mismatches)} inputs, e.g. {mismatches[0]!r}')
+        sys.exit(1)
+
+    for name, fn in [('legacy regex', legacy_is_sentence_closed), ('suffix tuple', _is_sentence_closed)]:
+        best = min(timeit.repeat(lambda: [fn(t) for t in texts], number=20, repeat=5))
+        print(f'{name:>13}: {best / (20 * len(texts)) * 1e9:8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""타임아웃 sweeper 벤치마크: 주기적 전체 스캔 vs 데드라인 힙.
+
+살아 있는 세그먼트 수천 개(대부분 버퍼가 빈 idle 세그먼트, 일부는 주기적으로
+delta 를 받는 active 세그먼트)를 만들어 놓고 같은 트래픽을 두 방식으로 돌린다.
+  - scan : flush_timeout/4 마다 깨어나 state_by_key 전체를 훑던 이전 구현
+  - heap : 다음 실제 데드라인까지 잠드는 현재 구현 (TimerHeap)
+sweeper 가 깨어난 횟수, 들여다본 세그먼트 수, 그리고 그동안 쓴 프로세스 CPU
+시간을 비교한다.
+
+실행:
+  cd services/python && uv run python ../../scripts/bench_timeout_sweeper.py \\
+      [--idle 5000] [--active 500] [--seconds 6]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "python"))
+
+from src.dto.translationDto import TranslationRequestDto  # noqa: E402
+from src.separator.kss_separator import SegmentState, SentenceSeparator  # noqa: E402
+
+FLUSH_TIMEOUT = 2.0
+DELTA_INTERVAL = 0.5
+
+
+class Counters:
+    def __init__(self) -> None:
+        self.wakeups = 0
+        self.inspected = 0
+
+
+class NullPusher:
+    async def push_to_client(self, *args, **kwargs) -> None:
+        return None
+
+
+class NullTranslator:
+    async def translate(self, source_text, target_language):
+        return source_text
+
+
+def never_closed(text: str) -> list[str]:
+    # 끝나지 않은 문장으로 남겨서 active 세그먼트가 버퍼를 계속 들고 있게 한다.
+    return [text]
+
+
+async def legacy_sweeper(self: SentenceSeparator, counters: Counters) -> None:
+    interval = max(self._flush_timeout / 4, 0.05)
+    while not self._stop:
+        await asyncio.sleep(interval)
+        counters.wakeups += 1
+        now = asyncio.get_running_loop().time()
+        for state in list(self.state_by_key.values()):
+            counters.inspected += 1
+            if not state.buffer.strip():
+                continue
+            if now - state.last_appended_at < self._flush_timeout:
+                continue
+            state.force_closed = True
+            state.last_appended_at = now
+            self._lane(state.session_id).dirty.mark(state)
+
+
+def instrument_heap(separator: SentenceSeparator, counters: Counters) -> None:
+    next_due = separator._timers.next_due
+    on_deadline = separator._on_deadline
+
+    async def counted_next_due():
+        due = await next_due()
+        counters.wakeups += 1
+        return due
+
+    def counted_on_deadline(kind, state, now):
+        counters.inspected += 1
+        on_deadline(kind, state, now)
+
+    separator._timers.next_due = counted_next_due
+    separator._on_deadline = counted_on_deadline
+
+
+async def run(mode: str, idle: int, active: int, seconds: float) -> tuple[Counters, float]:
+    with mock.patch('src.separator.kss_separator.Kss'):
+        separator = SentenceSeparator(NullTranslator(), NullPusher(), flush_timeout_seconds=FLUSH_TIMEOUT)
+    separator.splitter = never_closed
+    counters = Counters()
+    if mode == 'scan':
+        separator._timeout_sweeper = lambda: legacy_sweeper(separator, counters)
+    else:
+        instrument_heap(separator, counters)
+
+    for i in range(idle):
+        separator.state_by_key[(f'idle-{i}', 1)] = SegmentState(session_id=f'idle-{i}', segment_id=1)
+
+    await separator.start()
+    loop = asyncio.get_running_loop()
+    cpu_started = time.process_time()
+    deadline = loop.time() + seconds
+    sequence = 0
+    try:
+        while loop.time() < deadline:
+            sequence += 1
+            for i in range(active):
+                await separator.offer(TranslationRequestDto(
+                    f'active-{i}', 1, sequence, f' 단어{sequence}', 'en-US', 'ko-KR', 0.9))
+            await asyncio.sleep(DELTA_INTERVAL)
+    finally:
+        cpu = time.process_time() - cpu_started
+        await separator.stop()
+    return counters, cpu
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--idle', type=int, default=5000)
+    parser.add_argument('--active', type=int, default=500)
+    parser.add_argument('--seconds', type=float, default=6.0)
+    args = parser.parse_args()
+
+    print(f'{args.idle} idle + {args.active} active segments, {args.seconds:.0f}s, '
+          f'flush_timeout={FLUSH_TIMEOUT}s, delta every {DELTA_INTERVAL}s')
+    print(f'{"mode":>5} | {"wakeups":>8} {"inspected":>10} {"cpu s":>7}')
+    for mode in ('scan', 'heap'):
+        # 두 번 돌려 CPU 시간이 적은 쪽을 쓴다 (첫 실행의 워밍업 잡음 제거).
+        counters, cpu = min(
+            [await run(mode, args.idle, args.active, args.seconds) for _ in range(2)],
+            key=lambda result: result[1])
+        print(f'{mode:>5} | {counters.wakeups:>8} {counters.inspected:>10} {cpu:>7.3f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""전사 메시지 디코딩 마이크로벤치마크: 메시지 한 건당 디코딩 비용 비교.
+
+실제와 비슷한 크기의 전사 메시지(짧은 delta ~ 긴 문장)를 미리 인코딩해 두고
+디코딩만 반복해 잰다.
+  - legacy  : 이전 구현 (bytes.decode + json.loads + 일반 dataclass)
+  - json    : codec 의 stdlib 경로 (orjson 이 없을 때) + slots DTO
+  - orjson  : codec 의 기본 JSON 경로 (bytes 를 바로 파싱) + slots DTO
+  - msgpack : Content-Type: application/msgpack 경로 (msgpack 이 있을 때만)
+
+실행:
+  cd services/python && uv run --extra codecs python ../../scripts/bench_wire_codec.py \\
+      [--messages 2000] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "python"))
+
+from src.consumer import codec  # noqa: E402
+from src.dto.translationDto import TranslationRequestDto  # noqa: E402
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+TEXTS = ['오늘', ' 우리가 함께', ' 읽을 본문은 요한복음 삼장 십육절 말씀입니다.',
+         ' 하나님이 세상을 이처럼 사랑하사 독생자를 주셨으니 이는 그를 믿는 자마다 멸망하지 않고 영생을 얻게 하려 하심이라.']
+
+
+@dataclass
+class LegacyDto:
+    session_id: str
+    segment_id: int
+    sequence: int
+    source_text: str
+    target_lang: str
+    source_lang: str
+    confidence: float = 0.0
+
+
+def legacy_decode(raw: bytes, headers=None) -> LegacyDto:
+    data = json.loads(raw.decode('utf-8'))
+    return LegacyDto(data["sessionId"], data["segmentId"], data["sequence"],
+                     data["transcriptText"], data["targetLanguage"], data.get("sourceLanguage"))
+
+
+def stdlib_decode(raw: bytes, headers=None) -> TranslationRequestDto:
+    data = codec._loads_json_stdlib(raw)
+    return TranslationRequestDto(data["sessionId"], data["segmentId"], data["sequence"],
+                                 data["transcriptText"], data["targetLanguage"], data.get("sourceLanguage"))
+
+
+def messages(count: int) -> list[dict]:
+    return [{
+        'sessionId': f'session-{i % 8}', 'segmentId': i // 20, 'sequence': i,
+        'transcriptText': TEXTS[i % len(TEXTS)], 'targetLanguage': 'en-US', 'sourceLanguage': 'ko-KR',
+    } for i in range(count)]
+
+
+def per_message_us(decode, payloads: list[bytes], headers, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for raw in payloads:
+            decode(raw, headers)
+        best = min(best, time.perf_counter() - started)
+    return best / len(payloads) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = messages(args.messages)
+    as_json = [json.dumps(m).encode('utf-8') for m in corpus]
+    json_bytes = sum(map(len, as_json)) / len(as_json)
+    cases = [('legacy', legacy_decode, as_json, None, json_bytes),
+             ('json', stdlib_decode, as_json, None, json_bytes)]
+    if codec.orjson is not None:
+        cases.append(('orjson', codec.decode_request, as_json, None, json_bytes))
+    if msgpack is not None:
+        as_msgpack = [msgpack.packb(m) for m in corpus]
+        cases.append(('msgpack', codec.decode_request, as_msgpack,
+                      {'Content-Type': codec.MSGPACK}, sum(map(len, as_msgpack)) / len(as_msgpack)))
+
+    print(f'{args.messages} messages, best of {args.repeat}')
+    print(f'{"codec":>8} | {"µs/msg":>7} {"bytes/msg":>9} {"vs legacy":>9}')
+    baseline = None
+    for name, decode, payloads, headers, size in cases:
+        us = per_message_us(decode, payloads, headers, args.repeat)
+        baseline = baseline or us
+        print(f'{name:>8} | {us:>7.2f} {size:>9.0f} {baseline / us:>8.2f}x')
+    missing = [name for name, mod in (('orjson', codec.orjson), ('msgpack', msgpack)) if mod is None]
+    if missing:
+        print('not installed (skipped):', ', '.join(missing))
+
+
+if __name__ == '__main__':
+    main()
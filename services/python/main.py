@@ -20,9 +20,23 @@ from prometheus_client import CONTENT_TYPE_LATEST, Counter, generate_latest
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.compose import build
-from src.config import get_nats_config, get_deepl_config, get_ws_url
+from src.config import (
+    get_clause_split_config,
+    get_consumer_config,
+    get_consumer_partition_config,
+    get_deepl_rate_limit_config,
+    get_nats_config,
+    get_separator_flush_config,
+    get_splitter_config,
+    get_translation_batch_config,
+    get_translation_cache_config,
+    get_translation_memory_config,
+    get_translation_resilience_config,
+    get_translation_speculation_config,
+    get_translator_config,
+    get_ws_url,
+)
 from src.database.pool import Db
-from src.deepL.deepL import DeeplTranslationService
 from src.pushClient.pusher import Pusher
 from src.repository.implementation import monitor_query_repository as mq
 from src.repository.implementation.translation_repository import (
@@ -30,6 +44,13 @@ from src.repository.implementation.translation_repository import (
     end_session,
 )
 from src.separator.kss_separator import SentenceSeparator
+from src.separator.split_backends import ProcessPoolSplitter
+from src.translation.batcher import BatchingTranslator
+from src.translation.cache import CachingTranslator
+from src.translation.memory import TranslationMemoryTranslator
+from src.translation.ratelimit import RateLimitedTranslator
+from src.translation.registry import create_translator
+from src.translation.resilience import ResilientTranslator
 from src.ws.monitor import MonitorHub
 from src.ws.websocket import WebSocketHub
 
@@ -50,8 +71,21 @@ async def lifespan(app: FastAPI):
 
     try:
         app.state.nats_config = get_nats_config()
-        app.state.deepl_config = get_deepl_config()
+        app.state.consumer_config = get_consumer_config()
+        app.state.consumer_partition_config = get_consumer_partition_config()
+        # DEEPL_API_KEY(S) is read by the "deepl" backend factory itself, so an
+        # offline (load-test) run does not need it.
+        app.state.translator_config = get_translator_config()
         app.state.get_ws_config = get_ws_url()
+        app.state.translation_cache_config = get_translation_cache_config()
+        app.state.translation_memory_config = get_translation_memory_config()
+        app.state.translation_batch_config = get_translation_batch_config()
+        app.state.translation_resilience_config = get_translation_resilience_config()
+        app.state.deepl_rate_limit_config = get_deepl_rate_limit_config()
+        app.state.translation_speculation_config = get_translation_speculation_config()
+        app.state.splitter_config = get_splitter_config()
+        app.state.separator_flush_config = get_separator_flush_config()
+        app.state.clause_split_config = get_clause_split_config()
 
         # DB pool (asyncpg). get_postgres_config() uses require_env, so
         # missing POSTGRES_* env vars fail fast here — same policy as
@@ -61,16 +95,82 @@ async def lifespan(app: FastAPI):
         app.state.db_pool = await db.create_pool()
         print(">>> lifespan : db pool created")
 
-        deepl_api = app.state.deepl_config['deepl_api_key']
-
         hub = WebSocketHub()
         monitor_hub = MonitorHub()
-        translator = DeeplTranslationService(deepl_api)
+        # separator → in-process cache → persistent TM → batcher →
+        # timeouts/hedging/retries/breaker → AIMD rate limiter → backend
+        # (DeepL, or the offline pseudo-translator under TRANSLATOR_BACKEND).
+        # The limiter is innermost so hedges and retries are paced too; its
+        # queueing does not count against attempt timeouts, hedge delays or
+        # the breaker.
+        batch_config = app.state.translation_batch_config
+        resilience_config = app.state.translation_resilience_config
+        rate_limit_config = app.state.deepl_rate_limit_config
+        # The separator already waits out the batch window; the batcher only
+        # needs to catch calls released together (after a TM lookup), hence
+        # its own much shorter settle window.
+        translator = BatchingTranslator(
+            ResilientTranslator(
+                RateLimitedTranslator(
+                    create_translator(app.state.translator_config["backend"]),
+                    max_concurrency=int(rate_limit_config["max_concurrency"]),
+                    initial_concurrency=int(rate_limit_config["initial_concurrency"]),
+                    max_chars_per_second=rate_limit_config["max_chars_per_second"],
+                ),
+                attempt_timeout_seconds=resilience_config["attempt_timeout_seconds"],
+                max_attempts=int(resilience_config["max_attempts"]),
+                hedging_enabled=bool(resilience_config["hedging_enabled"]),
+                hedge_quantile=resilience_config["hedge_quantile"],
+                breaker_failure_threshold=int(resilience_config["breaker_failure_threshold"]),
+                breaker_reset_seconds=resilience_config["breaker_reset_seconds"],
+            ),
+            window_seconds=0.005,
+            max_batch_size=int(batch_config["max_size"]),
+        )
+        if app.state.translation_memory_config["enabled"]:
+            translator = TranslationMemoryTranslator(translator, app.state.db_pool)
+        cache_config = app.state.translation_cache_config
+        translator = CachingTranslator(
+            translator,
+            max_entries=int(cache_config["max_entries"]),
+            ttl_seconds=cache_config["ttl_seconds"],
+        )
         pusher = Pusher(hub, monitor_hub=monitor_hub, db_pool=app.state.db_pool)
+        speculation_config = app.state.translation_speculation_config
+        flush_config = app.state.separator_flush_config
+        clause_config = app.state.clause_split_config
+        clause_split = bool(clause_config["enabled"])
+
+        split_backend = None
+        if app.state.splitter_config["backend"] == "process":
+            split_backend = ProcessPoolSplitter(
+                workers=int(app.state.splitter_config["process_workers"]))
+            app.state.split_backend = split_backend
+            # Blocks until every worker has KSS/mecab loaded.
+            await split_backend.start()
+            print(">>> lifespan : kss worker processes ready")
 
         separator = SentenceSeparator(
             translator=translator,
-            pusher=pusher
+            pusher=pusher,
+            flush_timeout_seconds=flush_config["timeout_seconds"],
+            adaptive_flush_timeout=bool(flush_config["adaptive"]),
+            flush_timeout_quantile=flush_config["quantile"],
+            flush_timeout_min_seconds=flush_config["min_seconds"],
+            flush_timeout_max_seconds=flush_config["max_seconds"],
+            lane_idle_seconds=flush_config["lane_idle_seconds"] or None,
+            clause_max_chars=(int(clause_config["max_chars"]) or None) if clause_split else None,
+            clause_max_age_seconds=(clause_config["max_age_seconds"] or None) if clause_split else None,
+            clause_min_chars=int(clause_config["min_chars"]),
+            batch_window_seconds=batch_config["window_seconds"],
+            max_batch_size=int(batch_config["max_size"]),
+            translation_workers=int(batch_config["workers"]),
+            translation_deadline_seconds=resilience_config["deadline_seconds"],
+            speculative_translation=bool(speculation_config["enabled"]),
+            speculation_idle_seconds=speculation_config["idle_seconds"],
+            speculation_min_chars=int(speculation_config["min_chars"]),
+            split_backend=split_backend,
+            fast_path_split=bool(app.state.splitter_config["fast_path"]),
         )
 
         app.state.hub = hub
@@ -93,7 +193,9 @@ async def lifespan(app: FastAPI):
             build(
                 app.state.hub,
                 app.state.separator,
-                app.state.nats_config)
+                app.state.nats_config,
+                app.state.consumer_config,
+                app.state.consumer_partition_config)
         )
         app.state.consumer_task.add_done_callback(_log_task_result)
 
@@ -112,18 +214,35 @@ async def lifespan(app: FastAPI):
         raise
 
     finally:
+        # Consumer first: it stops intake and, in partitioned mode, hands its
+        # partitions over before the separator it feeds shuts down.
+        consumer_task = getattr(app.state, "consumer_task", None)
+        if consumer_task:
+            if not consumer_task.done():
+                consumer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await consumer_task
+
         if getattr(app.state, "separator", None):
             with contextlib.suppress(Exception):
                 await app.state.separator.stop()
 
-        for task in (getattr(app.state, "consumer_task", None), getattr(app.state, "separator_task", None)):
-            if task and not task.done():
-                task.cancel()
+        separator_task = getattr(app.state, "separator_task", None)
+        if separator_task:
+            if not separator_task.done():
+                separator_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await separator_task
+
+        if getattr(app.state, "split_backend", None):
+            with contextlib.suppress(Exception):
+                await app.state.split_backend.aclose()
 
-        for task in (getattr(app.state, "consumer_task", None), getattr(app.state, "separator_task", None)):
-            if task:
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        # Release the translator's keep-alive connection pool after the
+        # separator (its only caller) has stopped.
+        if getattr(app.state, "translator", None):
+            with contextlib.suppress(Exception):
+                await app.state.translator.aclose()
 
         if getattr(app.state, "db", None):
             with contextlib.suppress(Exception):
@@ -136,6 +255,11 @@ class StartRequest(BaseModel):
     session_id: str = Field(alias="sessionId")
     source_lang: str = Field(alias="sourceLang")
     target_lang: str = Field(alias="targetLang")
+    # Opt-out of the in-process translation cache for this session.
+    translation_cache: bool = Field(default=True, alias="translationCache")
+    # Every language the congregation needs. targetLang stays the primary
+    # (slot client) language; the others are served to /ws?lang= clients.
+    target_langs: list[str] | None = Field(default=None, alias="targetLangs")
 
 
 class StartResponse(BaseModel):
@@ -360,6 +484,12 @@ async def start_session(req: StartRequest, request: Request):
         except Exception as e:
             print("start_session: ensure_session failed (ignored):", repr(e))
 
+    separator = getattr(request.app.state, "separator", None)
+    if separator is not None:
+        separator.set_translation_cache(req.session_id, req.translation_cache)
+        separator.set_target_languages(
+            req.session_id, [req.target_lang, *(req.target_langs or [])])
+
     return StartResponse(**{"sessionId": req.session_id, "webSocketUrl": webSocket_url})
 
 
@@ -393,6 +523,8 @@ async def stop_session(req: StopRequest, request: Request):
     # Session-aware detach: a stop for a stale session cannot close the
     # socket owned by the currently live session.
     await hub.detach(req.session_id)
+    # Only an explicit stop ends the session for its /ws?lang= subscribers.
+    await hub.close_subscribers(req.session_id)
 
     # Only the first (transitioning) stop emits the monitor close event.
     monitor_hub: MonitorHub = getattr(request.app.state, "monitor_hub", None)
@@ -422,6 +554,13 @@ async def websocket_endpoint(ws: WebSocket):
 
     print(">>> hub at endpoint:", id(hub), "ws:", id(ws), "session:", session_id)
 
+    # /ws?sessionId={id}&lang={code}: 세션의 추가 번역 언어만 받는 구독 클라.
+    # 슬롯(주 언어 클라)을 건드리지 않는다.
+    lang = ws.query_params.get("lang")
+    if lang:
+        await _serve_language_subscriber(ws, hub, session_id, lang)
+        return
+
     await hub.attach(ws, session_id)
 
     try:
@@ -470,6 +609,26 @@ async def websocket_endpoint(ws: WebSocket):
         await hub.detach(session_id)
 
 
+async def _serve_language_subscriber(ws: WebSocket, hub: WebSocketHub, session_id: str, lang: str) -> None:
+    await hub.attach_subscriber(ws, session_id, lang)
+    try:
+        while True:
+            raw_text = await ws.receive_text()
+            # 구독 클라도 ping 을 보내면 pong 으로 응답 (그 외 입력은 무시).
+            try:
+                decoded = json.loads(raw_text) if raw_text else None
+            except json.JSONDecodeError:
+                decoded = None
+            if isinstance(decoded, dict) and decoded.get("type") == "ping":
+                await ws.send_json({"type": "pong"})
+    except WebSocketDisconnect:
+        print(f'main : subscriber disconnected session={session_id} lang={lang}')
+    except Exception as e:
+        print(f'main : subscriber error: {e}')
+    finally:
+        await hub.detach_subscriber(ws, session_id, lang)
+
+
 @app.websocket("/ws/monitor")
 async def monitor_endpoint(ws: WebSocket):
     """Monitor dashboard stream: live masked source↔translation payloads.
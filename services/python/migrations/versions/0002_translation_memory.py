@@ -0,0 +1,57 @@
+"""translation memory: app.translation_memory
+
+Revision ID: 0002_translation_memory
+Revises: 0001_initial
+Create Date: 2026-10-17
+
+Exact-match translation memory consulted before DeepL so repeated sentences
+survive restarts and deploys (the in-process cache does not).
+
+- Keyed on ``(source_hash, source_lang, target_lang)``: ``source_hash`` is the
+  SHA-256 hex of the NFC/whitespace-normalized source. The primary key doubles
+  as the lookup index, so a (batched) lookup is a single index probe.
+- Only masked-safe sentences are stored — text the PII masker leaves
+  untouched — so this table never holds anything ``app.translations`` would
+  have masked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_translation_memory"
+down_revision: Union[str, Sequence[str], None] = "0001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "app"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "translation_memory",
+        sa.Column("source_hash", sa.Text(), nullable=False),
+        sa.Column("source_lang", sa.Text(), nullable=False),
+        sa.Column("target_lang", sa.Text(), nullable=False),
+        sa.Column("source_text", sa.Text(), nullable=False),
+        sa.Column("translated_text", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint(
+            "source_hash", "source_lang", "target_lang",
+            name="pk_translation_memory",
+        ),
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("translation_memory", schema=SCHEMA)
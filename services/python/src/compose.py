@@ -1,17 +1,38 @@
 from src.consumer.consumer import TranscriptConsumer
+from src.consumer.partitioned import PartitionedConsumer
 from src.separator.kss_separator import SentenceSeparator
 from src.ws.websocket import WebSocketHub
 
 
-async def build(hub: WebSocketHub, separator: SentenceSeparator, nats_config: dict[str, str]) -> None:
-    consumer = TranscriptConsumer(
-        nats_url=nats_config["nats_url"],
-        nats_subject=nats_config["nats_subject"],
-        stream_name=nats_config["nats_stream_name"],
-        consumer_name=nats_config["nats_consumer_name"],
-        separator=separator,
-        worker_concurrency=5,
-    )
+async def build(hub: WebSocketHub, separator: SentenceSeparator, nats_config: dict[str, str],
+                consumer_config: dict[str, float],
+                partition_config: dict[str, int | float | str | None]) -> None:
+    connection = {
+        "nats_url": nats_config["nats_url"],
+        "nats_subject": nats_config["nats_subject"],
+        "stream_name": nats_config["nats_stream_name"],
+        "consumer_name": nats_config["nats_consumer_name"],
+        "separator": separator,
+    }
+    options = {
+        "worker_concurrency": consumer_config["window"],
+        "fetch_timeout_seconds": consumer_config["fetch_timeout_seconds"],
+        "fetch_heartbeat_seconds": consumer_config["fetch_heartbeat_seconds"] or None,
+        "min_concurrency": consumer_config["min_window"],
+        "lag_poll_seconds": consumer_config["lag_poll_seconds"],
+        "ack_flush_seconds": consumer_config["ack_flush_seconds"],
+    }
+    if partition_config["partitions"]:
+        consumer = PartitionedConsumer(
+            **connection,
+            partitions=partition_config["partitions"],
+            worker_id=partition_config["worker_id"],
+            member_ttl_seconds=partition_config["member_ttl_seconds"],
+            handover_timeout_seconds=partition_config["handover_timeout_seconds"],
+            **options,
+        )
+    else:
+        consumer = TranscriptConsumer(**connection, **options)
 
     await consumer.connect()
     try:
@@ -33,8 +33,47 @@ def require_env_int(key: str) -> int:
     raw = require_env(key)
     try:
         return int(raw)
-    except ValueError:
-        raise RuntimeError(f'en {key} must be an integer, got: {raw!r}')
+    except ValueError as exc:
+        msg = f'env {key} must be an integer, got: {raw!r}'
+        raise RuntimeError(msg) from exc
+
+
+def optional_env_int(key: str, default: int) -> int:
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        msg = f'env {key} must be an integer, got: {raw!r}'
+        raise RuntimeError(msg) from exc
+    print(f'env {key} = {value}')
+    return value
+
+
+def optional_env_float(key: str, default: float) -> float:
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        msg = f'env {key} must be a number, got: {raw!r}'
+        raise RuntimeError(msg) from exc
+    print(f'env {key} = {value}')
+    return value
+
+
+def optional_env_bool(key: str, default: bool) -> bool:
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    value = raw.strip().lower()
+    if value not in ("1", "true", "yes", "on", "0", "false", "no", "off"):
+        msg = f'env {key} must be a boolean, got: {raw!r}'
+        raise RuntimeError(msg)
+    print(f'env {key} = {value}')
+    return value in ("1", "true", "yes", "on")
 
 
 load_env_optional()
@@ -51,6 +90,49 @@ def get_nats_config() -> dict[str, str]:
     }
 
 
+def get_consumer_config() -> dict[str, float]:
+    # `window`: messages handled concurrently; a free slot is refilled as soon
+    # as its handler finishes. Every lag_poll_seconds the window and the fetch
+    # batch follow the JetStream consumer lag between min_window and window
+    # (min_window == window pins them). Fetches long-poll for up to
+    # fetch_timeout_seconds with idle heartbeats every fetch_heartbeat_seconds
+    # (0 disables them). Acks/naks are batched and sent at least every
+    # ack_flush_seconds (at most a quarter of the consumer's ack_wait).
+    return {
+        "window": optional_env_int("CONSUMER_WINDOW", 32),
+        "min_window": optional_env_int("CONSUMER_MIN_WINDOW", 2),
+        "lag_poll_seconds": optional_env_float("CONSUMER_LAG_POLL_SECONDS", 2.0),
+        "fetch_timeout_seconds": optional_env_float("CONSUMER_FETCH_TIMEOUT_SECONDS", 30.0),
+        "fetch_heartbeat_seconds": optional_env_float("CONSUMER_FETCH_HEARTBEAT_SECONDS", 5.0),
+        "ack_flush_seconds": optional_env_float("CONSUMER_ACK_FLUSH_SECONDS", 0.02),
+    }
+
+
+def get_consumer_partition_config() -> dict[str, int | float | str | None]:
+    # partitions > 0: several processes share the stream — sessions are
+    # hashed onto `partitions` partitions (one durable each) and the live
+    # workers split those between them. 0 keeps the single durable consumer.
+    # worker_id defaults to <hostname>-<pid>.
+    # A rebalance moves a session to another process, but its /ws clients and
+    # /internal/sessions settings stay in the process they reached. So
+    # partitioned mode requires CONSUMER_PARTITION_ROUTING=sticky, meaning the
+    # deployment routes each session's HTTP/WS traffic to the worker owning
+    # its partition. Anything else refuses to start.
+    partitions = optional_env_int("CONSUMER_PARTITIONS", 0)
+    routing = os.getenv("CONSUMER_PARTITION_ROUTING") or None
+    if partitions and routing != "sticky":
+        msg = (f'env CONSUMER_PARTITIONS={partitions} requires CONSUMER_PARTITION_ROUTING=sticky '
+               f'(session traffic routed to the partition owner), got: {routing!r}')
+        raise RuntimeError(msg)
+    return {
+        "partitions": partitions,
+        "routing": routing,
+        "worker_id": os.getenv("CONSUMER_WORKER_ID") or None,
+        "member_ttl_seconds": optional_env_float("CONSUMER_MEMBER_TTL_SECONDS", 10.0),
+        "handover_timeout_seconds": optional_env_float("CONSUMER_HANDOVER_TIMEOUT_SECONDS", 5.0),
+    }
+
+
 def get_ws_url() -> dict[str, str]:
     print('ws_url', os.getenv('WS_URL'))
     return {
@@ -58,9 +140,136 @@ def get_ws_url() -> dict[str, str]:
     }
 
 
-def get_deepl_config() -> dict[str, str]:
+def get_deepl_config() -> dict[str, str | list[str]]:
+    # DEEPL_API_KEYS (comma-separated) spreads load over several accounts;
+    # a single DEEPL_API_KEY keeps working as before. deepl_api_key is the
+    # first (or only) key.
+    raw = os.getenv("DEEPL_API_KEYS")
+    keys = [key.strip() for key in (raw or "").split(",") if key.strip()]
+    if keys:
+        print(f'env DEEPL_API_KEYS = **** ({len(keys)} keys)')
+    else:
+        keys = [require_env("DEEPL_API_KEY", mask=True)]
+    return {
+        "deepl_api_key": keys[0],
+        "deepl_api_keys": keys,
+    }
+
+
+def get_translator_config() -> dict[str, str]:
+    # "deepl" (production) or "offline" (deterministic pseudo-translation
+    # for load tests; see src/translation/registry.py).
+    return {
+        "backend": os.getenv("TRANSLATOR_BACKEND") or "deepl",
+    }
+
+
+def get_offline_translator_config() -> dict[str, float]:
+    return {
+        "latency_median_seconds": optional_env_float("OFFLINE_TRANSLATOR_LATENCY_MEDIAN_SECONDS", 0.15),
+        "latency_sigma": optional_env_float("OFFLINE_TRANSLATOR_LATENCY_SIGMA", 0.5),
+        "error_rate": optional_env_float("OFFLINE_TRANSLATOR_ERROR_RATE", 0.0),
+        "seed": optional_env_int("OFFLINE_TRANSLATOR_SEED", 0),
+    }
+
+
+def get_translation_cache_config() -> dict[str, float]:
+    # Tunables, not secrets: defaults apply when unset. max_entries=0
+    # disables the in-process cache entirely.
+    return {
+        "max_entries": optional_env_int("TRANSLATION_CACHE_MAX_ENTRIES", 5000),
+        "ttl_seconds": optional_env_float("TRANSLATION_CACHE_TTL_SECONDS", 7 * 24 * 3600.0),
+    }
+
+
+def get_translation_memory_config() -> dict[str, bool]:
+    return {
+        "enabled": optional_env_bool("TRANSLATION_MEMORY_ENABLED", True),
+    }
+
+
+def get_translation_batch_config() -> dict[str, float]:
+    # window: how long a sentence may wait for others to share its DeepL
+    # request. max_size is capped by DeepL's 50-texts-per-request limit.
+    return {
+        "window_seconds": optional_env_float("TRANSLATION_BATCH_WINDOW_SECONDS", 0.03),
+        "max_size": min(optional_env_int("TRANSLATION_BATCH_MAX_SIZE", 16), 50),
+        "workers": optional_env_int("TRANSLATION_WORKERS", 4),
+    }
+
+
+def get_translation_resilience_config() -> dict[str, float]:
+    # deadline: end-to-end budget of one sentence from split to delivery.
+    # Each DeepL attempt gets at most attempt_timeout; a duplicate request is
+    # hedged once the first outlives the observed p<hedge_quantile> latency.
+    return {
+        "deadline_seconds": optional_env_float("TRANSLATION_DEADLINE_SECONDS", 5.0),
+        "attempt_timeout_seconds": optional_env_float("TRANSLATION_ATTEMPT_TIMEOUT_SECONDS", 2.0),
+        "max_attempts": optional_env_int("TRANSLATION_MAX_ATTEMPTS", 3),
+        "hedging_enabled": optional_env_bool("TRANSLATION_HEDGING_ENABLED", True),
+        "hedge_quantile": optional_env_float("TRANSLATION_HEDGE_QUANTILE", 0.95),
+        "breaker_failure_threshold": optional_env_int("TRANSLATION_BREAKER_FAILURE_THRESHOLD", 5),
+        "breaker_reset_seconds": optional_env_float("TRANSLATION_BREAKER_RESET_SECONDS", 10.0),
+    }
+
+
+def get_deepl_rate_limit_config() -> dict[str, float]:
+    # Ceilings for the AIMD limiter: set chars_per_second just under the
+    # account's throughput (summed over keys with DEEPL_API_KEYS); the
+    # limiter probes up to it and halves on 429/5xx.
+    return {
+        "max_concurrency": optional_env_int("DEEPL_MAX_CONCURRENCY", 8),
+        "initial_concurrency": optional_env_int("DEEPL_INITIAL_CONCURRENCY", 4),
+        "max_chars_per_second": optional_env_float("DEEPL_MAX_CHARS_PER_SECOND", 2000.0),
+    }
+
+
+def get_translation_speculation_config() -> dict[str, float]:
+    # Opt-in: translate a segment's unfinished tail once input has been idle
+    # for idle_seconds, instead of waiting for the sentence to close.
+    return {
+        "enabled": optional_env_bool("TRANSLATION_SPECULATION_ENABLED", False),
+        "idle_seconds": optional_env_float("TRANSLATION_SPECULATION_IDLE_SECONDS", 0.6),
+        "min_chars": optional_env_int("TRANSLATION_SPECULATION_MIN_CHARS", 8),
+    }
+
+
+def get_separator_flush_config() -> dict[str, float | bool]:
+    # An unfinished sentence is flushed after timeout_seconds of silence.
+    # Adaptive: per session, the `quantile` of its inter-delta gaps clamped to
+    # [min_seconds, max_seconds] (timeout_seconds until enough gaps are seen).
+    # A session lane without input for lane_idle_seconds (client gone without
+    # /stop) is retired; 0 disables it.
+    return {
+        "timeout_seconds": optional_env_float("FLUSH_TIMEOUT_SECONDS", 2.0),
+        "adaptive": optional_env_bool("FLUSH_TIMEOUT_ADAPTIVE", False),
+        "quantile": optional_env_float("FLUSH_TIMEOUT_QUANTILE", 0.95),
+        "min_seconds": optional_env_float("FLUSH_TIMEOUT_MIN_SECONDS", 0.8),
+        "max_seconds": optional_env_float("FLUSH_TIMEOUT_MAX_SECONDS", 4.0),
+        "lane_idle_seconds": optional_env_float("SEPARATOR_LANE_IDLE_SECONDS", 300.0),
+    }
+
+
+def get_clause_split_config() -> dict[str, int | float | bool]:
+    # Opt-in (CLAUSE_SPLIT_ENABLED=true): bound an unfinished (run-on) tail;
+    # past max_chars characters or max_age_seconds, its head up to the last
+    # clause boundary is translated on its own. 0 disables a bound.
+    return {
+        "enabled": optional_env_bool("CLAUSE_SPLIT_ENABLED", False),
+        "max_chars": optional_env_int("CLAUSE_SPLIT_MAX_CHARS", 120),
+        "max_age_seconds": optional_env_float("CLAUSE_SPLIT_MAX_AGE_SECONDS", 8.0),
+        "min_chars": optional_env_int("CLAUSE_SPLIT_MIN_CHARS", 10),
+    }
+
+
+def get_splitter_config() -> dict[str, str | int | bool]:
+    # "thread" (default; fine on a single core) or "process": KSS runs in
+    # `process_workers` warm worker processes, off the event loop's GIL.
+    # `fast_path`: buffers with unambiguous boundaries skip KSS entirely.
     return {
-        "deepl_api_key": require_env("DEEPL_API_KEY", mask=True)
+        "backend": os.getenv("SPLITTER_BACKEND") or "thread",
+        "process_workers": optional_env_int("SPLITTER_PROCESS_WORKERS", 2),
+        "fast_path": optional_env_bool("SPLITTER_FAST_PATH", True),
     }
 
 
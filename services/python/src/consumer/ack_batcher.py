@@ -0,0 +1,109 @@
+"""Settle JetStream messages (ack / nak / term) off the handler's critical path.
+
+Awaiting ``message.ack()`` inside every handler adds the ack's trip to the
+broker to each message's latency and holds its window slot until it
+returns. :class:`AckBatcher` takes the settlement synchronously and sends
+everything queued in one pass every ``max_delay_seconds`` (or as soon as
+``max_batch_size`` are waiting), in queue order.
+
+Ordering with the dedup watermark: the consumer advances the watermark
+*before* queueing the ack, so if the ack is late and the broker redelivers,
+the redelivery is already recognised as a duplicate and never re-buffered.
+``max_delay_seconds`` must stay well inside the consumer's ``ack_wait`` so a
+queued ack is never the reason for a redelivery.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Protocol
+
+from src.monitoring import metrics
+
+ACTIONS = ('ack', 'nak', 'term')
+
+
+class Settleable(Protocol):
+    async def ack(self) -> None: ...
+    async def nak(self) -> None: ...
+    async def term(self) -> None: ...
+
+
+class AckBatcher:
+    def __init__(
+        self,
+        *,
+        ack_wait_seconds: float,
+        max_delay_seconds: float = 0.02,
+        max_batch_size: int = 64,
+    ) -> None:
+        # A quarter of ack_wait leaves room for a slow flush and the trip to
+        # the broker before the broker gives up on the message.
+        if not 0 < max_delay_seconds <= ack_wait_seconds / 4:
+            msg = (f'max_delay_seconds must be in (0, ack_wait/4 = {ack_wait_seconds / 4}s], '
+                   f'got {max_delay_seconds}')
+            raise ValueError(msg)
+        self.max_delay_seconds = max_delay_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        # (action, message, queued_at) in settlement order.
+        self._queue: list[tuple[str, Settleable, float]] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    def settle(self, message: Settleable, action: str) -> None:
+        if action not in ACTIONS:
+            msg = f'unknown settlement action: {action!r}'
+            raise ValueError(msg)
+        self._queue.append((action, message, asyncio.get_running_loop().time()))
+        self._wakeup.set()
+        if len(self._queue) >= self.max_batch_size:
+            self._full.set()
+
+    async def close(self) -> None:
+        """Stop the flush loop and send everything still queued.
+
+        The loop is woken rather than cancelled so a flush in progress is
+        never cut off halfway through its batch.
+        """
+        self._closing = True
+        self._wakeup.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            await self._wakeup.wait()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), self.max_delay_seconds)
+            await self.flush()
+
+    async def flush(self) -> None:
+        batch, self._queue = self._queue, []
+        self._wakeup.clear()
+        self._full.clear()
+        if not batch:
+            return
+        metrics.observe_ack_batch(len(batch))
+        loop = asyncio.get_running_loop()
+        for action, message, queued_at in batch:
+            try:
+                await getattr(message, action)()
+            except Exception as exc:
+                # Same policy as an inline ack/nak failure: the broker
+                # redelivers after ack_wait, the dedup watermark drops it.
+                print(f'consumer: {action} failed (ignored):', repr(exc))
+            metrics.observe_ack_latency(action, loop.time() - queued_at)
@@ -0,0 +1,97 @@
+"""Wire codecs for transcript messages.
+
+Node publishes JSON today. :func:`decode_request` parses the raw payload
+straight from bytes with orjson when it is installed (stdlib ``json``
+otherwise) into the slotted :class:`TranslationRequestDto`. A publisher can
+switch to a compact binary encoding by setting the ``Content-Type`` NATS
+header (``application/msgpack``); messages without the header are JSON.
+
+Both libraries come from the ``codecs`` extra, which the service image
+installs. They stay optional so a bare install still works: without orjson
+JSON falls back to the stdlib parser, and without msgpack a msgpack message
+is unparseable like any other undecodable payload (the consumer terms it and
+counts it).
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from src.dto.translationDto import TranslationRequestDto
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the installed extras
+    msgpack = None
+
+CONTENT_TYPE_HEADER = 'Content-Type'
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+
+
+class UnsupportedContentType(ValueError):
+    def __init__(self, content_type: str) -> None:
+        super().__init__(f'unsupported content type: {content_type!r}')
+        self.content_type = content_type
+
+
+def _loads_json_stdlib(raw: bytes) -> Any:
+    return json.loads(raw.decode('utf-8'))
+
+
+def _loads_msgpack(raw: bytes) -> Any:
+    return msgpack.unpackb(raw, raw=False)
+
+
+_loads_json = orjson.loads if orjson is not None else _loads_json_stdlib
+
+# content type -> bytes -> mapping. Aliases cover what publishers commonly send.
+_DECODERS: dict[str, Callable[[bytes], Any]] = {
+    JSON: _loads_json,
+    'text/json': _loads_json,
+}
+if msgpack is not None:
+    _DECODERS[MSGPACK] = _loads_msgpack
+    _DECODERS['application/x-msgpack'] = _loads_msgpack
+
+
+def json_backend() -> str:
+    return 'orjson' if orjson is not None else 'json'
+
+
+def supported_content_types() -> list[str]:
+    return sorted(_DECODERS)
+
+
+def content_type_of(headers: Mapping[str, str] | None) -> str:
+    """The payload's media type from the NATS headers; JSON when absent."""
+    if not headers:
+        return JSON
+    value = headers.get(CONTENT_TYPE_HEADER) or headers.get(CONTENT_TYPE_HEADER.lower())
+    if not value:
+        return JSON
+    # "application/json; charset=utf-8" -> "application/json"
+    return value.split(';', 1)[0].strip().lower()
+
+
+def decode_request(raw: bytes, headers: Mapping[str, str] | None = None) -> TranslationRequestDto:
+    """Decode one transcript message; raises on anything unparseable."""
+    content_type = content_type_of(headers)
+    decoder = _DECODERS.get(content_type)
+    if decoder is None:
+        raise UnsupportedContentType(content_type)
+    data = decoder(raw)
+    return TranslationRequestDto(
+        data["sessionId"],
+        data["segmentId"],
+        data["sequence"],
+        data["transcriptText"],
+        data["targetLanguage"],
+        data.get("sourceLanguage"),
+    )
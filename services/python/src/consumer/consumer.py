@@ -1,5 +1,4 @@
 import asyncio
-import json
 from typing import Protocol
 
 import nats
@@ -8,6 +7,8 @@ from nats.errors import TimeoutError as NatsTimeoutError
 from nats.js.api import ConsumerConfig, StreamConfig
 from nats.js.errors import NotFoundError
 
+from src.consumer.ack_batcher import AckBatcher
+from src.consumer.codec import decode_request, json_backend, supported_content_types
 from src.dto.translationDto import TranslationRequestDto
 from src.monitoring import metrics
 
@@ -22,6 +23,29 @@ DEFAULT_MAX_DELIVER = 5
 DEFAULT_MAX_AGE_SECONDS = 600
 # Watermark map safety cap — one int per session, evicted FIFO.
 MAX_TRACKED_SESSIONS = 1000
+# Long-poll fetch: the pull request lingers on the server until a message
+# arrives (returned immediately) or this expires; idle heartbeats tell a
+# quiet stream apart from a dead connection in the meantime.
+DEFAULT_FETCH_TIMEOUT_SECONDS = 30.0
+DEFAULT_FETCH_HEARTBEAT_SECONDS = 5.0
+# How often the adaptive window re-reads the consumer's lag from JetStream.
+DEFAULT_LAG_POLL_SECONDS = 2.0
+# Longest an ack/nak/term waits in the AckBatcher before it is sent.
+DEFAULT_ACK_FLUSH_SECONDS = 0.02
+
+
+def window_for_lag(num_pending: int, num_ack_pending: int,
+                   min_window: int, max_window: int) -> tuple[int, int]:
+    """(handler concurrency, fetch batch) for the consumer's current lag.
+
+    Concurrency covers everything outstanding — undelivered backlog plus
+    messages delivered but not yet acked — so a backlog after a NATS blip or
+    a restart jumps straight to ``max_window``, and an idle stream drops back
+    to ``min_window``. The batch follows the undelivered backlog alone.
+    """
+    window = max(min_window, min(max_window, num_pending + num_ack_pending))
+    batch = max(min_window, min(window, num_pending))
+    return window, batch
 
 
 def strip_credentials(url: str) -> str:
@@ -39,26 +63,22 @@ class Separator(Protocol):
     async def start(self) -> None: ...
     async def stop(self) -> None: ...
     async def offer(self, event: TranslationRequestDto) -> None: ...
+    async def close_session(self, session_id: str) -> None: ...
+
 
+class StreamClient:
+    """A NATS connection that declares the transcript stream and its durables."""
 
-class TranscriptConsumer:
-    def __init__(self, nats_url: str, nats_subject: str, stream_name: str, consumer_name: str, separator: Separator, worker_concurrency: int = 5,):
+    def __init__(self, nats_url: str, nats_subject: str, stream_name: str, consumer_name: str):
         self.nats_url = nats_url
         self.nats_subject = nats_subject
         self.stream_name = stream_name
         self.consumer_name = consumer_name
-        self.worker_concurrency = worker_concurrency
-        self.worker_semaphore = asyncio.Semaphore(worker_concurrency)
         # Never log self.nats_url directly — it may embed credentials.
         self.safe_url = strip_credentials(nats_url)
         self.client = None
-        self.subscription = None
-        self.separator = separator
-        # Highest sequence successfully offered per session: redeliveries at
-        # or below this watermark are duplicates and must not be re-buffered.
-        self._last_sequence_by_session: dict[str, int] = {}
 
-    async def connect(self):
+    async def _connect_client(self) -> None:
         async def on_error(exception):
             print('NATS error : ', repr(exception))
 
@@ -87,24 +107,10 @@ class TranscriptConsumer:
             raise
         metrics.set_nats_connected(True)
         print('NATS connected to', self.safe_url)
+        print(f'consumer: decoding {", ".join(supported_content_types())} '
+              f'(json parser: {json_backend()})')
 
-        jetstream = self.client.jetstream()
-
-        await self._ensure_stream_and_consumer(jetstream)
-
-        self.subscription = await jetstream.pull_subscribe(
-            subject=self.nats_subject,
-            durable=self.consumer_name,
-            stream=self.stream_name,
-        )
-
-    async def _ensure_stream_and_consumer(self, jetstream) -> None:
-        """Declare the stream/consumer idempotently (config-as-code).
-
-        Existing (manually created) production objects are left untouched —
-        only missing ones are created, so a rebuilt server reproduces the
-        documented behavior instead of nats-py defaults.
-        """
+    async def _ensure_stream(self, jetstream) -> None:
         try:
             info = await jetstream.stream_info(self.stream_name)
             # Deliberate exception to the "leave existing objects as-is"
@@ -131,40 +137,92 @@ class TranscriptConsumer:
                   f'(subjects=[{self.nats_subject}], '
                   f'max_age={DEFAULT_MAX_AGE_SECONDS}s)')
 
+    async def _ensure_consumer(self, jetstream, durable: str,
+                               filter_subject: str | None = None) -> None:
         try:
-            await jetstream.consumer_info(self.stream_name, self.consumer_name)
-            print(f'consumer: durable "{self.consumer_name}" exists, leaving as-is')
+            await jetstream.consumer_info(self.stream_name, durable)
+            print(f'consumer: durable "{durable}" exists, leaving as-is')
         except NotFoundError:
             await jetstream.add_consumer(self.stream_name, ConsumerConfig(
-                durable_name=self.consumer_name,
+                durable_name=durable,
                 ack_wait=DEFAULT_ACK_WAIT_SECONDS,
                 max_deliver=DEFAULT_MAX_DELIVER,
+                filter_subject=filter_subject,
             ))
-            print(f'consumer: durable "{self.consumer_name}" created '
+            print(f'consumer: durable "{durable}" created '
                   f'(ack_wait={DEFAULT_ACK_WAIT_SECONDS}s, '
-                  f'max_deliver={DEFAULT_MAX_DELIVER})')
-
-    def _parse_request(self, raw: bytes) -> TranslationRequestDto:
-        data = json.loads(raw.decode('utf-8'))
-        return TranslationRequestDto(
-            data["sessionId"],
-            data["segmentId"],
-            data["sequence"],
-            data["transcriptText"],
-            data["targetLanguage"],
-            data.get("sourceLanguage"),
+                  f'max_deliver={DEFAULT_MAX_DELIVER}'
+                  + (f', filter={filter_subject}' if filter_subject else '') + ')')
+
+    async def close(self):
+        if self.client:
+            await self.client.drain()
+
+
+class TranscriptConsumer(StreamClient):
+    def __init__(self, nats_url: str, nats_subject: str, stream_name: str, consumer_name: str, separator: Separator, worker_concurrency: int = 5,
+                 fetch_timeout_seconds: float = DEFAULT_FETCH_TIMEOUT_SECONDS,
+                 fetch_heartbeat_seconds: float | None = DEFAULT_FETCH_HEARTBEAT_SECONDS,
+                 min_concurrency: int | None = None,
+                 lag_poll_seconds: float = DEFAULT_LAG_POLL_SECONDS,
+                 ack_flush_seconds: float = DEFAULT_ACK_FLUSH_SECONDS,):
+        super().__init__(nats_url, nats_subject, stream_name, consumer_name)
+        self.worker_concurrency = worker_concurrency
+        self.worker_semaphore = asyncio.Semaphore(worker_concurrency)
+        # Adaptive mode (min_concurrency set): the window and fetch batch move
+        # between min_concurrency and worker_concurrency with the consumer lag.
+        # Otherwise both stay at worker_concurrency.
+        self.min_concurrency = min(min_concurrency or worker_concurrency, worker_concurrency)
+        self.lag_poll_seconds = lag_poll_seconds
+        self.window = worker_concurrency
+        self.fetch_batch = worker_concurrency
+        self.fetch_timeout_seconds = fetch_timeout_seconds
+        self.fetch_heartbeat_seconds = fetch_heartbeat_seconds
+        # Handlers currently running — the sliding window run() keeps full.
+        self._in_flight: set[asyncio.Task[None]] = set()
+        # Batched settlements while run() is consuming; outside it (one-off
+        # handling) _settle sends inline.
+        self._acks = AckBatcher(ack_wait_seconds=DEFAULT_ACK_WAIT_SECONDS,
+                                max_delay_seconds=ack_flush_seconds)
+        self.subscription = None
+        self.separator = separator
+        # Highest sequence successfully offered per session: redeliveries at
+        # or below this watermark are duplicates and must not be re-buffered.
+        self._last_sequence_by_session: dict[str, int] = {}
+
+    async def connect(self):
+        await self._connect_client()
+
+        jetstream = self.client.jetstream()
+
+        await self._ensure_stream_and_consumer(jetstream)
+
+        self.subscription = await jetstream.pull_subscribe(
+            subject=self.nats_subject,
+            durable=self.consumer_name,
+            stream=self.stream_name,
         )
 
+    async def _ensure_stream_and_consumer(self, jetstream) -> None:
+        """Declare the stream/consumer idempotently (config-as-code).
+
+        Existing (manually created) production objects are left untouched —
+        only missing ones are created, so a rebuilt server reproduces the
+        documented behavior instead of nats-py defaults.
+        """
+        await self._ensure_stream(jetstream)
+        await self._ensure_consumer(jetstream, self.consumer_name)
+
     async def _handle_message(self, message: Msg) -> None:
         try:
-            req = self._parse_request(message.data)
+            req = decode_request(message.data, getattr(message, 'headers', None))
         except Exception as exc:
             # An unparseable message can never succeed — nak would redeliver
             # it forever (burning fetch slots), so terminate it instead.
             metrics.record_unparseable()
             print('consumer: unparseable message, term:', repr(exc))
             try:
-                await message.term()
+                await self._settle(message, 'term')
             except Exception as term_exc:
                 print('consumer: term failed (ignored):', repr(term_exc))
             return
@@ -176,24 +234,32 @@ class TranscriptConsumer:
                 # never re-buffer.
                 print(f'consumer: duplicate dropped '
                       f'(session={req.session_id} seq={req.sequence})')
-                await message.ack()
+                await self._settle(message, 'ack')
                 return
             async with self.worker_semaphore:
                 await self.separator.offer(req)
             # Advance the watermark only after the offer succeeded, so a
-            # failed attempt is not mistaken for a duplicate on redelivery.
+            # failed attempt is not mistaken for a duplicate on redelivery —
+            # but before the ack is queued, so a redelivery caused by a late
+            # (batched) ack is already one.
             self._record_sequence(req)
-            await message.ack()
+            await self._settle(message, 'ack')
         except Exception as exc:
             print('consumer: message handling failed, nak:', repr(exc))
             try:
-                await message.nak()
+                await self._settle(message, 'nak')
             except Exception as nak_exc:
                 # A nak can itself fail during a NATS outage; swallow it so
                 # the consumer task never dies — the broker redelivers after
                 # ack_wait anyway.
                 print('consumer: nak failed (ignored):', repr(nak_exc))
 
+    async def _settle(self, message: Msg, action: str) -> None:
+        if self._acks.running:
+            self._acks.settle(message, action)
+        else:
+            await getattr(message, action)()
+
     def _is_duplicate(self, req: TranslationRequestDto) -> bool:
         last = self._last_sequence_by_session.get(req.session_id)
         return last is not None and req.sequence <= last
@@ -205,30 +271,89 @@ class TranscriptConsumer:
             del self._last_sequence_by_session[oldest]
 
     async def run(self):
+        """Keep up to ``self.window`` messages in flight.
+
+        A sliding window rather than fetch-a-batch / gather-the-batch: a
+        handler stuck in ``separator.offer`` (full queue) only holds its own
+        slot, and each slot is refilled as soon as its handler finishes.
+        """
         if not self.subscription:
             raise RuntimeError(
                 "Subscription not initialized")
 
+        loop = asyncio.get_running_loop()
+        metrics.set_consumer_window(self.consumer_name, self.window, self.fetch_batch)
+        lag_monitor = None
+        if self.min_concurrency < self.worker_concurrency:
+            lag_monitor = asyncio.create_task(self._lag_monitor())
+        self._acks.start()
+        try:
+            while True:
+                free = self.window - len(self._in_flight)
+                if free <= 0:
+                    # The timeout re-checks a window the lag monitor may have
+                    # grown while every slot is held by a slow handler.
+                    await asyncio.wait(self._in_flight,
+                                       timeout=self.lag_poll_seconds,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                started = loop.time()
+                try:
+                    msgs = await self.subscription.fetch(
+                        batch=min(free, self.fetch_batch),
+                        timeout=self.fetch_timeout_seconds,
+                        heartbeat=self.fetch_heartbeat_seconds,
+                    )
+                except (TimeoutError, NatsTimeoutError):
+                    # Long poll expired on a quiet stream (FetchTimeoutError
+                    # when heartbeats arrived, i.e. the connection is fine).
+                    msgs = []
+                if not msgs:
+                    # Idle time: the fetch expired or came back empty.
+                    metrics.observe_consumer_idle_wait(loop.time() - started)
+
+                for msg in msgs:
+                    task = asyncio.create_task(self._handle_message(msg))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._on_handler_done)
+                metrics.set_consumer_in_flight(self.consumer_name, len(self._in_flight))
+        finally:
+            if lag_monitor is not None:
+                lag_monitor.cancel()
+            for task in self._in_flight:
+                task.cancel()
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
+            # Flush queued settlements before close() drains the connection.
+            await self._acks.close()
+
+    async def _lag_monitor(self) -> None:
         while True:
             try:
-                msgs = await self.subscription.fetch(
-                    batch=self.worker_concurrency,
-                    timeout=5,
-                )
-            except (TimeoutError, NatsTimeoutError):
-                continue
-
-            tasks = [asyncio.create_task(self._handle_message(msg))
-                     for msg in msgs]
-            if tasks:
-                # return_exceptions keeps one failed handler from killing the
-                # whole consume loop (it would stop silently otherwise).
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, BaseException):
-                        print('consumer: handler error (ignored):',
-                              repr(result))
+                info = await self.subscription.consumer_info()
+            except Exception as exc:
+                # Keep the current settings through a NATS blip.
+                print('consumer: consumer_info failed (ignored):', repr(exc))
+            else:
+                self._adapt_window(info.num_pending or 0, info.num_ack_pending or 0)
+            await asyncio.sleep(self.lag_poll_seconds)
 
-    async def close(self):
-        if self.client:
-            await self.client.drain()
+    def _adapt_window(self, num_pending: int, num_ack_pending: int) -> None:
+        metrics.set_consumer_lag(self.consumer_name, num_pending, num_ack_pending)
+        window, batch = window_for_lag(num_pending, num_ack_pending,
+                                       self.min_concurrency, self.worker_concurrency)
+        if (window, batch) != (self.window, self.fetch_batch):
+            print(f'consumer: window {self.window} -> {window}, '
+                  f'fetch batch {self.fetch_batch} -> {batch} '
+                  f'(pending={num_pending} ack_pending={num_ack_pending})')
+            self.window, self.fetch_batch = window, batch
+        metrics.set_consumer_window(self.consumer_name, window, batch)
+
+    def _on_handler_done(self, task: asyncio.Task[None]) -> None:
+        self._in_flight.discard(task)
+        metrics.set_consumer_in_flight(self.consumer_name, len(self._in_flight))
+        # _handle_message swallows its own errors; anything escaping it must
+        # not kill the consume loop (it would stop silently otherwise).
+        if not task.cancelled() and task.exception() is not None:
+            print('consumer: handler error (ignored):', repr(task.exception()))
@@ -0,0 +1,239 @@
+"""Several consumer processes sharing the transcript stream by partition.
+
+A single :class:`TranscriptConsumer` has to be the only consumer of its
+durable: the per-session dedup watermark and the separator's segment state
+live in process memory. :class:`PartitionedConsumer` splits the stream into
+``partitions`` session-affine partitions (see :mod:`src.consumer.partitions`),
+each with its own durable, and runs one ``TranscriptConsumer`` per partition
+it owns; the coordinator itself never fetches.
+
+Membership: every worker heartbeats its id into a NATS KV bucket whose TTL
+drops workers that stop heartbeating; the live keys are the member set and
+:func:`assign_partitions` maps it to owners. The heartbeat runs as its own
+task so a rebalance waiting on a handover never lets the key expire. When
+the set changes, a worker releases the partitions it lost — stops fetching,
+flushes its queued acks and writes the partition's dedup watermarks to a
+handover bucket — and acquires the partitions it gained, seeding their
+watermarks from the previous owner's handover (waiting up to
+``handover_timeout_seconds`` for a previous owner that is still alive to
+write it). Only watermarks move: the released sessions stay open in the old
+owner's separator, which keeps their settings and finalizes their buffered
+tails on its own flush timeout.
+
+Client delivery still goes through this process's WebSocketHub and session
+settings still arrive over its /internal/sessions API, so the session's
+traffic has to be routed to the process that owns its partition. The mode is
+therefore only enabled together with ``CONSUMER_PARTITION_ROUTING=sticky``,
+which declares that the deployment does this routing (see
+:func:`src.config.get_consumer_partition_config`).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import socket
+
+from nats.js.errors import BucketNotFoundError, KeyNotFoundError, NoKeysError
+
+from src.consumer.consumer import DEFAULT_MAX_AGE_SECONDS, StreamClient, TranscriptConsumer
+from src.consumer.partitions import PartitionLayout, assign_partitions, owner_of
+from src.monitoring import metrics
+
+DEFAULT_MEMBER_TTL_SECONDS = 10.0
+DEFAULT_HANDOVER_TIMEOUT_SECONDS = 5.0
+
+
+def default_worker_id() -> str:
+    # KV keys only allow [-/_=.a-zA-Z0-9].
+    return re.sub(r'[^-_=.a-zA-Z0-9]', '_', f'{socket.gethostname()}-{os.getpid()}')
+
+
+class PartitionedConsumer(StreamClient):
+    def __init__(self, nats_url: str, nats_subject: str, stream_name: str, consumer_name: str, separator,
+                 *, partitions: int, worker_id: str | None = None,
+                 member_ttl_seconds: float = DEFAULT_MEMBER_TTL_SECONDS,
+                 handover_timeout_seconds: float = DEFAULT_HANDOVER_TIMEOUT_SECONDS,
+                 **consumer_options):
+        super().__init__(nats_url, nats_subject, stream_name, consumer_name)
+        self.separator = separator
+        self.layout = PartitionLayout(nats_subject, partitions)
+        self.worker_id = worker_id or default_worker_id()
+        self.member_ttl_seconds = member_ttl_seconds
+        self.heartbeat_seconds = member_ttl_seconds / 3
+        self.handover_timeout_seconds = handover_timeout_seconds
+        self._consumer_options = consumer_options
+        self.jetstream = None
+        self.members_kv = None
+        self.handover_kv = None
+        self._members: frozenset[str] = frozenset()
+        # partition -> (its TranscriptConsumer, the task running it)
+        self._owned: dict[int, tuple[TranscriptConsumer, asyncio.Task[None]]] = {}
+
+    async def connect(self):
+        await self._connect_client()
+        self.jetstream = self.client.jetstream()
+        await self._ensure_stream(self.jetstream)
+        for partition in range(self.layout.partitions):
+            await self._ensure_consumer(
+                self.jetstream, self.layout.durable_for(self.consumer_name, partition),
+                filter_subject=self.layout.subject_for(partition))
+        self.members_kv = await self._ensure_bucket(
+            f'{self.consumer_name}-members', ttl=self.member_ttl_seconds)
+        # A watermark is useless once the stream has aged its messages out.
+        self.handover_kv = await self._ensure_bucket(
+            f'{self.consumer_name}-handover', ttl=DEFAULT_MAX_AGE_SECONDS)
+        print(f'consumer: worker "{self.worker_id}" joining '
+              f'{self.layout.partitions} partitions of {self.nats_subject}')
+
+    async def _ensure_stream(self, jetstream) -> None:
+        await super()._ensure_stream(jetstream)
+        # Second deliberate exception to "leave existing objects as-is":
+        # partitioned mode is opt-in and cannot work without the transform.
+        # Messages stored before it was set keep their old subject and match
+        # no partition durable; they age out with max_age.
+        info = await jetstream.stream_info(self.stream_name)
+        transform = self.layout.transform()
+        current = info.config.subject_transform
+        if current is None or (current.src, current.dest) != (transform.src, transform.dest):
+            info.config.subject_transform = transform
+            await jetstream.update_stream(info.config)
+            print(f'consumer: stream "{self.stream_name}" subject_transform '
+                  f'RECONCILED -> {transform.src} => {transform.dest}')
+
+    async def _ensure_bucket(self, bucket: str, ttl: float):
+        try:
+            return await self.jetstream.key_value(bucket)
+        except BucketNotFoundError:
+            return await self.jetstream.create_key_value(bucket=bucket, ttl=ttl, history=1)
+
+    async def run(self):
+        if self.members_kv is None:
+            msg = "Partitioned consumer not connected"
+            raise RuntimeError(msg)
+        await self.members_kv.put(self.worker_id, b'1')
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while True:
+                members = await self._live_members()
+                if members != self._members:
+                    await self._rebalance(members)
+                await asyncio.sleep(self.heartbeat_seconds)
+        finally:
+            # Leave cleanly: hand every partition over while still a member
+            # (so nobody takes them over before the handover is written),
+            # then drop out of the member set so the others rebalance
+            # without waiting for the TTL.
+            try:
+                await asyncio.gather(*(self._release(partition) for partition in list(self._owned)))
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+            try:
+                await self.members_kv.delete(self.worker_id)
+            except Exception as exc:
+                print('consumer: leaving the member set failed (ignored):', repr(exc))
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.members_kv.put(self.worker_id, b'1')
+            except Exception as exc:
+                # The TTL spans three beats; the next one may get through.
+                print('consumer: membership heartbeat failed (ignored):', repr(exc))
+
+    async def _live_members(self) -> frozenset[str]:
+        try:
+            keys = await self.members_kv.keys()
+        except NoKeysError:
+            keys = []
+        return frozenset([*keys, self.worker_id])
+
+    async def _rebalance(self, members: frozenset[str]) -> None:
+        # On joining, the partitions were spread over everyone but us.
+        previous = self._members or members - {self.worker_id}
+        self._members = members
+        owned = assign_partitions(self.layout.partitions, members)[self.worker_id]
+        lost = sorted(self._owned.keys() - owned)
+        gained = sorted(owned - self._owned.keys())
+        print(f'consumer: {len(members)} workers, owning {len(owned)} partitions '
+              f'(+{gained} -{lost})')
+        metrics.set_consumer_partitions(members=len(members), owned=len(owned))
+        await asyncio.gather(*(self._release(partition) for partition in lost))
+        await asyncio.gather(*(
+            self._acquire(partition, owner_of(partition, previous)) for partition in gained))
+
+    def _worker_for(self, partition: int) -> TranscriptConsumer:
+        worker = TranscriptConsumer(
+            self.nats_url, self.layout.subject_for(partition), self.stream_name,
+            self.layout.durable_for(self.consumer_name, partition), self.separator,
+            **self._consumer_options)
+        worker.client = self.client
+        return worker
+
+    async def _acquire(self, partition: int, previous_owner: str | None) -> None:
+        worker = self._worker_for(partition)
+        if previous_owner is not None and previous_owner != self.worker_id:
+            handover = await self._await_handover(partition, previous_owner)
+            worker._last_sequence_by_session.update(handover.get('watermarks', {}))
+        worker.subscription = await self.jetstream.pull_subscribe(
+            subject=worker.nats_subject,
+            durable=worker.consumer_name,
+            stream=self.stream_name,
+        )
+        self._owned[partition] = (worker, asyncio.create_task(worker.run()))
+
+    async def _await_handover(self, partition: int, previous_owner: str) -> dict:
+        """The previous owner's handover record for ``partition``.
+
+        Waits for it only while that owner is still a member (a graceful
+        rebalance); a departed owner's last record, if any, is used as is.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.handover_timeout_seconds
+        while True:
+            record = await self._read_handover(partition)
+            if record.get('from') == previous_owner and set(record.get('members', ())) == self._members:
+                return record
+            if previous_owner not in self._members or loop.time() >= deadline:
+                if previous_owner in self._members:
+                    print(f'consumer: no handover for partition {partition} from '
+                          f'"{previous_owner}" in {self.handover_timeout_seconds}s, taking it over')
+                    metrics.record_consumer_handover('timeout')
+                return record
+            await asyncio.sleep(0.1)
+
+    async def _read_handover(self, partition: int) -> dict:
+        try:
+            entry = await self.handover_kv.get(f'p{partition}')
+        except KeyNotFoundError:
+            return {}
+        return json.loads(entry.value) if entry.value else {}
+
+    async def _release(self, partition: int) -> None:
+        worker, task = self._owned.pop(partition)
+        # Cancelling run() stops fetching, cancels in-flight handlers (their
+        # messages are redelivered to the next owner) and flushes acks.
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        metrics.remove_consumer_durable(worker.consumer_name)
+        if worker.subscription is not None:
+            try:
+                await worker.subscription.unsubscribe()
+            except Exception as exc:
+                print('consumer: unsubscribe failed (ignored):', repr(exc))
+        # Watermarks only: closing the sessions would drop their settings,
+        # which the next owner cannot rebuild from the stream. Their tails
+        # stay buffered here until the separator's flush timeout.
+        try:
+            await self.handover_kv.put(f'p{partition}', json.dumps({
+                'from': self.worker_id,
+                'members': sorted(self._members),
+                'watermarks': dict(worker._last_sequence_by_session),
+            }).encode('utf-8'))
+            metrics.record_consumer_handover('released')
+        except Exception as exc:
+            # The next owner waits out its timeout and starts without them.
+            print(f'consumer: handover of partition {partition} failed (ignored):', repr(exc))
@@ -0,0 +1,85 @@
+"""Session → partition → worker mapping for partitioned consumption.
+
+The stream rewrites every ``transcript.session.<id>`` subject to
+``transcript.session.<partition>.<id>`` with the server-side ``partition()``
+subject transform, so all of a session's messages land on one partition, and
+each partition has its own durable. :func:`assign_partitions` spreads the
+partitions over the live workers with rendezvous (highest-random-weight)
+hashing: when a worker joins or leaves, only the partitions it gains or held
+move; every other partition keeps its owner.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+from nats.js.api import SubjectTransform
+
+
+def fnv1a_32(data: bytes) -> int:
+    value = 0x811C9DC5
+    for byte in data:
+        value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return value
+
+
+class PartitionLayout:
+    """Subjects and durables of ``partitions`` partitions of ``subject``.
+
+    ``subject`` is the stream's publish subject and must contain exactly one
+    ``*`` (the session id), e.g. ``transcript.session.*``.
+    """
+
+    def __init__(self, subject: str, partitions: int) -> None:
+        tokens = subject.split('.')
+        if tokens.count('*') != 1 or '>' in tokens:
+            msg = f'partitioned subject needs exactly one "*" token: {subject!r}'
+            raise ValueError(msg)
+        if partitions < 1:
+            msg = f'partitions must be >= 1, got {partitions}'
+            raise ValueError(msg)
+        self.subject = subject
+        self.partitions = partitions
+        self._wildcard = tokens.index('*')
+        self._tokens = tokens
+
+    def partition_of(self, session_id: str) -> int:
+        """Same bucket the server's ``partition(n, 1)`` transform picks."""
+        return fnv1a_32(session_id.encode('utf-8')) % self.partitions
+
+    def transform(self) -> SubjectTransform:
+        dest = list(self._tokens)
+        dest[self._wildcard] = f'{{{{partition({self.partitions},1)}}}}.{{{{wildcard(1)}}}}'
+        return SubjectTransform(src=self.subject, dest='.'.join(dest))
+
+    def subject_for(self, partition: int) -> str:
+        tokens = list(self._tokens)
+        tokens[self._wildcard] = f'{partition}.*'
+        return '.'.join(tokens)
+
+    @staticmethod
+    def durable_for(consumer_name: str, partition: int) -> str:
+        return f'{consumer_name}-p{partition}'
+
+
+def _weight(worker: str, partition: int) -> int:
+    digest = hashlib.blake2b(f'{worker}/{partition}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def assign_partitions(partitions: int, workers: Iterable[str]) -> dict[str, set[int]]:
+    """Owner of every partition among ``workers`` (rendezvous hashing)."""
+    workers = sorted(set(workers))
+    owned: dict[str, set[int]] = {worker: set() for worker in workers}
+    if not workers:
+        return owned
+    for partition in range(partitions):
+        owned[owner_of(partition, workers)].add(partition)
+    return owned
+
+
+def owner_of(partition: int, workers: Iterable[str]) -> str | None:
+    workers = sorted(set(workers))
+    if not workers:
+        return None
+    return max(workers, key=lambda worker: _weight(worker, partition))
@@ -0,0 +1,199 @@
+"""Spread DeepL requests over several API keys.
+
+One key's character quota and throughput cap the whole service once several
+campuses stream at once. :class:`DeeplKeyBalancer` owns one
+:class:`DeeplTranslationService` per key and, per request, picks the key
+with the best score:
+
+    (in_flight + 1) × latency EWMA ÷ remaining quota fraction
+
+so an idle, fast key with plenty of quota wins. ``/v2/usage`` is polled in
+the background every ``usage_refresh_seconds``, and billed characters are
+subtracted locally in between.
+
+A key that answers 403 (auth) or 456 (quota exceeded) is quarantined and the
+same request moves on to the next key. Throttling and 5xx errors are not the
+key's fault: they are surfaced to the resilience layer, and the key's latency
+estimate is penalized so the retry prefers another one.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from deepl import TextResult
+
+from src.deepL.deepL import DeeplError, DeeplTranslationService
+from src.monitoring import metrics
+
+# Latency assumed for a key that has not answered yet.
+DEFAULT_LATENCY_SECONDS = 0.3
+LATENCY_EWMA_ALPHA = 0.2
+# Ceiling for the error penalty (latency doubles per throttle/5xx) so a key
+# that had a bad minute is back in rotation after a few good answers.
+MAX_LATENCY_SECONDS = 10.0
+# Floor for the quota fraction so a nearly exhausted key is deprioritized,
+# not divided by zero.
+MIN_REMAINING_FRACTION = 0.05
+QUARANTINE_STATUS_CODES = (403, 456)
+
+
+def key_label(api_key: str) -> str:
+    """Metric/log label that identifies a key without leaking it."""
+    return '...' + api_key.removesuffix(':fx')[-4:]
+
+
+@dataclass
+class _KeyState:
+    service: DeeplTranslationService
+    label: str
+    in_flight: int = 0
+    latency_seconds: float = DEFAULT_LATENCY_SECONDS
+    remaining: int | None = None
+    limit: int | None = None
+    quarantined_until: float = 0.0
+    usage_checked_at: float | None = None
+
+    @property
+    def remaining_fraction(self) -> float:
+        if self.remaining is None or not self.limit:
+            return 1.0
+        return max(MIN_REMAINING_FRACTION, self.remaining / self.limit)
+
+    def score(self) -> float:
+        return (self.in_flight + 1) * self.latency_seconds / self.remaining_fraction
+
+
+class DeeplKeyBalancer:
+    def __init__(
+        self,
+        services: Sequence[DeeplTranslationService],
+        *,
+        usage_refresh_seconds: float = 300.0,
+        auth_quarantine_seconds: float = 3600.0,
+        quota_quarantine_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not services:
+            msg = 'at least one DeepL key is required'
+            raise ValueError(msg)
+        self.usage_refresh_seconds = usage_refresh_seconds
+        self.auth_quarantine_seconds = auth_quarantine_seconds
+        self.quota_quarantine_seconds = quota_quarantine_seconds
+        self._clock = clock
+        self._keys = [_KeyState(service, key_label(service.api_key)) for service in services]
+        self._refreshes: set[asyncio.Task[None]] = set()
+        for state in self._keys:
+            metrics.set_deepl_key_quarantined(state.label, False)
+
+    @classmethod
+    def from_keys(cls, api_keys: Sequence[str], **kwargs: Any) -> DeeplKeyBalancer:
+        return cls([DeeplTranslationService(key) for key in api_keys], **kwargs)
+
+    @property
+    def key_labels(self) -> list[str]:
+        return [state.label for state in self._keys]
+
+    async def translate(self, source_text: str, target_language: str) -> TextResult:
+        results = await self.translate_batch([source_text], target_language)
+        return results[0]
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[TextResult]:
+        self._refresh_stale_usage()
+        tried: set[int] = set()
+        while True:
+            index = self._pick(exclude=tried)
+            if index is None:
+                raise DeeplError(456, 'no usable DeepL key (all quarantined or exhausted)')
+            tried.add(index)
+            state = self._keys[index]
+            state.in_flight += 1
+            started = self._clock()
+            try:
+                results = await state.service.translate_batch(source_texts, target_language)
+            except DeeplError as exc:
+                if exc.status_code in QUARANTINE_STATUS_CODES:
+                    self._quarantine(state, exc.status_code)
+                    continue
+                state.latency_seconds = min(state.latency_seconds * 2, MAX_LATENCY_SECONDS)
+                metrics.record_deepl_key_request(state.label, f'http_{exc.status_code}')
+                raise
+            finally:
+                state.in_flight -= 1
+            if state.quarantined_until:
+                self._release(state)
+            elapsed = self._clock() - started
+            state.latency_seconds += LATENCY_EWMA_ALPHA * (elapsed - state.latency_seconds)
+            billed = sum(result.billed_characters or 0 for result in results)
+            if state.remaining is not None:
+                state.remaining = max(0, state.remaining - billed)
+                metrics.set_deepl_key_remaining(state.label, state.remaining)
+            metrics.record_deepl_key_request(state.label, 'ok')
+            metrics.record_deepl_key_characters(state.label, billed)
+            return results
+
+    def _pick(self, *, exclude: set[int]) -> int | None:
+        now = self._clock()
+        candidates = [
+            (state.score(), index)
+            for index, state in enumerate(self._keys)
+            if index not in exclude
+            and state.quarantined_until <= now
+        ]
+        if not candidates:
+            return None
+        return min(candidates)[1]
+
+    def _quarantine(self, state: _KeyState, status_code: int) -> None:
+        seconds = self.auth_quarantine_seconds if status_code == 403 else self.quota_quarantine_seconds
+        state.quarantined_until = self._clock() + seconds
+        if status_code == 456:
+            state.remaining = 0
+            # Re-read the quota once the quarantine ends (a new period may
+            # have started).
+            state.usage_checked_at = state.quarantined_until - self.usage_refresh_seconds
+        print(f'deepl: key {state.label} quarantined for {seconds:.0f}s (http {status_code})')
+        metrics.record_deepl_key_request(state.label, f'http_{status_code}')
+        metrics.set_deepl_key_quarantined(state.label, True)
+
+    def _release(self, state: _KeyState) -> None:
+        state.quarantined_until = 0.0
+        metrics.set_deepl_key_quarantined(state.label, False)
+
+    def _refresh_stale_usage(self) -> None:
+        now = self._clock()
+        for state in self._keys:
+            if state.usage_checked_at is not None and now - state.usage_checked_at < self.usage_refresh_seconds:
+                continue
+            # Mark first so concurrent requests do not start duplicate polls.
+            state.usage_checked_at = now
+            task = asyncio.create_task(self._refresh_usage(state))
+            self._refreshes.add(task)
+            task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh_usage(self, state: _KeyState) -> None:
+        try:
+            usage = await state.service.usage()
+        except asyncio.CancelledError:
+            raise
+        except DeeplError as exc:
+            if exc.status_code == 403:
+                self._quarantine(state, exc.status_code)
+            else:
+                print(f'deepl: usage check failed for key {state.label}: {exc!r}')
+            return
+        except Exception as exc:
+            print(f'deepl: usage check failed for key {state.label}: {exc!r}')
+            return
+        state.remaining = usage.remaining
+        state.limit = usage.character_limit
+        metrics.set_deepl_key_remaining(state.label, usage.remaining)
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshes):
+            task.cancel()
+        await asyncio.gather(*self._refreshes, return_exceptions=True)
+        await asyncio.gather(*(state.service.aclose() for state in self._keys))
@@ -1,12 +1,126 @@
-from deepl import TextResult, Translator
+import time
+from dataclasses import dataclass
+
+import httpx
+from deepl import TextResult
+from deepl.util import auth_key_is_free_account
+
+from src.monitoring import metrics
+
+DEEPL_FREE_API_URL = "https://api-free.deepl.com"
+DEEPL_PRO_API_URL = "https://api.deepl.com"
+# One keep-alive pool for the whole process. Subtitle traffic is a trickle of
+# short requests, so a handful of warm connections covers bursts without
+# paying a TCP+TLS handshake per sentence.
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_TIMEOUT_SECONDS = 10.0
+# API limit on the number of ``text`` entries in one /v2/translate call.
+DEEPL_MAX_TEXTS_PER_REQUEST = 50
+
+
+class DeeplError(RuntimeError):
+    """A non-2xx DeepL response. ``status_code`` lets callers tell a 429
+    (throttled) or 456 (quota) apart from a transient 5xx."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f'deepl http {status_code}: {message}')
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class DeeplUsage:
+    """Characters billed so far in the current period vs. the account cap."""
+    character_count: int
+    character_limit: int
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.character_limit - self.character_count)
 
 
 class DeeplTranslationService:
-    def __init__(self, api_key: str) -> None:
+    """Async DeepL client that never blocks the event loop.
+
+    The previous implementation built a fresh ``deepl.Translator`` (and a new
+    HTTPS connection) per sentence and called it synchronously from
+    ``_push_loop``, stalling WS sends, NATS fetches and keepalives for the
+    whole round-trip. This one talks to the REST API through a single
+    ``httpx.AsyncClient`` owned for the process lifetime (closed by
+    :meth:`aclose` in the lifespan teardown).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        server_url: str | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         self.api_key = api_key
+        if server_url is None:
+            server_url = DEEPL_FREE_API_URL if auth_key_is_free_account(api_key) else DEEPL_PRO_API_URL
+        self.server_url = server_url.rstrip('/')
+        self._client = httpx.AsyncClient(
+            base_url=self.server_url,
+            headers={"Authorization": f"DeepL-Auth-Key {api_key}"},
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            transport=transport,
+        )
+
+    async def translate(self, source_text: str, target_language: str) -> TextResult:
+        results = await self._request([source_text], target_language)
+        return results[0]
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[TextResult]:
+        """Translate several texts in one request; results keep input order."""
+        if len(source_texts) > DEEPL_MAX_TEXTS_PER_REQUEST:
+            msg = f'at most {DEEPL_MAX_TEXTS_PER_REQUEST} texts per request, got {len(source_texts)}'
+            raise ValueError(msg)
+        return await self._request(list(source_texts), target_language)
+
+    async def _request(self, texts: list[str], target_language: str) -> list[TextResult]:
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = await self._client.post('/v2/translate', json={
+                "text": texts,
+                "target_lang": target_language,
+                "show_billed_characters": True,
+            })
+            if response.status_code != 200:
+                outcome = f'http_{response.status_code}'
+                raise DeeplError(response.status_code, response.text[:200])
+            translations = response.json()["translations"]
+            outcome = 'ok'
+        finally:
+            metrics.observe_deepl_request(time.perf_counter() - started, outcome)
+        return [
+            TextResult(
+                t["text"],
+                detected_source_lang=t.get("detected_source_language", ""),
+                billed_characters=t.get("billed_characters", 0),
+                model_type_used=t.get("model_type_used"),
+            )
+            for t in translations
+        ]
+
+    async def usage(self) -> DeeplUsage:
+        response = await self._client.get('/v2/usage')
+        if response.status_code != 200:
+            raise DeeplError(response.status_code, response.text[:200])
+        body = response.json()
+        return DeeplUsage(
+            character_count=int(body.get("character_count", 0)),
+            character_limit=int(body.get("character_limit", 0)),
+        )
 
-    def translate(self, source_text: str, target_language: str) -> TextResult | list[TextResult]:
-        translator = Translator(self.api_key)
-        result: TextResult | list[TextResult] = translator.translate_text(
-            source_text, target_lang=target_language)
-        return result
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -5,7 +5,9 @@ import 하면 순환이 생긴다. 기본 레지스트리에 등록하므로 mai
 /metrics(generate_latest)에 자동 노출된다 — nginx 미노출(컨테이너 내부 전용),
 사이드카가 compose 네트워크에서 python:8000/metrics 로 읽는다.
 """
-from prometheus_client import Counter, Gauge
+import contextlib
+
+from prometheus_client import Counter, Gauge, Histogram
 
 _active_session = Gauge(
     'neemba_hub_active_session',
@@ -27,6 +29,238 @@ _unparseable = Counter(
     'neemba_consumer_unparseable_total',
     'NATS messages dropped as unparseable (term-ed)',
 )
+_deepl_request_seconds = Histogram(
+    'neemba_deepl_request_seconds',
+    'DeepL translate round-trip latency by outcome (ok / http_<status> / error)',
+    ['outcome'],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0),
+)
+_translation_cache_lookups = Counter(
+    'neemba_translation_cache_lookups_total',
+    'In-process translation cache lookups by result (hit / miss)',
+    ['result'],
+)
+_translation_cache_evictions = Counter(
+    'neemba_translation_cache_evictions_total',
+    'Translation cache entries evicted by reason (size / ttl)',
+    ['reason'],
+)
+_translation_cache_size = Gauge(
+    'neemba_translation_cache_entries',
+    'Entries currently held by the in-process translation cache',
+)
+_translation_memory_lookups = Counter(
+    'neemba_translation_memory_lookups_total',
+    'Persistent translation memory lookups by result (hit / miss)',
+    ['result'],
+)
+_translation_memory_errors = Counter(
+    'neemba_translation_memory_errors_total',
+    'Translation memory DB failures by operation (lookup / store), degraded to a miss',
+    ['op'],
+)
+_translation_memory_batch = Histogram(
+    'neemba_translation_memory_lookup_batch_size',
+    'Sentences resolved per coalesced translation memory query',
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34),
+)
+_translation_batch_size = Histogram(
+    'neemba_translation_batch_size',
+    'Sentences merged into one DeepL translate request',
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 50),
+)
+_translation_workers = Gauge(
+    'neemba_translation_workers',
+    'Configured separator translation workers',
+)
+_translation_workers_busy = Gauge(
+    'neemba_translation_workers_busy',
+    'Translation workers currently translating/delivering a batch (utilization = busy / workers)',
+)
+_translation_breaker_state = Gauge(
+    'neemba_translation_breaker_state',
+    'DeepL circuit breaker state (0=closed, 1=half-open, 2=open)',
+)
+_translation_breaker_rejections = Counter(
+    'neemba_translation_breaker_rejections_total',
+    'Translation requests failed fast because the DeepL circuit was open',
+)
+_translation_hedges = Counter(
+    'neemba_translation_hedges_total',
+    'Hedged (duplicate) DeepL requests, by which request answered first',
+    ['winner'],
+)
+_translation_retries = Counter(
+    'neemba_translation_retries_total',
+    'DeepL request retries, by the failure that triggered them',
+    ['reason'],
+)
+_translation_deadline_exceeded = Counter(
+    'neemba_translation_deadline_exceeded_total',
+    'Sentences dropped because their translation deadline ran out',
+)
+_deepl_limiter_concurrency = Gauge(
+    'neemba_deepl_limiter_concurrency_limit',
+    'Current AIMD limit on concurrent DeepL requests',
+)
+_deepl_limiter_rate = Gauge(
+    'neemba_deepl_limiter_chars_per_second',
+    'Current AIMD limit on characters sent to DeepL per second',
+)
+_deepl_in_flight = Gauge(
+    'neemba_deepl_in_flight_requests',
+    'DeepL requests currently in flight',
+)
+_deepl_limiter_wait = Histogram(
+    'neemba_deepl_limiter_wait_seconds',
+    'Time a DeepL request waited in the client-side rate limiter',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+_deepl_characters = Counter(
+    'neemba_deepl_characters_total',
+    'Source characters sent to DeepL',
+)
+_deepl_key_requests = Counter(
+    'neemba_deepl_key_requests_total',
+    'DeepL requests per API key (label: last 4 chars) and outcome',
+    ['key', 'outcome'],
+)
+_deepl_key_characters = Counter(
+    'neemba_deepl_key_billed_characters_total',
+    'Characters billed per DeepL API key',
+    ['key'],
+)
+_deepl_key_remaining = Gauge(
+    'neemba_deepl_key_remaining_characters',
+    'Remaining character quota per DeepL API key (from /v2/usage, decremented locally)',
+    ['key'],
+)
+_deepl_key_quarantined = Gauge(
+    'neemba_deepl_key_quarantined',
+    '1 while a DeepL API key is quarantined after an auth/quota error',
+    ['key'],
+)
+_translation_speculations = Counter(
+    'neemba_translation_speculations_total',
+    'Speculative tail translations by outcome (hit rate = hit / started)',
+    ['outcome'],
+)
+_translation_speculation_wasted = Counter(
+    'neemba_translation_speculation_wasted_characters_total',
+    'Characters sent for speculative translations that were discarded or failed',
+)
+_split_queue_wait = Histogram(
+    'neemba_split_queue_wait_seconds',
+    'Time a sentence-split job waited for a KSS thread/worker process',
+    ['backend'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+_split_duration = Histogram(
+    'neemba_split_duration_seconds',
+    'KSS split run time per job (thread) or per batched job (process)',
+    ['backend'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+_split_batch_size = Histogram(
+    'neemba_split_batch_size',
+    'Segment buffers split in one round-trip to a KSS worker process',
+    buckets=(1, 2, 3, 5, 8, 13, 21),
+)
+_split_path = Counter(
+    'neemba_split_path_total',
+    'Segment buffers split by the rule-based fast path vs sent to KSS',
+    ['path'],
+)
+_separator_coalesced_deltas = Histogram(
+    'neemba_separator_coalesced_deltas',
+    'STT deltas merged into one segment flush by the dirty-set scheduler',
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34),
+)
+_separator_lanes = Gauge(
+    'neemba_separator_lanes',
+    'Live per-session separator pipelines (lanes)',
+)
+_separator_lane_depth = Gauge(
+    'neemba_separator_lane_depth',
+    'Items waiting in a session lane by stage (input deltas, dirty segments, sentences to translate)',
+    ['session', 'stage'],
+)
+_separator_flush_timeout = Gauge(
+    'neemba_separator_flush_timeout_seconds',
+    'Effective flush timeout of a session lane (learned from its speech gaps in adaptive mode)',
+    ['session'],
+)
+_separator_clause_splits = Counter(
+    'neemba_separator_clause_splits_total',
+    'Run-on tails cut at a clause boundary, by the bound that triggered it',
+    ['reason'],
+)
+_consumer_in_flight = Gauge(
+    'neemba_consumer_in_flight_messages',
+    'NATS messages currently being handled, per durable (sliding fetch window occupancy)',
+    ['durable'],
+)
+_consumer_idle_wait = Histogram(
+    'neemba_consumer_idle_wait_seconds',
+    'Time spent on fetches that expired or came back empty while the window had free slots',
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_consumer_pending = Gauge(
+    'neemba_consumer_pending_messages',
+    'JetStream messages not yet delivered to the transcript consumer (lag), per durable',
+    ['durable'],
+)
+_consumer_ack_pending = Gauge(
+    'neemba_consumer_ack_pending_messages',
+    'JetStream messages delivered to the transcript consumer but not yet acked, per durable',
+    ['durable'],
+)
+_consumer_window = Gauge(
+    'neemba_consumer_window',
+    'Current limit on concurrently handled NATS messages, per durable',
+    ['durable'],
+)
+_consumer_fetch_batch = Gauge(
+    'neemba_consumer_fetch_batch',
+    'Current maximum number of messages requested per fetch, per durable',
+    ['durable'],
+)
+_consumer_ack_latency = Histogram(
+    'neemba_consumer_ack_latency_seconds',
+    'Time from queueing a JetStream ack/nak/term to sending it, by action',
+    ['action'],
+    buckets=(0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+_consumer_ack_batch = Histogram(
+    'neemba_consumer_ack_batch_size',
+    'JetStream acks/naks/terms sent in one AckBatcher flush',
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 64),
+)
+_consumer_partition_members = Gauge(
+    'neemba_consumer_partition_members',
+    'Live workers sharing the partitioned transcript stream',
+)
+_consumer_partitions_owned = Gauge(
+    'neemba_consumer_partitions_owned',
+    'Transcript stream partitions owned by this worker',
+)
+_consumer_handovers = Counter(
+    'neemba_consumer_partition_handovers_total',
+    'Partition handovers by outcome (released by this worker / timeout waiting for the previous owner)',
+    ['outcome'],
+)
+_split_pool_restarts = Counter(
+    'neemba_split_pool_restarts_total',
+    'KSS worker pools recreated after a worker process died',
+)
+_separator_dropped_deltas = Counter(
+    'neemba_separator_dropped_deltas_total',
+    'STT deltas dropped because their session lane was already closing',
+)
+_separator_idle_lanes_retired = Counter(
+    'neemba_separator_idle_lanes_retired_total',
+    'Session lanes retired after receiving no input for the idle TTL (no /stop)',
+)
 
 
 def set_active_session(active: bool) -> None:
@@ -47,3 +281,202 @@ def set_nats_connected(connected: bool) -> None:
 
 def record_unparseable() -> None:
     _unparseable.inc()
+
+
+def observe_deepl_request(seconds: float, outcome: str) -> None:
+    _deepl_request_seconds.labels(outcome=outcome).observe(seconds)
+
+
+def record_translation_cache(result: str) -> None:
+    _translation_cache_lookups.labels(result=result).inc()
+
+
+def record_translation_cache_eviction(reason: str) -> None:
+    _translation_cache_evictions.labels(reason=reason).inc()
+
+
+def set_translation_cache_size(size: int) -> None:
+    _translation_cache_size.set(size)
+
+
+def record_translation_memory(result: str) -> None:
+    _translation_memory_lookups.labels(result=result).inc()
+
+
+def record_translation_memory_error(op: str) -> None:
+    _translation_memory_errors.labels(op=op).inc()
+
+
+def observe_translation_memory_batch(size: int) -> None:
+    _translation_memory_batch.observe(size)
+
+
+def observe_translation_batch(size: int) -> None:
+    _translation_batch_size.observe(size)
+
+
+def set_translation_workers(total: int, *, busy: int) -> None:
+    _translation_workers.set(total)
+    _translation_workers_busy.set(busy)
+
+
+_BREAKER_STATES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+def set_translation_breaker_state(state: str) -> None:
+    _translation_breaker_state.set(_BREAKER_STATES[state])
+
+
+def record_translation_breaker_rejection() -> None:
+    _translation_breaker_rejections.inc()
+
+
+def record_translation_hedge(winner: str) -> None:
+    _translation_hedges.labels(winner=winner).inc()
+
+
+def record_translation_retry(reason: str) -> None:
+    _translation_retries.labels(reason=reason).inc()
+
+
+def record_translation_deadline_exceeded() -> None:
+    _translation_deadline_exceeded.inc()
+
+
+def set_deepl_limiter(concurrency_limit: int, chars_per_second: float) -> None:
+    _deepl_limiter_concurrency.set(concurrency_limit)
+    _deepl_limiter_rate.set(chars_per_second)
+
+
+def set_deepl_in_flight(count: int) -> None:
+    _deepl_in_flight.set(count)
+
+
+def observe_deepl_limiter_wait(seconds: float) -> None:
+    _deepl_limiter_wait.observe(seconds)
+
+
+def record_deepl_characters(count: int) -> None:
+    _deepl_characters.inc(count)
+
+
+def record_deepl_key_request(key: str, outcome: str) -> None:
+    _deepl_key_requests.labels(key=key, outcome=outcome).inc()
+
+
+def record_deepl_key_characters(key: str, count: int) -> None:
+    _deepl_key_characters.labels(key=key).inc(count)
+
+
+def set_deepl_key_remaining(key: str, remaining: int) -> None:
+    _deepl_key_remaining.labels(key=key).set(remaining)
+
+
+def set_deepl_key_quarantined(key: str, quarantined: bool) -> None:
+    _deepl_key_quarantined.labels(key=key).set(1 if quarantined else 0)
+
+
+def record_translation_speculation(outcome: str, *, wasted_chars: int = 0) -> None:
+    _translation_speculations.labels(outcome=outcome).inc()
+    if wasted_chars:
+        _translation_speculation_wasted.inc(wasted_chars)
+
+
+def observe_split_wait(backend: str, seconds: float) -> None:
+    _split_queue_wait.labels(backend=backend).observe(seconds)
+
+
+def observe_split_duration(backend: str, seconds: float) -> None:
+    _split_duration.labels(backend=backend).observe(seconds)
+
+
+def observe_split_batch(size: int) -> None:
+    _split_batch_size.observe(size)
+
+
+def record_split_path(path: str) -> None:
+    _split_path.labels(path=path).inc()
+
+
+def observe_coalesced_deltas(count: int) -> None:
+    _separator_coalesced_deltas.observe(count)
+
+
+def set_separator_lanes(count: int) -> None:
+    _separator_lanes.set(count)
+
+
+def set_separator_lane_depth(session: str, *, queued: int, dirty: int, sentences: int) -> None:
+    _separator_lane_depth.labels(session=session, stage='input').set(queued)
+    _separator_lane_depth.labels(session=session, stage='dirty').set(dirty)
+    _separator_lane_depth.labels(session=session, stage='sentences').set(sentences)
+
+
+def remove_separator_lane(session: str) -> None:
+    for stage in ('input', 'dirty', 'sentences'):
+        with contextlib.suppress(KeyError):
+            _separator_lane_depth.remove(session, stage)
+    with contextlib.suppress(KeyError):
+        _separator_flush_timeout.remove(session)
+
+
+def set_separator_flush_timeout(session: str, seconds: float) -> None:
+    _separator_flush_timeout.labels(session=session).set(seconds)
+
+
+def record_clause_split(reason: str) -> None:
+    _separator_clause_splits.labels(reason=reason).inc()
+
+
+def set_consumer_in_flight(durable: str, count: int) -> None:
+    _consumer_in_flight.labels(durable=durable).set(count)
+
+
+def observe_consumer_idle_wait(seconds: float) -> None:
+    _consumer_idle_wait.observe(seconds)
+
+
+def set_consumer_lag(durable: str, pending: int, ack_pending: int) -> None:
+    _consumer_pending.labels(durable=durable).set(pending)
+    _consumer_ack_pending.labels(durable=durable).set(ack_pending)
+
+
+def set_consumer_window(durable: str, window: int, fetch_batch: int) -> None:
+    _consumer_window.labels(durable=durable).set(window)
+    _consumer_fetch_batch.labels(durable=durable).set(fetch_batch)
+
+
+def remove_consumer_durable(durable: str) -> None:
+    for gauge in (_consumer_in_flight, _consumer_pending, _consumer_ack_pending,
+                  _consumer_window, _consumer_fetch_batch):
+        with contextlib.suppress(KeyError):
+            gauge.remove(durable)
+
+
+def observe_ack_latency(action: str, seconds: float) -> None:
+    _consumer_ack_latency.labels(action=action).observe(seconds)
+
+
+def observe_ack_batch(size: int) -> None:
+    _consumer_ack_batch.observe(size)
+
+
+def set_consumer_partitions(*, members: int, owned: int) -> None:
+    _consumer_partition_members.set(members)
+    _consumer_partitions_owned.set(owned)
+
+
+def record_consumer_handover(outcome: str) -> None:
+    _consumer_handovers.labels(outcome=outcome).inc()
+
+
+def record_split_pool_restart() -> None:
+    _split_pool_restarts.inc()
+
+
+def record_separator_dropped_delta() -> None:
+    _separator_dropped_deltas.inc()
+
+
+def record_separator_idle_lane_retired() -> None:
+    _separator_idle_lanes_retired.inc()
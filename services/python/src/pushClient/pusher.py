@@ -59,15 +59,18 @@ class Pusher:
         source_lang: str | None = None,
         target_lang: str | None = None,
         confidence: float | None = None,
+        primary: bool = True,
     ) -> None:
         # 1) Client delivery — hot path, must not be blocked by capture.
         # session_id gates the hub slot: stale sessions are dropped there.
         # A missing session_id can never match the slot owner, so it drops too.
+        # target_lang routes the sentence to that language's subscribers;
+        # only the session's primary language reaches the slot client.
         await self.hub.broadcast_to_session(session_id or '', payload={
             "sequence": sequence,
             "sentence": push_text,
             "isFinal": True,
-        })
+        }, target_lang=target_lang, primary=primary)
 
         # 2) Monitoring capture — fire-and-forget, isolated. Only when we have
         #    enough context (source text + session) to store a pair.
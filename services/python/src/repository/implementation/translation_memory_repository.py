@@ -0,0 +1,76 @@
+"""asyncpg access to ``app.translation_memory`` (exact-match TM).
+
+The table is keyed on ``(source_hash, source_lang, target_lang)``; see
+migration ``0002_translation_memory``. Hashing, normalization and the
+masked-safe rule live in ``src/translation/memory.py`` — this module only
+moves rows. Every value is a bound parameter.
+"""
+from __future__ import annotations
+
+# --- SQL -------------------------------------------------------------------
+
+# One round-trip for any number of pending sentences: the (hash, target)
+# pairs are unnested and joined against the primary key.
+_LOOKUP_SQL = (
+    "SELECT m.source_hash, m.target_lang, m.translated_text "
+    "FROM app.translation_memory m "
+    "JOIN unnest($2::text[], $3::text[]) AS k(source_hash, target_lang) "
+    "  ON m.source_hash = k.source_hash AND m.target_lang = k.target_lang "
+    "WHERE m.source_lang = $1"
+)
+
+# First writer wins; a later (possibly different) DeepL output for the same
+# sentence never churns the row.
+_INSERT_SQL = (
+    "INSERT INTO app.translation_memory "
+    "(source_hash, source_lang, target_lang, source_text, translated_text) "
+    "VALUES ($1, $2, $3, $4, $5) "
+    "ON CONFLICT (source_hash, source_lang, target_lang) DO NOTHING"
+)
+
+# Newest-first keyset page over the capture history (warm-up job).
+_HISTORY_PAGE_SQL = (
+    "SELECT id, source_text, translated_text, source_lang, target_lang "
+    "FROM app.translations "
+    "WHERE ($1::bigint IS NULL OR id < $1) "
+    "ORDER BY id DESC "
+    "LIMIT $2"
+)
+
+
+async def lookup_translation_memory(
+    pool,
+    source_lang: str,
+    keys: list[tuple[str, str]],
+) -> dict[tuple[str, str], str]:
+    """Return ``{(source_hash, target_lang): translated_text}`` for the hits."""
+    if not keys:
+        return {}
+    hashes = [h for h, _ in keys]
+    targets = [t for _, t in keys]
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(_LOOKUP_SQL, source_lang, hashes, targets)
+    return {(r["source_hash"], r["target_lang"]): r["translated_text"] for r in rows}
+
+
+async def insert_translation_memory(
+    pool,
+    entries: list[tuple[str, str, str, str, str]],
+) -> None:
+    """Insert ``(source_hash, source_lang, target_lang, source_text,
+    translated_text)`` rows, skipping keys that already exist."""
+    if not entries:
+        return
+    async with pool.acquire() as conn:
+        await conn.executemany(_INSERT_SQL, entries)
+
+
+async def fetch_translation_history_page(
+    pool,
+    *,
+    before_id: int | None,
+    limit: int,
+) -> list:
+    """One newest-first page of ``app.translations`` below ``before_id``."""
+    async with pool.acquire() as conn:
+        return await conn.fetch(_HISTORY_PAGE_SQL, before_id, limit)
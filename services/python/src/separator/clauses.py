@@ -0,0 +1,33 @@
+"""Clause boundaries for run-on speech.
+
+A preacher can talk for 20–30 seconds without a sentence-final ending, so
+the unfinished tail grows until the flush timeout ships it as one huge
+chunk: late subtitles and an oversized DeepL request. Once a tail is too
+long or too old, the separator cuts it at the last clause boundary found by
+:func:`last_clause_boundary` — a comma, or a word ending in a connective
+ending (-고, -는데, -니까, -면서, -지만, -어서 …) — and translates the head
+on its own.
+"""
+from __future__ import annotations
+
+import re
+
+_CONNECTIVE_ENDINGS = (
+    '고', '는데', '은데', '인데', '니까', '면서', '지만', '어서', '아서', '해서',
+    '므로', '며', '려고', '도록', '는데도', '거나',
+)
+# A comma, or a Hangul word ending in a connective ending, then whitespace.
+_COMMA = re.compile(r',(?=\s)')
+_CONNECTIVE = re.compile(
+    r'[가-힣](?:' + '|'.join(sorted(_CONNECTIVE_ENDINGS, key=len, reverse=True)) + r')(?=\s)')
+
+
+def last_clause_boundary(text: str, min_chars: int = 10) -> int | None:
+    """Offset just past the last clause boundary in ``text`` whose head is at
+    least ``min_chars`` long, preferring commas; None if there is none."""
+    for pattern in (_COMMA, _CONNECTIVE):
+        ends = [match.end() for match in pattern.finditer(text)
+                if len(text[:match.end()].strip()) >= min_chars]
+        if ends:
+            return ends[-1]
+    return None
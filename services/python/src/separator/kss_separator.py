@@ -1,14 +1,19 @@
 import asyncio
-import re
-
-
-from dataclasses import dataclass
-from typing import List, Protocol
+from dataclasses import dataclass, field
+from typing import Protocol
 
+from deepl import TextResult
 from kss import Kss  # type: ignore
 
-from deepl import TextResult
 from src.dto.translationDto import TranslationRequestDto
+from src.monitoring import metrics
+from src.separator.clauses import last_clause_boundary
+from src.separator.rule_splitter import split_unambiguous
+from src.separator.scheduler import DirtySet, RoundRobinQueue, TimerHeap
+from src.separator.split_backends import split_in_thread
+from src.translation.cache import normalize_source, translation_cache_bypassed
+from src.translation.memory import translation_source_language
+from src.translation.resilience import LatencyTracker, translation_deadline
 
 
 @dataclass
@@ -29,6 +34,18 @@ class SegmentState:
     force_closed: bool = False
     # Monotonic clock of the last buffer append; drives the timeout flush.
     last_appended_at: float = 0.0
+    # False when the session opted out of the translation cache.
+    use_translation_cache: bool = True
+    # Languages the session wants besides target_lang (multi-target fan-out).
+    extra_target_langs: tuple[str, ...] = ()
+    # Length of the buffer prefix KSS already examined and found to hold no
+    # sentence boundary (the unfinished tail of the previous flush).
+    split_checked: int = 0
+    # Deltas appended since the last flush (merged into that one flush).
+    pending_deltas: int = 0
+    # Monotonic clock when the current unfinished tail started (0 = none);
+    # drives the clause split's max age.
+    tail_since: float = 0.0
 
 
 @dataclass
@@ -41,6 +58,64 @@ class PendingSentence:
     source_lang: str | None
     target_lang: str | None
     confidence: float
+    use_translation_cache: bool = True
+    # False for the session's additional target languages: those go only to
+    # the hub's language subscribers, never to the primary client slot.
+    primary: bool = True
+    # Position in source order among the session's sentences in this target
+    # language; the reorder buffer delivers by it.
+    ordinal: int = 0
+    # Event-loop time by which the translation must be back (queueing
+    # included); past it the sentence is dropped instead of arriving late.
+    deadline: float | None = None
+    # Translation started speculatively while this text was still the
+    # segment's unfinished tail; awaited instead of a new DeepL call.
+    speculation: 'asyncio.Task[object] | None' = None
+
+
+@dataclass
+class _Speculation:
+    """Early translations of a segment's idle, unfinished tail (one task per
+    target language), keyed by the tail's normalized text."""
+    text: str
+    tasks: dict[str | None, 'asyncio.Task[object]']
+
+
+@dataclass
+class _ReorderState:
+    """Reorder buffer of one (session, target language): workers finish out
+    of order, delivery happens strictly by ordinal. Each language is ordered
+    on its own, so a stalled extra language never holds back the primary
+    one. Exists only while sentences are in flight."""
+    next_ordinal: int = 0
+    next_delivery: int = 0
+    ready: dict[int, tuple[PendingSentence, object]] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@dataclass
+class _SessionLane:
+    """One session's store → split stage: its own input queue, dirty set and
+    tasks, so a chatty session or a stuck split only delays that session.
+    Created on the session's first message, retired by close_session: it
+    stays registered (``closing``) until its flush loop has drained, so a
+    late offer cannot open a second lane for the same session. A lane that
+    gets no input for ``lane_idle_seconds`` (its client left without a
+    /stop) is retired by the timeout sweeper once it has nothing in flight."""
+    session_id: str
+    queue: 'asyncio.Queue[TranslationRequestDto | None]' = field(
+        default_factory=lambda: asyncio.Queue(maxsize=1000))
+    dirty: DirtySet['SegmentState'] = field(default_factory=DirtySet)
+    tasks: list['asyncio.Task[None]'] = field(default_factory=list)
+    # Effective flush timeout; learned from `gaps` in adaptive mode.
+    flush_timeout: float = 2.0
+    gaps: LatencyTracker | None = None
+    last_delta_at: float | None = None
+    # Loop time of the last stored delta; drives idle retirement.
+    last_active_at: float = 0.0
+    # True while the flush loop is splitting what it drained.
+    flushing: bool = False
+    closing: bool = False
 
 
 class Pusher(Protocol):
@@ -55,12 +130,37 @@ class Pusher(Protocol):
         source_lang: str | None = None,
         target_lang: str | None = None,
         confidence: float | None = None,
+        primary: bool = True,
     ): ...
 
 
+class SplitBackend(Protocol):
+    async def split(self, text: str) -> list[str]: ...
+
+
 class Translator(Protocol):
-    def translate(self, source_text: str,
-                  target_language: str) -> TextResult | list[TextResult]: ...
+    # Async so a DeepL round-trip never stalls the event loop (WS sends,
+    # NATS fetch and keepalives all share it).
+    async def translate(self, source_text: str,
+                        target_language: str) -> TextResult | list[TextResult]: ...
+
+
+# 문장 종결 표지 (구두점 + 한국어 종결어미).
+# 단순 종결어미: 다, 요, 죠, 네
+# 복합 종결어미: ~어요, ~아요, ~는데요, ~습니다, ~습니까, ~지요, ~게요, ~을게요,
+#                ~을까요, ~으니까요, ~네요, ~인데요, ~래요, ~거예요, ~니다
+_SENTENCE_ENDINGS = (
+    '.', '!', '?', '…',
+    '다', '요', '죠', '네',
+    '어요', '아요', '는데요', '은데요', '습니다', '습니까', '지요', '게요',
+    '을게요', '을까요', '으니까요', '네요', '인데요', '래요', '거예요', '니다',
+)
+# 다른 표지로 끝나는 표지(예: '습니다' ⊃ '다')는 중복이므로 빼고, 남은 접미사를
+# str.endswith 한 번으로 검사한다 — 꼬리 몇 글자만 보는 단일 패스.
+_CLOSING_SUFFIXES = tuple(
+    ending for ending in _SENTENCE_ENDINGS
+    if not any(other != ending and ending.endswith(other) for other in _SENTENCE_ENDINGS)
+)
 
 
 def _is_sentence_closed(text: str) -> bool:
@@ -68,45 +168,12 @@ def _is_sentence_closed(text: str) -> bool:
     문장이 종결되었는지 확인하는 함수
     - 마침표, 느낌표, 물음표, 줄임표로 끝나는지 확인
     - 한국어 종결어미로 끝나는지 확인 (공백 유무와 관계없이)
+
+    flush 마다 세그먼트별로 호출되므로, 패턴 18개를 차례로 re.search 하던
+    방식 대신 미리 계산한 접미사 튜플로 꼬리만 한 번 검사한다 (결과 동일).
     """
-    text = text.strip()
-    if not text:
-        return False
-
-    # 구두점으로 끝나는지 확인
-    if re.search(r'[\.!\?…]\s*$', text):
-        return True
-
-    # 한국어 종결어미로 끝나는지 확인
-    # 단순 종결어미: 다, 요, 죠, 네, 어요, 아요
-    # 복합 종결어미: ~는데요, ~습니다, ~습니까, ~지요, ~게요, ~을게요, ~을까요,
-    #                ~으니까요, ~네요, ~인데요, ~래요, ~거예요 등
-    # 공백이 있을 수도 있고 없을 수도 있음
-    endings = [
-        r'[다요죠네]\s*$',  # 단순 종결어미
-        r'어요\s*$',
-        r'아요\s*$',
-        r'는데요\s*$',
-        r'은데요\s*$',
-        r'습니다\s*$',
-        r'습니까\s*$',
-        r'지요\s*$',
-        r'게요\s*$',
-        r'을게요\s*$',
-        r'을까요\s*$',
-        r'으니까요\s*$',
-        r'네요\s*$',
-        r'인데요\s*$',
-        r'래요\s*$',
-        r'거예요\s*$',
-        r'니다\s*$',
-    ]
-
-    for ending in endings:
-        if re.search(ending, text):
-            return True
-
-    return False
+    # 끝 공백만 떼면 충분하다: 앞 공백은 결과에 영향이 없다.
+    return text.rstrip().endswith(_CLOSING_SUFFIXES)
 
 
 class SentenceSeparator:
@@ -114,19 +181,94 @@ class SentenceSeparator:
                  translator: Translator,
                  pusher: Pusher,
                  flush_timeout_seconds: float = 2.0,
+                 batch_window_seconds: float = 0.03,
+                 max_batch_size: int = 16,
+                 translation_workers: int = 4,
+                 translation_deadline_seconds: float = 5.0,
+                 speculative_translation: bool = False,
+                 speculation_idle_seconds: float = 0.6,
+                 speculation_min_chars: int = 8,
+                 split_lookback_chars: int = 64,
+                 split_backend: SplitBackend | None = None,
+                 fast_path_split: bool = False,
+                 adaptive_flush_timeout: bool = False,
+                 flush_timeout_quantile: float = 0.95,
+                 flush_timeout_min_seconds: float = 0.8,
+                 flush_timeout_max_seconds: float = 4.0,
+                 clause_max_chars: int | None = None,
+                 clause_max_age_seconds: float | None = None,
+                 clause_min_chars: int = 10,
+                 lane_idle_seconds: float | None = 300.0,
                  ) -> None:
         # After this much input silence, an unfinished buffered sentence is
         # shipped as-is instead of waiting (possibly forever) for a closing
         # ending. Tune against real speech pauses.
         self._flush_timeout = flush_timeout_seconds
+        # Adaptive mode: each session's timeout is the flush_timeout_quantile
+        # of its own inter-delta gaps, clamped to [min, max] — quick speakers
+        # get their tail sooner, slow ones are not cut off mid-sentence.
+        # flush_timeout_seconds applies until enough gaps were seen.
+        self._adaptive_flush_timeout = adaptive_flush_timeout
+        self._flush_timeout_quantile = flush_timeout_quantile
+        self._flush_timeout_min = flush_timeout_min_seconds
+        self._flush_timeout_max = flush_timeout_max_seconds
+        # Run-on speech: once the unfinished tail is longer than
+        # clause_max_chars or older than clause_max_age_seconds, its head up
+        # to the last clause boundary (comma / connective ending) is
+        # translated on its own. None = no bound (wait for the timeout).
+        self._clause_max_chars = clause_max_chars
+        self._clause_max_age = clause_max_age_seconds
+        self._clause_min_chars = clause_min_chars
+        # A session that disconnects without /stop never calls close_session:
+        # its lane (tasks, segment states, metric series) is retired after
+        # this long without input instead. None = only close_session retires.
+        self._lane_idle = lane_idle_seconds
+        # _push_loop waits up to this long for more sentences to join a
+        # translation burst (capped at max_batch_size). 0 = no waiting, only
+        # what is already queued is batched.
+        self._batch_window = batch_window_seconds
+        self._max_batch_size = max(1, max_batch_size)
+        # Parallel _push_loop workers: one slow DeepL response no longer
+        # head-of-line blocks every other session's sentences.
+        self._worker_count = max(1, translation_workers)
+        self._busy_workers = 0
+        # Latency budget of one sentence from split to delivery; retries and
+        # hedges below the batcher only spend what is left of it.
+        self._translation_deadline = translation_deadline_seconds
+        # Speculative mode: once the unfinished tail has been idle for
+        # speculation_idle_seconds (well before the flush timeout), translate
+        # it early; if it is later finalized unchanged the result is reused.
+        self._speculative = speculative_translation
+        self._speculation_idle = speculation_idle_seconds
+        self._speculation_min_chars = speculation_min_chars
+        self._speculations: dict[tuple[str, int], _Speculation] = {}
+        # Incremental splitting: KSS only re-examines this many characters of
+        # an already-checked unfinished tail (plus the new deltas), so a long
+        # unpunctuated monologue is not re-split from scratch on every delta.
+        self._split_lookback = split_lookback_chars
+        # Rule-based pre-splitter: buffers whose boundaries are unambiguous
+        # (plain terminal punctuation, no possible ending mid-sentence) skip
+        # the KSS call; only ambiguous ones reach self.splitter.
+        self._fast_path_split = fast_path_split
+        self._reorder: dict[tuple[str, str | None], _ReorderState] = {}
         self._lock = asyncio.Lock()
         self._tasks: list[asyncio.Task[None]] = []
-        self.queue: asyncio.Queue[TranslationRequestDto] = asyncio.Queue(
-            maxsize=1000)
-        self.sentence_queue: asyncio.Queue[PendingSentence] = asyncio.Queue(
-        )
-        self.state_queue: asyncio.Queue[SegmentState] = asyncio.Queue()
+        # Per-session pipelines (input queue → store → dirty set → split);
+        # the translation workers are shared and take sentences from every
+        # session in turn.
+        self._lanes: dict[str, _SessionLane] = {}
+        self._lane_tasks: set[asyncio.Task[None]] = set()
+        self.sentence_queue: RoundRobinQueue[str, PendingSentence] = RoundRobinQueue()
+        # Flush-timeout / speculation deadlines keyed by
+        # (session_id, segment_id, kind), earliest first; lane idle deadlines
+        # by (session_id, None, 'idle').
+        self._timers: TimerHeap[SegmentState | _SessionLane] = TimerHeap()
         self.state_by_key: dict[tuple[str, int], SegmentState] = {}
+        # Sessions that opted out of the translation cache at start.
+        self._cache_disabled_sessions: set[str] = set()
+        # Every target language a session declared at start; the split runs
+        # once and each sentence is translated per language.
+        self._target_langs_by_session: dict[str, tuple[str, ...]] = {}
 
         self._start = False
         self._stop = False
@@ -135,6 +277,9 @@ class SentenceSeparator:
         self.pusher = pusher
         self.translator = translator
         self.splitter = Kss("split_sentences")
+        # None = run self.splitter on the default thread pool; otherwise e.g.
+        # a ProcessPoolSplitter with its own warm KSS worker processes.
+        self.split_backend = split_backend
 
     async def start(self) -> None:
         async with self._lock:
@@ -142,11 +287,13 @@ class SentenceSeparator:
                 return
             self._start = True
         self._tasks = [
-            asyncio.create_task(self._flush()),
-            asyncio.create_task(self._store_text_loop()),
-            asyncio.create_task(self._push_loop()),
             asyncio.create_task(self._timeout_sweeper()),
+            *(asyncio.create_task(self._push_loop())
+              for _ in range(self._worker_count)),
         ]
+        for lane in self._lanes.values():
+            self._start_lane(lane)
+        metrics.set_translation_workers(self._worker_count, busy=0)
 
     async def stop(self) -> None:
         self._stop = True
@@ -154,16 +301,88 @@ class SentenceSeparator:
             if t:
                 t.cancel()
 
-        await asyncio.gather(*self._tasks, return_exceptions=True)
+        lane_tasks = list(self._lane_tasks)
+        for t in lane_tasks:
+            t.cancel()
+
+        await asyncio.gather(*self._tasks, *lane_tasks, return_exceptions=True)
         self._tasks.clear()
+        for key in list(self._speculations):
+            self._discard_speculation(key)
 
     async def offer(self, event: TranslationRequestDto):
-        await self.queue.put(event)
+        lane = self._lane(event.session_id)
+        if lane.closing:
+            # Queued behind close_session's marker it would never be stored.
+            metrics.record_separator_dropped_delta()
+            print(f'separator: delta for closing session dropped '
+                  f'(session={event.session_id} seq={event.sequence})')
+            return
+        await lane.queue.put(event)
+        self._report_lane_depth(lane)
+
+    def _lane(self, session_id: str) -> _SessionLane:
+        lane = self._lanes.get(session_id)
+        if lane is None:
+            lane = self._lanes[session_id] = _SessionLane(
+                session_id, flush_timeout=self._flush_timeout,
+                gaps=LatencyTracker() if self._adaptive_flush_timeout else None)
+            metrics.set_separator_lanes(len(self._lanes))
+            metrics.set_separator_flush_timeout(session_id, lane.flush_timeout)
+            if self._start and not self._stop:
+                self._start_lane(lane)
+        return lane
+
+    def _start_lane(self, lane: _SessionLane) -> None:
+        lane.tasks = [
+            asyncio.create_task(self._store_text_loop(lane)),
+            asyncio.create_task(self._flush(lane)),
+        ]
+        for task in lane.tasks:
+            self._lane_tasks.add(task)
+            task.add_done_callback(self._lane_tasks.discard)
+
+    def _observe_gap(self, lane: _SessionLane, now: float) -> None:
+        """Learn the session's flush timeout from its inter-delta gaps."""
+        assert lane.gaps is not None
+        previous, lane.last_delta_at = lane.last_delta_at, now
+        if previous is None:
+            return
+        gap = now - previous
+        if gap > self._flush_timeout_max:
+            return  # between utterances, not a pause in speech
+        lane.gaps.observe(gap)
+        learned = lane.gaps.quantile(self._flush_timeout_quantile)
+        if learned is None:
+            return
+        timeout = min(max(learned, self._flush_timeout_min), self._flush_timeout_max)
+        if timeout != lane.flush_timeout:
+            lane.flush_timeout = timeout
+            metrics.set_separator_flush_timeout(lane.session_id, timeout)
+
+    def _flush_timeout_for(self, session_id: str) -> float:
+        lane = self._lanes.get(session_id)
+        return lane.flush_timeout if lane is not None else self._flush_timeout
+
+    def _report_lane_depth(self, lane: _SessionLane) -> None:
+        if self._lanes.get(lane.session_id) is not lane:
+            return  # retired (its gauges are already removed)
+        metrics.set_separator_lane_depth(
+            lane.session_id,
+            queued=lane.queue.qsize(),
+            dirty=len(lane.dirty),
+            sentences=self.sentence_queue.qsize(lane.session_id),
+        )
 
-    async def _store_text_loop(self) -> None:
+    async def _store_text_loop(self, lane: _SessionLane) -> None:
         try:
             while not self._stop:
-                event: TranslationRequestDto = await self.queue.get()
+                event = await lane.queue.get()
+                lane.queue.task_done()
+                if event is None:
+                    # close_session: every event queued before it is stored.
+                    self._close_segments(lane.session_id, lane)
+                    return
                 key = (event.session_id, event.segment_id)
 
                 if key not in self.state_by_key:
@@ -177,14 +396,18 @@ class SentenceSeparator:
                     ]
                     for stale_key in stale_keys:
                         stale = self.state_by_key.pop(stale_key)
+                        self._cancel_timers(stale_key)
+                        # Even if empty: its snapshot may be mid-split.
+                        stale.force_closed = True
                         if stale.buffer.strip():
-                            stale.force_closed = True
-                            await self.state_queue.put(stale)
+                            lane.dirty.mark(stale)
 
                 state = self.state_by_key.setdefault(key, SegmentState())
 
                 state.buffer = (state.buffer + event.source_text).strip()
                 state.last_appended_at = asyncio.get_running_loop().time()
+                if lane.gaps is not None:
+                    self._observe_gap(lane, state.last_appended_at)
                 # Carry the latest metadata so a flushed sentence keeps its
                 # session/segment context for monitoring + storage.
                 state.session_id = event.session_id
@@ -193,126 +416,519 @@ class SentenceSeparator:
                 state.source_lang = event.source_lang
                 state.target_lang = event.target_lang
                 state.confidence = event.confidence
-                await self.state_queue.put(state)
+                state.use_translation_cache = (
+                    event.session_id not in self._cache_disabled_sessions)
+                state.extra_target_langs = tuple(
+                    lang for lang in self._target_langs_by_session.get(event.session_id, ())
+                    if lang.upper() != (event.target_lang or '').upper())
+                state.pending_deltas += 1
+                self._arm_timers(state)
+                lane.last_active_at = state.last_appended_at
+                if self._lane_idle is not None:
+                    self._timers.arm((lane.session_id, None, 'idle'),
+                                     lane.last_active_at + self._lane_idle, lane)
+                lane.dirty.mark(state)
+                self._report_lane_depth(lane)
         finally:
-            self.queue.task_done()
+            # Lets the flush loop finish what is already dirty, then exit.
+            lane.dirty.close()
 
     async def _push_loop(self) -> None:
+        """One of ``translation_workers`` identical workers."""
         while not self._stop:
-            item = await self.sentence_queue.get()
+            batch = await self._next_sentence_batch()
+            for session_id in {item.session_id for item in batch}:
+                lane = self._lanes.get(session_id)
+                if lane is not None:
+                    self._report_lane_depth(lane)
+            self._set_busy(+1)
             try:
-                # Translate to the segment's requested target language
-                # (falls back to en-US); recorded as the pair's target_lang.
-                target_language = item.target_lang or 'en-US'
-                translated = self.translator.translate(
-                    item.source_text, target_language=target_language)
-                await self.pusher.push_to_client(
-                    translated,
-                    item.sequence,
-                    source_text=item.source_text,
-                    session_id=item.session_id,
-                    segment_id=item.segment_id,
-                    source_lang=item.source_lang,
-                    target_lang=target_language,
-                    confidence=item.confidence,
-                )
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                # One failed translation must not kill the pipeline task; the
-                # sentence is logged and dropped (retry policy is a follow-up).
-                print(
-                    f'separator: translate/push failed, sentence dropped '
-                    f'(session={item.session_id} seq={item.sequence}): {exc!r}')
+                # Translate the burst concurrently — the batching translator
+                # merges same-language calls into one DeepL request — and
+                # hand each result to its reorder buffer as soon as it is
+                # back: a slow sentence never holds back the rest of the burst.
+                await asyncio.gather(
+                    *(self._translate_and_complete(item) for item in batch),
+                    return_exceptions=True)
             finally:
-                self.sentence_queue.task_done()
+                self._set_busy(-1)
 
-    async def _flush(self) -> None:
+    async def _translate_and_complete(self, item: PendingSentence) -> None:
+        try:
+            result: object = await self._translate(item)
+        except Exception as exc:
+            result = exc
+        await self._complete(item, result)
+
+    def _set_busy(self, delta: int) -> None:
+        self._busy_workers += delta
+        metrics.set_translation_workers(self._worker_count, busy=self._busy_workers)
+
+    async def _complete(self, item: PendingSentence, result: object) -> None:
+        """Deliver ``item`` once every earlier sentence of its session and
+        language has been delivered (or dropped); later ones wait in the
+        buffer."""
+        key = (item.session_id, item.target_lang)
+        reorder = self._reorder.get(key)
+        if reorder is None:
+            await self._deliver(item, result)
+            return
+        reorder.ready[item.ordinal] = (item, result)
+        async with reorder.lock:
+            while reorder.next_delivery in reorder.ready:
+                ready_item, ready_result = reorder.ready.pop(reorder.next_delivery)
+                await self._deliver(ready_item, ready_result)
+                reorder.next_delivery += 1
+            # Nothing in flight any more: drop the state (recreated, counting
+            # from zero, by the session's next sentence).
+            if (reorder.next_delivery == reorder.next_ordinal
+                    and self._reorder.get(key) is reorder):
+                del self._reorder[key]
+
+    async def _next_sentence_batch(self) -> list[PendingSentence]:
+        """Block for one sentence, then gather more for up to the batch
+        window (a KSS split usually enqueues several at once)."""
+        batch = [await self.sentence_queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_window
+        while len(batch) < self._max_batch_size:
+            if not self.sentence_queue.empty():
+                batch.append(self.sentence_queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.sentence_queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _translate(self, item: PendingSentence) -> TextResult | list[TextResult]:
+        if item.speculation is not None:
+            # Counted as a hit only once the early result is actually usable.
+            try:
+                # Shielded so this worker's own cancellation is told apart
+                # from a discarded speculation.
+                result = await asyncio.shield(item.speculation)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if (current is not None and current.cancelling()) or not item.speculation.cancelled():
+                    # The worker is being cancelled (stop()): take the early
+                    # call down with it instead of starting a fresh one.
+                    item.speculation.cancel()
+                    raise
+            except Exception:
+                # The early call failed; translate normally below.
+                metrics.record_translation_speculation('failed', wasted_chars=len(item.source_text))
+            else:
+                metrics.record_translation_speculation('hit')
+                return result
+        # Translate to the segment's requested target language (falls back
+        # to en-US); recorded as the pair's target_lang.
+        with translation_cache_bypassed(not item.use_translation_cache), \
+                translation_deadline(item.deadline), \
+                translation_source_language(item.source_lang):
+            async with asyncio.timeout_at(item.deadline):
+                return await self.translator.translate(
+                    item.source_text, target_language=item.target_lang or 'en-US')
+
+    async def _deliver(self, item: PendingSentence, translated: object) -> None:
+        # One failed translation must not kill the pipeline task; the
+        # sentence is logged and dropped (retries/hedging already happened
+        # within its deadline, below the batcher).
+        if isinstance(translated, BaseException):
+            if isinstance(translated, TimeoutError):
+                metrics.record_translation_deadline_exceeded()
+            print(
+                f'separator: translate failed, sentence dropped '
+                f'(session={item.session_id} seq={item.sequence}): {translated!r}')
+            return
+        try:
+            await self.pusher.push_to_client(
+                translated,
+                item.sequence,
+                source_text=item.source_text,
+                session_id=item.session_id,
+                segment_id=item.segment_id,
+                source_lang=item.source_lang,
+                target_lang=item.target_lang or 'en-US',
+                confidence=item.confidence,
+                primary=item.primary,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(
+                f'separator: push failed, sentence dropped '
+                f'(session={item.session_id} seq={item.sequence}): {exc!r}')
+
+    async def _flush(self, lane: _SessionLane) -> None:
+        try:
+            await self._flush_lane(lane)
+        finally:
+            if lane.closing:
+                self._retire_lane(lane)
+
+    def _retire_lane(self, lane: _SessionLane) -> None:
+        if self._lanes.get(lane.session_id) is not lane:
+            return  # already retired; a newer lane may own the labels now
+        del self._lanes[lane.session_id]
+        metrics.set_separator_lanes(len(self._lanes))
+        metrics.remove_separator_lane(lane.session_id)
+        self._timers.cancel((lane.session_id, None, 'idle'))
+
+    def _lane_busy(self, lane: _SessionLane) -> bool:
+        session_id = lane.session_id
+        return bool(
+            lane.flushing or lane.queue.qsize() or len(lane.dirty)
+            or self.sentence_queue.qsize(session_id)
+            or any(key[0] == session_id for key in self._reorder)
+            or any(state.buffer.strip() for key, state in self.state_by_key.items()
+                   if key[0] == session_id))
+
+    def _on_lane_idle(self, lane: _SessionLane, now: float) -> None:
+        if self._lanes.get(lane.session_id) is not lane or lane.closing:
+            return
+        key = (lane.session_id, None, 'idle')
+        due = lane.last_active_at + (self._lane_idle or 0.0)
+        if now < due:
+            self._timers.arm(key, due, lane)  # input arrived since it was armed
+            return
+        if self._lane_busy(lane):
+            # A tail still waiting for its flush timeout, or sentences in
+            # flight: look again once they have had time to finish.
+            self._timers.arm(key, now + lane.flush_timeout, lane)
+            return
+        # Nothing buffered or in flight, so cancelling the (idle) store and
+        # flush tasks loses nothing. The session's settings stay: a later
+        # message opens a fresh lane.
+        print(f'separator: lane of idle session {lane.session_id} retired')
+        metrics.record_separator_idle_lane_retired()
+        for spec_key in [k for k in self._speculations if k[0] == lane.session_id]:
+            self._discard_speculation(spec_key)
+        self._close_segments(lane.session_id, None)
+        lane.closing = True
+        self._retire_lane(lane)
+        for task in lane.tasks:
+            task.cancel()
+
+    async def _flush_lane(self, lane: _SessionLane) -> None:
         while not self._stop:
-            state = await self.state_queue.get()
-
-            # Snapshot-and-clear with no await in between, so the store loop
-            # cannot interleave here. Deltas arriving while KSS runs in the
-            # worker thread accumulate in state.buffer and are re-merged
-            # below instead of being overwritten (data-loss race).
+            # Every segment that became dirty since the last drain; all the
+            # deltas a segment received meanwhile are flushed together.
+            states = await lane.dirty.drain()
+            if not states:
+                return  # lane retired and fully flushed
+            lane.flushing = True
+            try:
+                await self._flush_states(lane, states)
+            finally:
+                lane.flushing = False
+
+    async def _flush_states(self, lane: _SessionLane, states: list[SegmentState]) -> None:
+        # Snapshot-and-clear with no await in between, so the store loop
+        # cannot interleave here. Deltas arriving while KSS runs (worker
+        # thread or process) accumulate in state.buffer and are re-merged
+        # below instead of being overwritten (data-loss race).
+        jobs: list[tuple[SegmentState, str, int]] = []
+        for state in states:
             snapshot = state.buffer
+            checked = state.split_checked
             state.buffer = ''
+            state.split_checked = 0
+            if state.pending_deltas:
+                metrics.observe_coalesced_deltas(state.pending_deltas)
+                state.pending_deltas = 0
             if not snapshot.strip():
                 continue
-
-            try:
-                sentences: List[str] = await asyncio.to_thread(
-                    self.splitter, snapshot)
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                # Transient splitter failure: put the text back (in front of
-                # any deltas that arrived meanwhile) and keep the task alive.
-                state.buffer = snapshot + state.buffer
-                print(f'separator: split failed, buffer retained: {exc!r}')
-                continue
-
-            if not sentences:
-                state.buffer = snapshot + state.buffer
-                continue
-
-            last = sentences[-1]
-
-            closed = state.force_closed or _is_sentence_closed(last)
-            # One-shot: a rotation/stop/timeout mark applies to this flush
-            # only, never to the segment's future sentences.
-            state.force_closed = False
-
-            end = len(sentences) if closed else max(
-                0, len(sentences) - 1)
-
-            for s in sentences[:end]:
-                s_clean = s.strip()
-                if s_clean:
-                    await self.sentence_queue.put(PendingSentence(
-                        source_text=s_clean,
-                        session_id=state.session_id,
-                        segment_id=state.segment_id,
-                        sequence=state.sequence,
-                        source_lang=state.source_lang,
-                        target_lang=state.target_lang,
-                        confidence=state.confidence,
-                    ))
-            if not closed:
-                # The unfinished tail goes back in front of whatever arrived
-                # while the splitter was running.
-                state.buffer = last + state.buffer
+            jobs.append((state, snapshot, self._split_window_start(snapshot, checked)))
+        if not jobs:
+            return
+
+        # Every segment that became dirty together is split together
+        # (one round-trip on the process backend).
+        results = await asyncio.gather(
+            *(self._split(snapshot[window_start:]) for _, snapshot, window_start in jobs),
+            return_exceptions=True)
+        for (state, snapshot, window_start), result in zip(jobs, results, strict=True):
+            await self._apply_split(state, snapshot, window_start, result)
+        self._report_lane_depth(lane)
+
+    async def _split(self, text: str) -> list[str]:
+        if self._fast_path_split:
+            sentences = split_unambiguous(text)
+            if sentences is not None:
+                metrics.record_split_path('fast')
+                return sentences
+            metrics.record_split_path('kss')
+        if self.split_backend is not None:
+            return await self.split_backend.split(text)
+        return await split_in_thread(self.splitter, text)
+
+    async def _apply_split(self, state: SegmentState, snapshot: str, window_start: int,
+                           result: list[str] | BaseException) -> None:
+        if isinstance(result, BaseException):
+            # Transient splitter failure: put the text back (in front of
+            # any deltas that arrived meanwhile) and keep the task alive.
+            state.buffer = snapshot + state.buffer
+            self._arm_timers(state)
+            print(f'separator: split failed, buffer retained: {result!r}')
+            return
+        sentences = list(result)
+        if not sentences:
+            state.buffer = snapshot + state.buffer
+            self._arm_timers(state)
+            return
+
+        if window_start:
+            # The skipped prefix holds no boundary: it is the start of
+            # the first sentence (original whitespace kept).
+            window = snapshot[window_start:]
+            gap = window[:len(window) - len(window.lstrip())]
+            sentences[0] = snapshot[:window_start] + gap + sentences[0].lstrip()
+
+        last = sentences[-1]
+
+        closed = state.force_closed or _is_sentence_closed(last)
+        # One-shot: a rotation/stop/timeout mark applies to this flush
+        # only, never to the segment's future sentences.
+        state.force_closed = False
+
+        end = len(sentences) if closed else max(
+            0, len(sentences) - 1)
+
+        for s in sentences[:end]:
+            s_clean = s.strip()
+            if s_clean:
+                await self._enqueue_translations(state, s_clean)
+        if not closed:
+            if end or not state.tail_since:
+                state.tail_since = asyncio.get_running_loop().time()
+            last = await self._emit_clause(state, last)
+            # The unfinished tail goes back in front of whatever arrived
+            # while the splitter was running.
+            state.buffer = last + state.buffer
+            # Conservative (leading whitespace may be stripped later).
+            state.split_checked = len(last.lstrip())
+            self._arm_timers(state)
+        else:
+            state.tail_since = 0.0
+        speculation = self._speculations.get((state.session_id, state.segment_id))
+        if speculation is not None and speculation.text != normalize_source(state.buffer):
+            # The tail changed (or was finalized differently).
+            self._discard_speculation((state.session_id, state.segment_id))
+
+    async def _emit_clause(self, state: SegmentState, tail: str) -> str:
+        """Translate the head of an over-long/over-age unfinished tail up to
+        its last clause boundary; returns what stays buffered."""
+        if self._clause_max_chars is not None and len(tail.strip()) > self._clause_max_chars:
+            reason = 'length'
+        elif (self._clause_max_age is not None
+              and asyncio.get_running_loop().time() - state.tail_since > self._clause_max_age):
+            reason = 'age'
+        else:
+            return tail
+        cut = last_clause_boundary(tail, self._clause_min_chars)
+        if cut is None:
+            return tail  # no sensible cut: the flush timeout still applies
+        metrics.record_clause_split(reason)
+        await self._enqueue_translations(state, tail[:cut].strip())
+        state.tail_since = asyncio.get_running_loop().time()
+        return tail[cut:]
+
+    def _split_window_start(self, snapshot: str, checked: int) -> int:
+        """Offset KSS starts reading ``snapshot`` from: a word boundary at
+        least ``split_lookback_chars`` before the end of the checked prefix
+        (0 = split everything)."""
+        cut = checked - self._split_lookback
+        if cut <= 0:
+            return 0
+        return max(snapshot.rfind(' ', 0, cut + 1), 0)
+
+    async def _enqueue_translations(self, state: SegmentState, source_text: str) -> None:
+        # Split once, translate per language: the primary target first, then
+        # each extra language (queued back-to-back so one burst translates
+        # them concurrently).
+        targets = [(state.target_lang, True)] + [(lang, False) for lang in state.extra_target_langs]
+        deadline = asyncio.get_running_loop().time() + self._translation_deadline
+        speculation = self._take_speculation(state, source_text)
+        for target_lang, primary in targets:
+            reorder = self._reorder.setdefault((state.session_id, target_lang), _ReorderState())
+            ordinal = reorder.next_ordinal
+            reorder.next_ordinal += 1
+            self.sentence_queue.put_nowait(state.session_id, PendingSentence(
+                source_text=source_text,
+                session_id=state.session_id,
+                segment_id=state.segment_id,
+                sequence=state.sequence,
+                source_lang=state.source_lang,
+                target_lang=target_lang,
+                confidence=state.confidence,
+                use_translation_cache=state.use_translation_cache,
+                primary=primary,
+                ordinal=ordinal,
+                deadline=deadline,
+                speculation=speculation.tasks.get(target_lang) if speculation else None,
+            ))
+
+    def _take_speculation(self, state: SegmentState, source_text: str) -> _Speculation | None:
+        """Hand over the segment's speculation if it covers exactly this
+        finalized sentence."""
+        key = (state.session_id, state.segment_id)
+        speculation = self._speculations.get(key)
+        if speculation is None or speculation.text != normalize_source(source_text):
+            return None
+        del self._speculations[key]
+        return speculation
+
+    def _speculate(self, state: SegmentState, deadline: float) -> None:
+        text = normalize_source(state.buffer)
+        if len(text) < self._speculation_min_chars:
+            return
+        key = (state.session_id, state.segment_id)
+        current = self._speculations.get(key)
+        if current is not None:
+            if current.text == text:
+                return
+            self._discard_speculation(key)
+        tasks: dict[str | None, asyncio.Task[object]] = {}
+        for target_lang in (state.target_lang, *state.extra_target_langs):
+            item = PendingSentence(
+                source_text=text,
+                session_id=state.session_id,
+                segment_id=state.segment_id,
+                sequence=state.sequence,
+                source_lang=state.source_lang,
+                target_lang=target_lang,
+                confidence=state.confidence,
+                use_translation_cache=state.use_translation_cache,
+                deadline=deadline,
+            )
+            task = asyncio.create_task(self._translate(item))
+            # Retrieved here so a discarded, failed speculation is not
+            # reported as a never-retrieved exception.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            tasks[target_lang] = task
+            metrics.record_translation_speculation('started')
+        self._speculations[key] = _Speculation(text, tasks)
+
+    def _discard_speculation(self, key: tuple[str, int]) -> None:
+        speculation = self._speculations.pop(key, None)
+        if speculation is None:
+            return
+        for task in speculation.tasks.values():
+            task.cancel()
+            metrics.record_translation_speculation('discarded', wasted_chars=len(speculation.text))
 
     async def _timeout_sweeper(self) -> None:
-        interval = max(self._flush_timeout / 4, 0.05)
+        """Sleeps until the next flush/speculation deadline instead of
+        waking every flush_timeout/4 to scan every segment."""
         while not self._stop:
-            await asyncio.sleep(interval)
+            due = await self._timers.next_due()
             try:
                 now = asyncio.get_running_loop().time()
-                for state in list(self.state_by_key.values()):
-                    if not state.buffer.strip():
-                        continue
-                    if now - state.last_appended_at < self._flush_timeout:
-                        continue
-                    state.force_closed = True
-                    # Reset the clock so the state is not re-queued on every
-                    # sweep while it waits in state_queue.
-                    state.last_appended_at = now
-                    await self.state_queue.put(state)
-            except asyncio.CancelledError:
-                raise
+                for (_, _, kind), item in due:
+                    if isinstance(item, _SessionLane):
+                        self._on_lane_idle(item, now)
+                    else:
+                        self._on_deadline(kind, item, now)
             except Exception as exc:
                 print(f'separator: timeout sweeper error (ignored): {exc!r}')
 
+    def _arm_timers(self, state: SegmentState) -> None:
+        """(Re-)arm the segment's deadlines from its last append. Cheap when
+        already armed: the heap re-checks the real deadline when it fires."""
+        self._timers.arm((state.session_id, state.segment_id, 'flush'),
+                         state.last_appended_at + self._flush_timeout_for(state.session_id),
+                         state)
+        if self._speculative:
+            self._timers.arm((state.session_id, state.segment_id, 'speculate'),
+                             state.last_appended_at + self._speculation_idle, state)
+
+    def _cancel_timers(self, key: tuple[str, int]) -> None:
+        for kind in ('flush', 'speculate'):
+            self._timers.cancel((*key, kind))
+
+    def _on_deadline(self, kind: str, state: SegmentState, now: float) -> None:
+        if self.state_by_key.get((state.session_id, state.segment_id)) is not state:
+            return  # rotated away / session stopped (flushed there)
+        if not state.buffer.strip():
+            # Nothing buffered, or a split is in flight (its unfinished tail
+            # re-arms when it goes back in the buffer).
+            return
+        lane = self._lanes.get(state.session_id)
+        if lane is None:
+            # Cannot happen while the lane lives (it is retired only after
+            # its segments were dropped); do not leave it behind.
+            key = (state.session_id, state.segment_id)
+            self.state_by_key.pop(key, None)
+            self._cancel_timers(key)
+            print(f'separator: segment without a lane dropped: {key}')
+            return
+        idle = now - state.last_appended_at
+        if kind == 'speculate':
+            if idle < self._speculation_idle:
+                self._timers.arm((state.session_id, state.segment_id, kind),
+                                 state.last_appended_at + self._speculation_idle, state)
+            elif idle < lane.flush_timeout:
+                self._speculate(state, now + self._translation_deadline)
+            return
+        if idle < lane.flush_timeout:
+            # Text arrived since this deadline was armed (or the lane's
+            # timeout grew).
+            self._timers.arm((state.session_id, state.segment_id, kind),
+                             state.last_appended_at + lane.flush_timeout, state)
+            return
+        state.force_closed = True
+        # If the split fails the buffer is retained; it is retried one
+        # flush timeout from now.
+        state.last_appended_at = now
+        lane.dirty.mark(state)
+
+    def set_translation_cache(self, session_id: str, enabled: bool) -> None:
+        """Opt a session in/out of the translation cache (default: in)."""
+        if enabled:
+            self._cache_disabled_sessions.discard(session_id)
+        else:
+            self._cache_disabled_sessions.add(session_id)
+
+    def set_target_languages(self, session_id: str, target_langs: list[str]) -> None:
+        """Declare every language a session is translated into."""
+        self._target_langs_by_session[session_id] = tuple(dict.fromkeys(target_langs))
+
+    def _close_segments(self, session_id: str, lane: _SessionLane | None) -> None:
+        for key in [k for k in self.state_by_key if k[0] == session_id]:
+            state = self.state_by_key.pop(key)
+            self._cancel_timers(key)
+            if lane is None:
+                continue
+            # Also when the buffer is empty: a split of its snapshot may be
+            # in flight, and its tail must not go back into a dropped state.
+            state.force_closed = True
+            if state.buffer.strip():
+                lane.dirty.mark(state)
+
     async def close_session(self, session_id: str) -> None:
         """Flush and drop every segment buffer of a stopped session.
 
         Called from /internal/sessions/stop — without this, a stopped
         session's buffered tail is lost and its state_by_key entries leak.
         """
-        keys = [k for k in self.state_by_key if k[0] == session_id]
-        for key in keys:
-            state = self.state_by_key.pop(key)
-            if state.buffer.strip():
-                state.force_closed = True
-                await self.state_queue.put(state)
+        lane = self._lanes.get(session_id)
+        if lane is not None and lane.closing:
+            return
+        if lane is not None and lane.tasks and not self._stop:
+            # Retired in order: the lane stores every delta queued ahead of
+            # this marker, force-flushes the session's segments, then its
+            # flush loop drains and retires it. Offers in between are
+            # dropped rather than opening a second lane.
+            lane.closing = True
+            await lane.queue.put(None)
+        else:
+            self._close_segments(session_id, lane)
+            if lane is not None:
+                lane.closing = True
+                self._retire_lane(lane)
+        self._cache_disabled_sessions.discard(session_id)
+        self._target_langs_by_session.pop(session_id, None)
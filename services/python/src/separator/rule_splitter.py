@@ -0,0 +1,83 @@
+"""Rule-based fast path in front of KSS for text with obvious boundaries.
+
+Most flushes carry one short STT delta: either an unfinished phrase
+(``오늘 우리가 함께 읽을``) or a sentence ending in plain terminal
+punctuation (``감사합니다. 아멘.``). Their boundaries are unambiguous, yet each
+one paid for a KSS call (morpheme analysis on a worker thread/process).
+
+:func:`split_unambiguous` returns the same sentences KSS would for such text
+and ``None`` for anything it cannot decide cheaply, which then goes to KSS.
+KSS also splits on sentence-final endings *without* punctuation
+(``밥 먹었어 너는`` → ``밥 먹었어`` / ``너는``), so inside a sentence every word
+but the last must end in something that can't be a sentence-final ending: a
+closed syllable (받침) or a common particle/connective. ``tests/
+test_rule_splitter.py`` checks the boundaries against KSS on a regression
+corpus.
+"""
+from __future__ import annotations
+
+import re
+
+# A boundary: one '.', or a run of '!'/'?', after a Hangul syllable and
+# followed by whitespace or the end. '..', '…', '3.' etc. are left to KSS.
+_BOUNDARY = re.compile(r'(?<=[가-힣])(?:\.|[!?]+)(?=\s|$)')
+# What an unambiguous sentence may contain besides its final punctuation.
+_PLAIN = re.compile(r'[가-힣0-9,\s]*')
+
+# Open syllables that are particles or connective endings, never a
+# sentence-final ending on their own (…가, …의, …에서, …하고, …와/과).
+_SAFE_OPEN_SYLLABLES = frozenset('가의에도로께며서고과')
+# Common pronouns/adverbs/determiners that end in an open syllable.
+_CONTINUING_WORDS = frozenset({
+    '이', '그', '저', '이거', '그거', '저거', '이게', '그게', '저게', '여기', '거기',
+    '저기', '어디', '누가', '우리', '저희', '너', '나', '제', '내', '이제', '다시',
+    '모두', '먼저', '혹시', '아주', '매우', '너무', '조금', '가장', '또', '더', '꼭',
+    '바로', '아마', '서로', '오직', '주께', '예수', '하나', '두', '세',
+})
+# Closed syllables that can still end a sentence (…걸, …군, …거든, 명사형 …음/…함).
+_FINAL_CLOSED_SYLLABLES = frozenset('걸껄군든음함됨임셈옴봄줌짐씀')
+
+_HANGUL_BASE = 0xAC00
+_JONGSEONG_COUNT = 28
+
+
+def _has_batchim(syllable: str) -> bool:
+    return (ord(syllable) - _HANGUL_BASE) % _JONGSEONG_COUNT != 0
+
+
+def _can_continue(word: str) -> bool:
+    """True if ``word`` cannot end a sentence, judged by its last syllable."""
+    if word in _CONTINUING_WORDS:
+        return True
+    last = word[-1]
+    if not '가' <= last <= '힣':
+        # Digits (3장 → '장' is checked; bare '3' is a counter) and commas.
+        return last.isdigit() or last == ','
+    if last in _SAFE_OPEN_SYLLABLES:
+        return True
+    return _has_batchim(last) and last not in _FINAL_CLOSED_SYLLABLES
+
+
+def _is_plain_sentence(sentence: str) -> bool:
+    body = sentence.rstrip('.!?')
+    if not _PLAIN.fullmatch(body):
+        return False
+    words = body.split()
+    return all(_can_continue(word) for word in words[:-1])
+
+
+def split_unambiguous(text: str) -> list[str] | None:
+    """Split ``text`` like KSS would, or return None if it is ambiguous."""
+    sentences: list[str] = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    if not sentences:
+        return None
+    if not all(_is_plain_sentence(sentence) for sentence in sentences):
+        return None
+    return sentences
@@ -0,0 +1,188 @@
+"""Scheduling primitives for the separator: a coalescing flush run queue,
+deadline timers and a fair per-session sentence queue.
+
+The store loop used to ``put`` the same :class:`SegmentState` on an
+``asyncio.Queue`` for every STT delta, so a burst of 20 deltas queued 20
+flushes of one segment, most of them finding an empty or already-split
+buffer. :class:`DirtySet` keeps each item in the run queue at most once:
+marking an already-dirty item is a no-op, and every delta that arrives
+before the flush loop drains the set is merged into that one flush.
+
+The timeout sweeper likewise used to wake every ``flush_timeout / 4`` and
+scan every segment; :class:`TimerHeap` lets it sleep until the next real
+flush/speculation deadline instead. :class:`RoundRobinQueue` hands the
+shared translation workers sentences from every session in turn.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import heapq
+import itertools
+from collections.abc import Hashable
+
+
+class DirtySet[T]:
+    """FIFO set of items waiting to be flushed, keyed by identity.
+
+    (SegmentState is a mutable dataclass, hence unhashable; two segments
+    with equal fields are still two segments.)
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[int, T] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: T) -> bool:
+        return id(item) in self._items
+
+    def mark(self, item: T) -> bool:
+        """Schedule ``item``; False if it was already waiting."""
+        if id(item) in self._items:
+            return False
+        self._items[id(item)] = item
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        """No more marks are coming: drain returns [] once it is empty."""
+        self._closed = True
+        self._ready.set()
+
+    async def drain(self) -> list[T]:
+        """Wait for at least one dirty item, then take all of them in the
+        order they were first marked. An item marked again afterwards goes
+        back in the run queue (its flush is already underway)."""
+        while not self._items:
+            if self._closed:
+                return []
+            self._ready.clear()
+            await self._ready.wait()
+        items = list(self._items.values())
+        self._items.clear()
+        self._ready.clear()
+        return items
+
+
+class TimerHeap[T]:
+    """Deadlines keyed by an id, served earliest first from a min-heap.
+
+    Re-arming an armed key with a *later* deadline is O(1): the heap entry
+    keeps its earlier deadline, and the owner re-arms with the real one when
+    it fires (lazy re-arming). Text arriving on a segment therefore never
+    touches the heap; only segments whose deadline really passed, or moved,
+    cost a pop. Cancelled and superseded entries are skipped when popped.
+
+    Deadlines fire up to ``resolution`` seconds late so that neighbouring
+    ones (segments that got text in the same burst) share one wake-up.
+    """
+
+    def __init__(self, resolution: float = 0.05) -> None:
+        self._resolution = resolution
+        self._heap: list[tuple[float, int, Hashable, T]] = []
+        self._armed: dict[Hashable, tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._armed)
+
+    def arm(self, key: Hashable, deadline: float, item: T) -> None:
+        armed = self._armed.get(key)
+        if armed is not None and armed[0] <= deadline:
+            return
+        seq = next(self._seq)
+        self._armed[key] = (deadline, seq)
+        heapq.heappush(self._heap, (deadline, seq, key, item))
+        if self._heap[0][1] == seq:
+            # New earliest deadline: wake the waiter to shorten its sleep.
+            self._changed.set()
+
+    def cancel(self, key: Hashable) -> None:
+        self._armed.pop(key, None)
+
+    def _drop_stale_head(self) -> None:
+        while self._heap:
+            deadline, seq, key, _ = self._heap[0]
+            if self._armed.get(key) == (deadline, seq):
+                return
+            heapq.heappop(self._heap)
+
+    async def next_due(self) -> list[tuple[Hashable, T]]:
+        """Sleep until the earliest deadline, then pop (and disarm) every
+        key whose deadline has passed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._drop_stale_head()
+            self._changed.clear()
+            if not self._heap:
+                await self._changed.wait()
+                continue
+            delay = self._heap[0][0] + self._resolution - loop.time()
+            if delay > 0:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                continue
+            now = loop.time()
+            due: list[tuple[Hashable, T]] = []
+            while self._heap and self._heap[0][0] <= now:
+                deadline, seq, key, item = heapq.heappop(self._heap)
+                if self._armed.get(key) == (deadline, seq):
+                    del self._armed[key]
+                    due.append((key, item))
+            if due:
+                return due
+
+
+class RoundRobinQueue[K: Hashable, T]:
+    """Per-key FIFO queues served round-robin, one item per key per turn.
+
+    A chatty session's sentences no longer line up ahead of every other
+    session's: consumers taking a batch get one sentence from each waiting
+    session in turn, while each session's own order is kept.
+    """
+
+    def __init__(self) -> None:
+        self._queues: dict[K, collections.deque[T]] = {}
+        self._ring: collections.deque[K] = collections.deque()
+        self._ready = asyncio.Event()
+
+    def qsize(self, key: K | None = None) -> int:
+        if key is not None:
+            queue = self._queues.get(key)
+            return len(queue) if queue else 0
+        return sum(len(queue) for queue in self._queues.values())
+
+    def empty(self) -> bool:
+        return not self._ring
+
+    def put_nowait(self, key: K, item: T) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = collections.deque()
+            self._ring.append(key)
+        queue.append(item)
+        self._ready.set()
+
+    def get_nowait(self) -> T:
+        if not self._ring:
+            raise asyncio.QueueEmpty
+        key = self._ring.popleft()
+        queue = self._queues[key]
+        item = queue.popleft()
+        if queue:
+            self._ring.append(key)
+        else:
+            del self._queues[key]
+        return item
+
+    async def get(self) -> T:
+        while not self._ring:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
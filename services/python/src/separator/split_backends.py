@@ -0,0 +1,169 @@
+"""Where KSS sentence splitting runs: the default thread pool or warm worker
+processes.
+
+``asyncio.to_thread`` keeps KSS off the event loop but not off the GIL:
+mecab-backed splitting competes with WS sends, NATS fetches and the
+translation workers, and every session shares the default thread pool.
+:class:`ProcessPoolSplitter` runs KSS in dedicated processes that load
+KSS/mecab once at startup (warm), and groups split jobs from several
+segments that arrive together into one round-trip to a worker. If a worker
+dies (mecab crash, OOM kill) the pool is recreated, warm, and the batch
+retried once.
+
+The thread backend (:func:`split_in_thread`) stays the default: on a
+single-core deployment extra processes only add pickling overhead.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.monitoring import metrics
+
+Splitter = Callable[[str], list[str]]
+SplitterFactory = Callable[[], Splitter]
+
+# Set in each worker process by _init_worker.
+_worker_splitter: Splitter | None = None
+
+
+def load_kss() -> Splitter:
+    from kss import Kss  # type: ignore
+
+    return Kss("split_sentences")
+
+
+def _init_worker(factory: SplitterFactory) -> None:
+    global _worker_splitter
+    _worker_splitter = factory()
+    # Warm-up: the first call loads the mecab dictionary.
+    _worker_splitter('워밍업 문장입니다.')
+
+
+def _split_many(texts: list[str]) -> tuple[list[list[str]], float, float]:
+    """Runs in a worker: (results, started_at, finished_at) in wall time."""
+    started = time.time()
+    assert _worker_splitter is not None
+    results = [list(_worker_splitter(text)) for text in texts]
+    return results, started, time.time()
+
+
+async def split_in_thread(splitter: Splitter, text: str) -> list[str]:
+    enqueued = time.perf_counter()
+    started = 0.0
+
+    def run() -> list[str]:
+        nonlocal started
+        started = time.perf_counter()
+        return splitter(text)
+
+    try:
+        return await asyncio.to_thread(run)
+    finally:
+        if started:
+            metrics.observe_split_wait('thread', started - enqueued)
+            metrics.observe_split_duration('thread', time.perf_counter() - started)
+
+
+class ProcessPoolSplitter:
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        batch_window_seconds: float = 0.002,
+        max_batch_size: int = 16,
+        splitter_factory: SplitterFactory = load_kss,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._splitter_factory = splitter_factory
+        self._executor = self._new_executor()
+        self._pending: list[tuple[str, float, asyncio.Future[list[str]]]] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the parent runs an event loop and httpx/asyncpg
+        # threads that must not be duplicated into the children.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self._splitter_factory,),
+        )
+
+    def _replace_broken(self, broken: ProcessPoolExecutor) -> None:
+        # Concurrent batches all see the same broken pool; only the first
+        # replaces it.
+        if self._executor is not broken:
+            return
+        print('split: KSS worker pool broken, recreating it')
+        metrics.record_split_pool_restart()
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+
+    async def start(self) -> None:
+        """Start every worker and wait until each has KSS loaded."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _split_many, ['워밍업.'])
+            for _ in range(self.workers)))
+
+    async def split(self, text: str) -> list[str]:
+        future: asyncio.Future[list[str]] = asyncio.get_running_loop().create_future()
+        self._pending.append((text, time.time(), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._dispatch_later())
+        return await future
+
+    async def _dispatch_later(self) -> None:
+        await asyncio.sleep(self.batch_window_seconds)
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, float, asyncio.Future[list[str]]]]) -> None:
+        metrics.observe_split_batch(len(batch))
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _, _ in batch]
+        try:
+            executor = self._executor
+            try:
+                results, started, finished = await loop.run_in_executor(executor, _split_many, texts)
+            except BrokenProcessPool:
+                # Retried once on a fresh pool; a batch that kills that one
+                # too fails like any other split error.
+                self._replace_broken(executor)
+                results, started, finished = await loop.run_in_executor(self._executor, _split_many, texts)
+        except Exception as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        metrics.observe_split_duration('process', finished - started)
+        for (_, enqueued, future), result in zip(batch, results, strict=True):
+            metrics.observe_split_wait('process', max(0.0, started - enqueued))
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self) -> None:
+        self._dispatch()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
@@ -0,0 +1,32 @@
+from src.translation.batcher import BatchingTranslator
+from src.translation.cache import (
+    CachingTranslator,
+    normalize_source,
+    translation_cache_bypassed,
+)
+from src.translation.memory import TranslationMemoryTranslator
+from src.translation.offline import PseudoTranslator
+from src.translation.ratelimit import RateLimitedTranslator
+from src.translation.registry import create_translator, register_translator
+from src.translation.resilience import (
+    AdmissionTimeoutError,
+    CircuitOpenError,
+    ResilientTranslator,
+    translation_deadline,
+)
+
+__all__ = [
+    "AdmissionTimeoutError",
+    "BatchingTranslator",
+    "CachingTranslator",
+    "CircuitOpenError",
+    "PseudoTranslator",
+    "RateLimitedTranslator",
+    "ResilientTranslator",
+    "TranslationMemoryTranslator",
+    "create_translator",
+    "normalize_source",
+    "register_translator",
+    "translation_cache_bypassed",
+    "translation_deadline",
+]
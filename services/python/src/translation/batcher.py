@@ -0,0 +1,97 @@
+"""Coalesce concurrent single-sentence translations into DeepL batch calls.
+
+``_push_loop`` translates a burst of sentences concurrently; without this
+layer each one would still be its own HTTP request. :class:`BatchingTranslator`
+parks every ``translate`` call for up to ``window_seconds`` (or until
+``max_batch_size`` calls are waiting) and then sends one ``translate_batch``
+request per target language, resolving each caller with its own result.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Protocol
+
+from src.monitoring import metrics
+from src.translation.resilience import current_translation_deadline, translation_deadline
+
+
+class BatchTranslator(Protocol):
+    async def translate(self, source_text: str, target_language: str) -> Any: ...
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]: ...
+
+
+def _fail(batch: list[tuple[str, asyncio.Future[Any], float | None]], exc: BaseException) -> None:
+    for _, future, _ in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+class BatchingTranslator:
+    def __init__(
+        self,
+        inner: BatchTranslator,
+        *,
+        window_seconds: float = 0.005,
+        max_batch_size: int = 16,
+    ) -> None:
+        self.inner = inner
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        # target_language -> [(source_text, future, deadline)] waiting for the
+        # next flush.
+        self._pending: dict[str, list[tuple[str, asyncio.Future[Any], float | None]]] = {}
+        self._timers: dict[str, asyncio.Task[None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def translate(self, source_text: str, target_language: str) -> Any:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(target_language, [])
+        pending.append((source_text, future, current_translation_deadline()))
+        if len(pending) >= self.max_batch_size:
+            self._flush(target_language)
+        elif target_language not in self._timers:
+            self._timers[target_language] = asyncio.create_task(self._flush_later(target_language))
+        return await future
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]:
+        return await self.inner.translate_batch(source_texts, target_language)
+
+    async def _flush_later(self, target_language: str) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._timers.pop(target_language, None)
+        self._flush(target_language)
+
+    def _flush(self, target_language: str) -> None:
+        timer = self._timers.pop(target_language, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        batch = self._pending.pop(target_language, [])
+        if not batch:
+            return
+        task = asyncio.create_task(self._send(batch, target_language))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future[Any], float | None]],
+                    target_language: str) -> None:
+        metrics.observe_translation_batch(len(batch))
+        # The request must answer in time for its most urgent sentence.
+        deadlines = [deadline for _, _, deadline in batch if deadline is not None]
+        try:
+            with translation_deadline(min(deadlines, default=None)):
+                results = await self.inner.translate_batch([text for text, _, _ in batch], target_language)
+        except Exception as exc:
+            _fail(batch, exc)
+            return
+        if len(results) != len(batch):
+            _fail(batch, RuntimeError(f'batch returned {len(results)} results for {len(batch)} texts'))
+            return
+        for (_, future, _), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self) -> None:
+        for target_language in list(self._pending):
+            self._flush(target_language)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.inner.aclose()
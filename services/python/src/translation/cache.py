@@ -0,0 +1,117 @@
+"""In-process LRU/TTL translation cache in front of the DeepL client.
+
+Services repeat the same liturgical phrases, greetings and scripture
+references week after week; every one of them used to cost a DeepL
+round-trip and its characters. :class:`CachingTranslator` wraps any
+``Translator`` and answers repeats from memory, keyed on the normalized
+source text and the target language.
+
+Per-session opt-out: a session that must always see fresh translations runs
+its calls inside :func:`translation_cache_bypassed`. A context variable keeps
+the ``translate(source_text, target_language)`` protocol unchanged for every
+wrapper between the separator and DeepL.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Any, Protocol
+
+from src.monitoring import metrics
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_bypass_cache: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    'translation_cache_bypass', default=False)
+
+
+class Translator(Protocol):
+    async def translate(self, source_text: str, target_language: str) -> Any: ...
+
+
+def normalize_source(text: str) -> str:
+    """NFC + collapsed whitespace: STT deltas for the same sentence differ
+    only in spacing and composed/decomposed Hangul."""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def is_translation_cache_bypassed() -> bool:
+    return _bypass_cache.get()
+
+
+@contextlib.contextmanager
+def translation_cache_bypassed(bypass: bool = True) -> Iterator[None]:
+    """Skip (neither read nor fill) the cache for translate calls made inside."""
+    token = _bypass_cache.set(bypass)
+    try:
+        yield
+    finally:
+        _bypass_cache.reset(token)
+
+
+class CachingTranslator:
+    def __init__(
+        self,
+        inner: Translator,
+        *,
+        max_entries: int = 5000,
+        ttl_seconds: float = 7 * 24 * 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.inner = inner
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, result); insertion order == recency order.
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+
+    @staticmethod
+    def key(source_text: str, target_language: str) -> tuple[str, str]:
+        return normalize_source(source_text), target_language.upper()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    async def translate(self, source_text: str, target_language: str) -> Any:
+        if self.max_entries <= 0 or is_translation_cache_bypassed():
+            return await self.inner.translate(source_text, target_language)
+
+        key = self.key(source_text, target_language)
+        cached = self._lookup(key)
+        if cached is not None:
+            metrics.record_translation_cache('hit')
+            return cached
+
+        metrics.record_translation_cache('miss')
+        result = await self.inner.translate(source_text, target_language)
+        self._store(key, result)
+        return result
+
+    def _lookup(self, key: tuple[str, str]) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            metrics.record_translation_cache_eviction('ttl')
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _store(self, key: tuple[str, str], result: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            metrics.record_translation_cache_eviction('size')
+        metrics.set_translation_cache_size(len(self._entries))
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
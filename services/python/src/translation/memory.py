@@ -0,0 +1,188 @@
+"""Persistent exact-match translation memory (``app.translation_memory``).
+
+Sits between the in-process cache and DeepL so the hit rate survives
+restarts and deploys. Lookups issued in the same event-loop turn (several
+pending sentences, several target languages) are coalesced into a single
+indexed query. Misses go to DeepL and the result is written back off the
+hot path.
+
+Only masked-safe sentences take part: text the PII masker would change is
+neither looked up nor stored, so the table can never hold what
+``app.translations`` masks. Any DB failure degrades to a miss — the memory
+must never stop a translation from being delivered.
+
+Entries are keyed on the request's source language, which the separator
+passes down with :func:`translation_source_language` (the constructor's
+``source_lang`` is only the fallback for callers that set none).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import re
+from collections.abc import Iterator
+from typing import Any, Protocol
+
+from deepl import TextResult
+
+from src.masking import mask_text
+from src.monitoring import metrics
+from src.repository.implementation.translation_memory_repository import (
+    insert_translation_memory,
+    lookup_translation_memory,
+)
+from src.translation.cache import is_translation_cache_bypassed, normalize_source
+
+# Fallback when a request carries no source language: the pipeline splits
+# with KSS, so sentences are Korean unless the publisher says otherwise.
+DEFAULT_SOURCE_LANG = 'KO'
+
+# Rows already captured in app.translations carry these mask placeholders.
+_MASK_PLACEHOLDER_RE = re.compile(r"\[(?:EMAIL|CARD|RRN|PHONE)\]")
+
+_source_lang: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    'translation_source_language', default=None)
+
+
+class Translator(Protocol):
+    async def translate(self, source_text: str, target_language: str) -> Any: ...
+
+
+def source_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def source_language_key(lang: str | None) -> str:
+    """'ko-KR' / 'ko' / 'KO' → 'KO' (DeepL source codes carry no region)."""
+    return (lang or '').split('-')[0].upper()
+
+
+def target_language_key(lang: str) -> str:
+    """Target codes keep their region: EN-US and EN-GB differ."""
+    return lang.upper()
+
+
+def is_masked_safe(text: str) -> bool:
+    return mask_text(text) == text and not _MASK_PLACEHOLDER_RE.search(text)
+
+
+def current_translation_source_language() -> str | None:
+    return _source_lang.get()
+
+
+@contextlib.contextmanager
+def translation_source_language(lang: str | None) -> Iterator[None]:
+    """Source language of the translate calls made inside (``None`` = unknown)."""
+    token = _source_lang.set(lang)
+    try:
+        yield
+    finally:
+        _source_lang.reset(token)
+
+
+class TranslationMemoryTranslator:
+    def __init__(
+        self,
+        inner: Translator,
+        pool: Any,
+        *,
+        source_lang: str = DEFAULT_SOURCE_LANG,
+    ) -> None:
+        self.inner = inner
+        self.source_lang = source_language_key(source_lang)
+        self._pool = pool
+        # (source_lang, source_hash, target_lang) -> lookup waiting for the
+        # next coalesced query.
+        self._pending: dict[tuple[str, str, str], asyncio.Future[str | None]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        # Keep strong refs to in-flight write-backs (avoid GC of bare tasks).
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def translate(self, source_text: str, target_language: str) -> Any:
+        normalized = normalize_source(source_text)
+        if is_translation_cache_bypassed() or not is_masked_safe(normalized):
+            return await self.inner.translate(source_text, target_language)
+
+        source_lang = source_language_key(current_translation_source_language()) or self.source_lang
+        key = (source_lang, source_hash(normalized), target_language_key(target_language))
+        remembered = await self._lookup(key)
+        if remembered is not None:
+            metrics.record_translation_memory('hit')
+            return TextResult(remembered, detected_source_lang=source_lang, billed_characters=0)
+
+        metrics.record_translation_memory('miss')
+        result = await self.inner.translate(source_text, target_language)
+        if isinstance(result, (TextResult, str)) and str(result).strip():
+            self._remember(key, normalized, str(result))
+        return result
+
+    async def _lookup(self, key: tuple[str, str, str]) -> str | None:
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_lookups())
+                self._flush_task.add_done_callback(self._on_flush_done)
+        # Shared by every caller asking for the same key: one caller being
+        # cancelled must not cancel it for the others.
+        return await asyncio.shield(future)
+
+    async def _flush_lookups(self) -> None:
+        batch: dict[tuple[str, str, str], asyncio.Future[str | None]] = {}
+        found: dict[tuple[str, str, str], str] = {}
+        try:
+            # Yield once so every translate() started in this loop turn joins.
+            await asyncio.sleep(0)
+            batch, self._pending = self._pending, {}
+            self._flush_task = None
+            by_source: dict[str, list[tuple[str, str]]] = {}
+            for source_lang, hash_, target_lang in batch:
+                by_source.setdefault(source_lang, []).append((hash_, target_lang))
+            for source_lang, keys in by_source.items():
+                try:
+                    rows = await lookup_translation_memory(self._pool, source_lang, keys)
+                except Exception as exc:
+                    metrics.record_translation_memory_error('lookup')
+                    print(f'translation memory: lookup failed, treated as miss: {exc!r}')
+                    continue
+                found.update(((source_lang, *key), text) for key, text in rows.items())
+            metrics.observe_translation_memory_batch(len(batch))
+        finally:
+            # Whatever a cancelled flush did not get to is answered as a
+            # miss, like a failed query.
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(found.get(key))
+
+    def _on_flush_done(self, task: asyncio.Task[None]) -> None:
+        if self._flush_task is not task:
+            return
+        # Cancelled before it took the batch (possibly before it ever ran).
+        batch, self._pending = self._pending, {}
+        self._flush_task = None
+        for future in batch.values():
+            if not future.done():
+                future.set_result(None)
+
+    def _remember(self, key: tuple[str, str, str], normalized: str, translated: str) -> None:
+        source_lang, source_hash_, target_lang = key
+        task = asyncio.create_task(self._store([
+            (source_hash_, source_lang, target_lang, normalized, translated),
+        ]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _store(self, entries: list[tuple[str, str, str, str, str]]) -> None:
+        try:
+            await insert_translation_memory(self._pool, entries)
+        except Exception as exc:
+            metrics.record_translation_memory_error('store')
+            print(f'translation memory: store failed (ignored): {exc!r}')
+
+    async def aclose(self) -> None:
+        # Let pending write-backs land before the DB pool is closed.
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.inner.aclose()
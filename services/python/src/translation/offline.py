@@ -0,0 +1,69 @@
+"""Deterministic offline translator for load tests (no network, no quota).
+
+:class:`PseudoTranslator` satisfies the same protocol as the DeepL client
+(``translate`` / ``translate_batch`` / ``aclose``), so the whole pipeline —
+cache, TM, batcher, workers — runs unchanged under synthetic load. The output
+is a pure function of the input; latency and failures are drawn from a
+seeded RNG so a benchmark run can be replayed exactly.
+
+Latency is log-normal (median × e^(σ·N(0,1))), which reproduces the long
+right tail of real DeepL round-trips. Failures raise ``DeeplError(503)`` so
+they exercise the same error paths as a real outage.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+
+from deepl import TextResult
+
+from src.deepL.deepL import DeeplError
+
+
+def pseudo_translate(source_text: str, target_language: str) -> str:
+    """Stable, visibly fake translation: ``⟦EN-US⟧ 원문``."""
+    return f'⟦{target_language.upper()}⟧ {source_text}'
+
+
+class PseudoTranslator:
+    def __init__(
+        self,
+        *,
+        latency_median_seconds: float = 0.15,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency_median_seconds = latency_median_seconds
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    def _sample_latency(self) -> float:
+        if self.latency_median_seconds <= 0:
+            return 0.0
+        return self.latency_median_seconds * math.exp(self.latency_sigma * self._rng.gauss(0.0, 1.0))
+
+    async def translate(self, source_text: str, target_language: str) -> TextResult:
+        results = await self.translate_batch([source_text], target_language)
+        return results[0]
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[TextResult]:
+        # One latency/error draw per request, like one HTTP round-trip.
+        latency = self._sample_latency()
+        failed = self._rng.random() < self.error_rate
+        await asyncio.sleep(latency)
+        if failed:
+            raise DeeplError(503, 'synthetic failure (offline translator)')
+        return [
+            TextResult(
+                pseudo_translate(text, target_language),
+                detected_source_lang='KO',
+                billed_characters=len(text),
+            )
+            for text in source_texts
+        ]
+
+    async def aclose(self) -> None:
+        return None
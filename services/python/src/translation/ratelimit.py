@@ -0,0 +1,157 @@
+"""Client-side AIMD rate limiter in front of the DeepL backend.
+
+Long services occasionally ran into DeepL 429s, after which every retry
+piled onto the throttled account and the whole pipeline backed up.
+:class:`RateLimitedTranslator` paces requests before they leave the process:
+
+- a token bucket on *characters* (what DeepL meters) caps the sending rate;
+- a concurrency limit caps the number of requests in flight.
+
+Both limits are AIMD-controlled: each success probes upward additively
+(up to the configured ceilings), each 429/5xx cuts them multiplicatively.
+Throughput settles just under the account's ceiling instead of oscillating
+between bursts and throttling. Time spent waiting here is reported to the
+resilience layer above, which does not count it as DeepL latency.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Protocol
+
+from src.deepL.deepL import DeeplError
+from src.monitoring import metrics
+from src.translation.resilience import mark_request_admitted, mark_request_queued
+
+
+class BatchTranslator(Protocol):
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]: ...
+    async def aclose(self) -> None: ...
+
+
+def _is_throttle(exc: BaseException) -> bool:
+    return isinstance(exc, DeeplError) and (exc.status_code == 429 or exc.status_code >= 500)
+
+
+class RateLimitedTranslator:
+    def __init__(
+        self,
+        inner: BatchTranslator,
+        *,
+        max_concurrency: int = 8,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_chars_per_second: float = 2000.0,
+        min_chars_per_second: float = 100.0,
+        burst_seconds: float = 1.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.inner = inner
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_chars_per_second = max_chars_per_second
+        self.min_chars_per_second = min(min_chars_per_second, max_chars_per_second)
+        self.burst_seconds = burst_seconds
+        self.decrease_factor = decrease_factor
+        # Start below the ceilings and let successes probe up to them.
+        self._concurrency_limit = float(
+            min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self._chars_per_second = max(self.min_chars_per_second, max_chars_per_second / 2)
+        self._in_flight = 0
+        self._slots = asyncio.Condition()
+        # Serializes bucket withdrawals so callers are paced in arrival order.
+        self._bucket_lock = asyncio.Lock()
+        self._tokens = self._capacity
+        self._refilled_at: float | None = None
+        self._publish()
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._concurrency_limit)
+
+    @property
+    def chars_per_second(self) -> float:
+        return self._chars_per_second
+
+    @property
+    def _capacity(self) -> float:
+        return self._chars_per_second * self.burst_seconds
+
+    async def translate(self, source_text: str, target_language: str) -> Any:
+        results = await self.translate_batch([source_text], target_language)
+        return results[0]
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]:
+        chars = sum(len(text) for text in source_texts)
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        mark_request_queued()
+        await self._acquire_slot()
+        try:
+            await self._withdraw(chars)
+            mark_request_admitted()
+            metrics.observe_deepl_limiter_wait(loop.time() - queued_at)
+            metrics.record_deepl_characters(chars)
+            try:
+                results = await self.inner.translate_batch(source_texts, target_language)
+            except Exception as exc:
+                if _is_throttle(exc):
+                    self._decrease()
+                raise
+            self._increase()
+            return results
+        finally:
+            await self._release_slot()
+
+    async def _acquire_slot(self) -> None:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self.concurrency_limit)
+            self._in_flight += 1
+            metrics.set_deepl_in_flight(self._in_flight)
+
+    async def _release_slot(self) -> None:
+        async with self._slots:
+            self._in_flight -= 1
+            metrics.set_deepl_in_flight(self._in_flight)
+            self._slots.notify_all()
+
+    async def _withdraw(self, chars: int) -> None:
+        async with self._bucket_lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._refilled_at is not None:
+                    self._tokens = min(
+                        self._capacity,
+                        self._tokens + (now - self._refilled_at) * self._chars_per_second)
+                self._refilled_at = now
+                # A batch bigger than the bucket waits for a full bucket
+                # instead of forever.
+                needed = min(chars, self._capacity)
+                if self._tokens >= needed:
+                    self._tokens -= chars
+                    return
+                await asyncio.sleep((needed - self._tokens) / self._chars_per_second)
+
+    def _increase(self) -> None:
+        # Additive increase: about +1 request per limit's worth of successes
+        # and +5% of the ceiling per success on the character rate.
+        self._concurrency_limit = min(
+            float(self.max_concurrency), self._concurrency_limit + 1 / self._concurrency_limit)
+        self._chars_per_second = min(
+            self.max_chars_per_second,
+            self._chars_per_second + 0.05 * self.max_chars_per_second)
+        self._publish()
+
+    def _decrease(self) -> None:
+        self._concurrency_limit = max(
+            float(self.min_concurrency), self._concurrency_limit * self.decrease_factor)
+        self._chars_per_second = max(
+            self.min_chars_per_second, self._chars_per_second * self.decrease_factor)
+        self._tokens = min(self._tokens, self._capacity)
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_deepl_limiter(self.concurrency_limit, self._chars_per_second)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
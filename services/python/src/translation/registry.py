@@ -0,0 +1,58 @@
+"""Translator backend registry, selected by ``TRANSLATOR_BACKEND``.
+
+Each backend is a zero-argument factory that reads its own config (so an
+offline run never needs ``DEEPL_API_KEY``/``DEEPL_API_KEYS``) and returns the bottom of the
+translator chain — something with ``translate`` / ``translate_batch`` /
+``aclose``. The lifespan stacks the batcher, TM and cache on top of it.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from src.config import get_deepl_config, get_offline_translator_config
+from src.deepL.balancer import DeeplKeyBalancer
+from src.deepL.deepL import DeeplTranslationService
+from src.translation.offline import PseudoTranslator
+
+TranslatorFactory = Callable[[], Any]
+
+_BACKENDS: dict[str, TranslatorFactory] = {}
+
+
+def register_translator(name: str) -> Callable[[TranslatorFactory], TranslatorFactory]:
+    def decorator(factory: TranslatorFactory) -> TranslatorFactory:
+        _BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def available_translators() -> list[str]:
+    return sorted(_BACKENDS)
+
+
+def create_translator(name: str) -> Any:
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        msg = f'unknown translator backend {name!r}; expected one of {available_translators()}'
+        raise RuntimeError(msg)
+    return factory()
+
+
+@register_translator('deepl')
+def _deepl() -> DeeplTranslationService | DeeplKeyBalancer:
+    keys = get_deepl_config()['deepl_api_keys']
+    if len(keys) == 1:
+        return DeeplTranslationService(keys[0])
+    return DeeplKeyBalancer.from_keys(keys)
+
+
+@register_translator('offline')
+def _offline() -> PseudoTranslator:
+    config = get_offline_translator_config()
+    return PseudoTranslator(
+        latency_median_seconds=config['latency_median_seconds'],
+        latency_sigma=config['latency_sigma'],
+        error_rate=config['error_rate'],
+        seed=int(config['seed']),
+    )
@@ -0,0 +1,364 @@
+"""Deadline-bounded DeepL calls: per-attempt timeouts, hedging, retries and a
+circuit breaker.
+
+A failed DeepL call used to drop the sentence and a slow one had no bound at
+all (only httpx's 10 s socket timeout). :class:`ResilientTranslator` sits
+directly on the backend, under the batcher, so every policy here applies to
+one real HTTP request:
+
+- each attempt gets ``attempt_timeout_seconds`` (never more than what is
+  left of the sentence deadline, see :func:`translation_deadline`);
+- when an attempt outlives the observed p95 latency, a duplicate request is
+  hedged and whichever answers first wins;
+- throttling (429), 5xx and transport errors are retried with jittered
+  backoff up to ``max_attempts``;
+- after ``breaker_failure_threshold`` consecutive failures the circuit opens
+  and calls fail fast with :class:`CircuitOpenError` for
+  ``breaker_reset_seconds``, then a single trial request probes DeepL again.
+
+A rate limiter below (see :mod:`src.translation.ratelimit`) reports when a
+request starts waiting for a slot and when it is admitted. Only the time
+after admission is DeepL's: the attempt timeout, the hedge delay and the
+latency window start there, and a deadline that runs out in the limiter's
+queue raises :class:`AdmissionTimeoutError` without charging the breaker.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import contextvars
+import random
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import Any, Protocol
+
+from src.deepL.deepL import DeeplError
+from src.monitoring import metrics
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    'translation_deadline', default=None)
+
+
+class BatchTranslator(Protocol):
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]: ...
+    async def aclose(self) -> None: ...
+
+
+class CircuitOpenError(RuntimeError):
+    """DeepL is considered unhealthy; the call was not attempted."""
+
+    def __init__(self) -> None:
+        super().__init__('deepl circuit open, failing fast')
+
+
+class AdmissionTimeoutError(TimeoutError):
+    """The deadline passed while the request waited for a rate-limiter slot;
+    DeepL was never called."""
+
+    def __init__(self) -> None:
+        super().__init__('translation deadline exceeded waiting for the rate limiter')
+
+
+class _Admission:
+    """Where one request stands in a rate limiter below, if there is one."""
+
+    def __init__(self) -> None:
+        self.queued = False
+        self.admitted = asyncio.Event()
+
+
+_admission: contextvars.ContextVar[_Admission | None] = contextvars.ContextVar(
+    'translation_admission', default=None)
+
+
+def mark_request_queued() -> None:
+    """Called by a rate limiter when a request starts waiting for a slot.
+
+    Must run before the limiter's first await: the resilience layer checks
+    right after the request's first step whether it is queued.
+    """
+    admission = _admission.get()
+    if admission is not None:
+        admission.queued = True
+
+
+def mark_request_admitted() -> None:
+    """Called by a rate limiter once the request leaves its queue for DeepL."""
+    admission = _admission.get()
+    if admission is not None:
+        admission.admitted.set()
+
+
+def current_translation_deadline() -> float | None:
+    return _deadline.get()
+
+
+@contextlib.contextmanager
+def translation_deadline(deadline: float | None) -> Iterator[None]:
+    """Bound translate calls made inside by ``deadline`` (event-loop time).
+
+    Like the cache bypass, a context variable keeps the translator protocol
+    unchanged; the batcher re-enters it with the earliest deadline of a batch.
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, DeeplError):
+        # 429 throttled, 5xx outage. Other 4xx (bad request, auth, 456 quota)
+        # will not get better by asking again.
+        return exc.status_code == 429 or exc.status_code >= 500
+    return isinstance(exc, Exception)
+
+
+def _failure_reason(exc: BaseException) -> str:
+    if isinstance(exc, DeeplError):
+        return f'http_{exc.status_code}'
+    if isinstance(exc, TimeoutError):
+        return 'timeout'
+    return 'error'
+
+
+class CircuitBreaker:
+    """closed → (N consecutive failures) → open → (reset timeout) →
+    half-open → one trial call → closed on success, open again on failure."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        metrics.set_translation_breaker_state('closed')
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            metrics.set_translation_breaker_state('half_open')
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._opened_at is not None:
+            self._opened_at = None
+            metrics.set_translation_breaker_state('closed')
+
+    def release_trial(self) -> None:
+        """The trial ended without a verdict on DeepL's health (a client
+        error, a cancellation): stay half-open and let the next call try."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        was_trial = self._trial_in_flight
+        self._trial_in_flight = False
+        if was_trial or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            metrics.set_translation_breaker_state('open')
+
+
+class LatencyTracker:
+    """Rolling window of observed durations: successful request latencies
+    (hedge threshold), or a session's speech gaps (adaptive flush timeout)."""
+
+    def __init__(self, *, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            evicted = self._samples[0]
+            del self._sorted[bisect.bisect_left(self._sorted, evicted)]
+        self._samples.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """None until ``min_samples`` requests have been observed."""
+        if len(self._sorted) < self.min_samples:
+            return None
+        index = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[index]
+
+
+class ResilientTranslator:
+    def __init__(
+        self,
+        inner: BatchTranslator,
+        *,
+        attempt_timeout_seconds: float = 2.0,
+        max_attempts: int = 3,
+        hedging_enabled: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_initial_delay_seconds: float = 0.5,
+        hedge_min_delay_seconds: float = 0.05,
+        backoff_seconds: float = 0.1,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.inner = inner
+        self.attempt_timeout_seconds = attempt_timeout_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.hedging_enabled = hedging_enabled
+        self.hedge_quantile = hedge_quantile
+        # Used until the tracker has enough samples for a real quantile.
+        self.hedge_initial_delay_seconds = hedge_initial_delay_seconds
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.backoff_seconds = backoff_seconds
+        self.breaker = CircuitBreaker(
+            failure_threshold=breaker_failure_threshold,
+            reset_seconds=breaker_reset_seconds,
+            clock=clock,
+        )
+        self.latency = LatencyTracker()
+
+    def hedge_delay(self) -> float:
+        observed = self.latency.quantile(self.hedge_quantile)
+        if observed is None:
+            return self.hedge_initial_delay_seconds
+        return max(self.hedge_min_delay_seconds, observed)
+
+    async def translate(self, source_text: str, target_language: str) -> Any:
+        results = await self.translate_batch([source_text], target_language)
+        return results[0]
+
+    async def translate_batch(self, source_texts: list[str], target_language: str) -> list[Any]:
+        loop = asyncio.get_running_loop()
+        deadline = current_translation_deadline()
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None and deadline <= loop.time():
+                msg = 'translation deadline exceeded'
+                raise TimeoutError(msg)
+            trial = self.breaker.state == 'half_open'
+            if not self.breaker.allow():
+                metrics.record_translation_breaker_rejection()
+                raise CircuitOpenError
+            try:
+                return await self._attempt(source_texts, target_language, deadline)
+            except asyncio.CancelledError:
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            except Exception as exc:
+                # Queueing in the limiter says nothing about DeepL's health.
+                if isinstance(exc, AdmissionTimeoutError) or not _is_retryable(exc):
+                    if trial:
+                        self.breaker.release_trial()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_attempts:
+                    raise
+                backoff = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                if deadline is not None and loop.time() + backoff >= deadline:
+                    raise
+                metrics.record_translation_retry(_failure_reason(exc))
+                await asyncio.sleep(backoff)
+
+    async def _attempt(self, source_texts: list[str], target_language: str,
+                       deadline: float | None) -> list[Any]:
+        """One attempt: the primary request plus, if it is slow, one hedge.
+
+        The attempt's clocks start once the primary request is admitted by
+        the rate limiter below (immediately without one).
+        """
+        loop = asyncio.get_running_loop()
+        primary, admission = self._request(source_texts, target_language)
+        pending = {primary}
+        hedged = False
+        failures: list[BaseException] = []
+        winner: asyncio.Future[list[Any]] | None = None
+        try:
+            await self._await_admission(primary, admission, deadline)
+            started = loop.time()
+            timeout = self.attempt_timeout_seconds
+            if deadline is not None:
+                timeout = min(timeout, deadline - started)
+                if timeout <= 0:
+                    raise AdmissionTimeoutError
+            async with asyncio.timeout(timeout):
+                hedge_after = self.hedge_delay()
+                if self.hedging_enabled and hedge_after < timeout:
+                    done, _ = await asyncio.wait(pending, timeout=hedge_after)
+                    if not done:
+                        hedged = True
+                        pending.add(self._request(source_texts, target_language)[0])
+                while winner is None and pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is not None:
+                            failures.append(task.exception())
+                        elif winner is None:
+                            winner = task
+        finally:
+            for task in pending:
+                task.cancel()
+        if winner is None:
+            # Every request of this attempt failed.
+            raise failures[0]
+        if hedged:
+            metrics.record_translation_hedge('primary' if winner is primary else 'hedge')
+        self.latency.observe(loop.time() - started)
+        self.breaker.record_success()
+        return winner.result()
+
+    def _request(self, source_texts: list[str],
+                 target_language: str) -> tuple[asyncio.Future[list[Any]], _Admission]:
+        admission = _Admission()
+        # The task copies the context: a limiter below marks this admission.
+        token = _admission.set(admission)
+        try:
+            task = asyncio.ensure_future(self.inner.translate_batch(source_texts, target_language))
+        finally:
+            _admission.reset(token)
+        return task, admission
+
+    async def _await_admission(self, request: asyncio.Future[list[Any]], admission: _Admission,
+                               deadline: float | None) -> None:
+        """Wait, bounded only by the sentence deadline, until ``request`` is
+        past the rate limiter (or finished without ever getting there)."""
+        # Let the request run its first step: a limiter marks it queued
+        # before its first await.
+        await asyncio.sleep(0)
+        if not admission.queued or admission.admitted.is_set():
+            return
+        admitted = asyncio.ensure_future(admission.admitted.wait())
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+            done, _ = await asyncio.wait({request, admitted}, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            admitted.cancel()
+        if not done:
+            raise AdmissionTimeoutError
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
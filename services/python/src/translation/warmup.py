@@ -0,0 +1,74 @@
+"""One-shot job: seed ``app.translation_memory`` from ``app.translations``.
+
+Run once after the 0002 migration (safe to re-run — existing keys are kept)::
+
+    python -m src.translation.warmup
+
+History is walked newest-first, so when the same sentence was translated
+several ways the most recent translation wins. Rows that carry mask
+placeholders, lack a target language or have a non-Korean source are skipped.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from src.database.pool import Db
+from src.repository.implementation.translation_memory_repository import (
+    fetch_translation_history_page,
+    insert_translation_memory,
+)
+from src.translation.cache import normalize_source
+from src.translation.memory import (
+    DEFAULT_SOURCE_LANG,
+    is_masked_safe,
+    source_hash,
+    source_language_key,
+    target_language_key,
+)
+
+WARMUP_PAGE_SIZE = 1000
+
+
+def memory_entries(rows, source_lang: str = DEFAULT_SOURCE_LANG) -> list[tuple[str, str, str, str, str]]:
+    """Turn ``app.translations`` rows into TM rows (first row per key wins)."""
+    entries: dict[tuple[str, str], tuple[str, str, str, str, str]] = {}
+    for row in rows:
+        if row["source_lang"] is not None and source_language_key(row["source_lang"]) != source_lang:
+            continue
+        if not row["target_lang"] or not (row["translated_text"] or "").strip():
+            continue
+        normalized = normalize_source(row["source_text"] or "")
+        if not normalized or not is_masked_safe(normalized) or not is_masked_safe(row["translated_text"]):
+            continue
+        key = (source_hash(normalized), target_language_key(row["target_lang"]))
+        entries.setdefault(key, (key[0], source_lang, key[1], normalized, row["translated_text"]))
+    return list(entries.values())
+
+
+async def seed_translation_memory(pool, *, page_size: int = WARMUP_PAGE_SIZE) -> int:
+    """Seed the TM from the full capture history; returns rows offered."""
+    before_id: int | None = None
+    offered = 0
+    while True:
+        rows = await fetch_translation_history_page(pool, before_id=before_id, limit=page_size)
+        if not rows:
+            return offered
+        entries = memory_entries(rows)
+        await insert_translation_memory(pool, entries)
+        offered += len(entries)
+        before_id = rows[-1]["id"]
+        print(f'warmup: {offered} entries offered (next id < {before_id})')
+
+
+async def main() -> None:
+    db = Db()
+    pool = await db.create_pool()
+    try:
+        offered = await seed_translation_memory(pool)
+        print(f'warmup: done, {offered} entries offered to app.translation_memory')
+    finally:
+        await db.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
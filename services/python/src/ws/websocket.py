@@ -1,9 +1,11 @@
 import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any
+
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
-from typing import Deque, Dict, Any, Optional
-from collections import deque
-import time
 
 from src.monitoring import metrics
 
@@ -11,18 +13,24 @@ from src.monitoring import metrics
 class WebSocketHub:
     def __init__(self) -> None:
         self._lock = asyncio.Lock()
-        self.client: Optional[WebSocket] = None
+        self.client: WebSocket | None = None
         # 동시 1세션 전제: 풀 dict 맵 대신 '지금 슬롯의 주인' sessionId 1개만 추적
-        self._session_id: Optional[str] = None
+        self._session_id: str | None = None
         self._send_gate = asyncio.Semaphore(1)
-        self._keepalive_task: Optional[asyncio.Task] = None
+        self._keepalive_task: asyncio.Task | None = None
         self._last_pong_time = 0
         self._first_pong_received = False  # 첫 pong을 받았는지 추적
         self._first_ping_sent_time = 0  # REV-3: 첫 ping 송신 시각(초기 pong 타임아웃 기준)
         self._reconnect_waiting = False
         self._reconnect_waiting_since = 0
-        self._pending: Deque[str] = deque()
+        self._pending: deque[str] = deque()
         self._max_pending = 100
+        # 다국어 fan-out: 슬롯(주 언어 클라)과 별개로, 세션의 추가 번역 언어를
+        # 구독하는 클라들. sessionId -> lang -> sockets. 라이브 전송만 하고
+        # pending/재접속 방류는 하지 않는다 (MonitorHub 와 같은 정책).
+        self._subscribers: dict[str, dict[str, set[WebSocket]]] = {}
+        # 구독 소켓별 전송 락: 문장 순서 보장 + 같은 소켓 동시 send 방지.
+        self._subscriber_gates: dict[WebSocket, asyncio.Lock] = {}
 
     @staticmethod
     def _is_connected(ws: WebSocket) -> bool:
@@ -66,6 +74,8 @@ class WebSocketHub:
         asyncio.create_task(self._flush_pending(ws))
 
     async def detach(self, session_id: str) -> None:
+        # 언어 구독 클라는 건드리지 않는다 — 슬롯 소켓 오류로 detach 되어도
+        # 세션은 살아 있다. 구독 정리는 명시적 세션 종료(close_subscribers)에서만.
         async with self._lock:
             # 다른 세션의 stop은 현재 소켓을 끊지 못한다 (mic/rtmp 교차 종료 방지의 핵심)
             if session_id != self._session_id:
@@ -82,7 +92,53 @@ class WebSocketHub:
             metrics.set_active_session(False)
             print('hub: detached', session_id)
 
-    async def broadcast_to_session(self, session_id: str, payload: Dict[str, Any]) -> None:
+    async def close_subscribers(self, session_id: str) -> None:
+        """세션 종료(/stop) 시 그 세션의 언어 구독 클라를 모두 닫는다."""
+        async with self._lock:
+            # 언어 구독 클라는 세션 키로 묶여 있어 교차 종료 위험이 없다 —
+            # 슬롯 주인 여부와 무관하게 그 세션의 구독만 정리한다.
+            subscribers = self._subscribers.pop(session_id, {})
+            for sockets in subscribers.values():
+                for sub in sockets:
+                    self._subscriber_gates.pop(sub, None)
+        for sockets in subscribers.values():
+            for sub in sockets:
+                with contextlib.suppress(Exception):
+                    await sub.close()
+
+    async def attach_subscriber(self, ws: WebSocket, session_id: str, lang: str) -> None:
+        """세션의 특정 번역 언어만 받는 추가 클라 (/ws?sessionId=&lang=)."""
+        await ws.accept()
+        async with self._lock:
+            self._subscribers.setdefault(session_id, {}).setdefault(lang.upper(), set()).add(ws)
+            self._subscriber_gates[ws] = asyncio.Lock()
+        print('hub: subscriber attached', session_id, lang)
+
+    async def detach_subscriber(self, ws: WebSocket, session_id: str, lang: str) -> None:
+        async with self._lock:
+            self._discard_subscriber_locked(ws, session_id, lang.upper())
+
+    def _discard_subscriber_locked(self, ws: WebSocket, session_id: str, lang: str) -> None:
+        by_lang = self._subscribers.get(session_id)
+        if by_lang is None:
+            return
+        sockets = by_lang.get(lang)
+        if sockets is not None:
+            sockets.discard(ws)
+            if not sockets:
+                by_lang.pop(lang, None)
+        if not by_lang:
+            self._subscribers.pop(session_id, None)
+        self._subscriber_gates.pop(ws, None)
+
+    async def broadcast_to_session(
+        self,
+        session_id: str,
+        payload: dict[str, Any],
+        *,
+        target_lang: str | None = None,
+        primary: bool = True,
+    ) -> None:
         raw_text = payload.get('sentence')
         if raw_text is None:
             print('hub: skip send, sentence is None')
@@ -90,6 +146,12 @@ class WebSocketHub:
 
         text = str(raw_text)
 
+        if target_lang is not None:
+            await self._broadcast_to_subscribers(session_id, target_lang.upper(), text)
+        # 추가 언어 번역은 구독 클라 전용 — 슬롯(주 언어 클라)에는 섞지 않는다.
+        if not primary:
+            return
+
         async with self._lock:
             # 슬롯 주인이 아닌 세션의 번역은 stale → drop (큐잉하지 않음, 에러B)
             if session_id != self._session_id:
@@ -112,6 +174,30 @@ class WebSocketHub:
 
         asyncio.create_task(self._send_text(ws, text, session_id))
 
+    async def _broadcast_to_subscribers(self, session_id: str, lang: str, text: str) -> None:
+        async with self._lock:
+            sockets = list(self._subscribers.get(session_id, {}).get(lang, ()))
+            gates = [self._subscriber_gates.get(ws) for ws in sockets]
+        for ws, gate in zip(sockets, gates, strict=True):
+            if gate is not None:
+                asyncio.create_task(self._send_to_subscriber(ws, gate, text, session_id, lang))
+
+    async def _send_to_subscriber(
+        self, ws: WebSocket, gate: asyncio.Lock, text: str, session_id: str, lang: str,
+    ) -> None:
+        # asyncio.Lock 은 FIFO 라 태스크 생성 순서 = 전송 순서.
+        async with gate:
+            try:
+                connected = self._is_connected(ws)
+                if connected:
+                    await ws.send_text(text)
+            except Exception as e:
+                print('hub: subscriber send failed (dropping subscriber):', repr(e))
+                connected = False
+            if not connected:
+                async with self._lock:
+                    self._discard_subscriber_locked(ws, session_id, lang)
+
     async def _requeue(self, session_id: str, text: str) -> None:
         # §4-3(원인 3): 전송하지 못한 문장은 버리지 않고 pending 앞쪽에 되돌려
         # 재접속 _flush_pending 이 방류하게 한다. 슬롯 주인이 바뀌었거나
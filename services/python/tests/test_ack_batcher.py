@@ -0,0 +1,118 @@
+"""Batched, non-blocking JetStream acknowledgements.
+
+Each handler used to await its own ``message.ack()`` before freeing its slot.
+While ``run()`` is consuming, acks/naks/terms are now queued on an
+:class:`AckBatcher` and sent in order in one pass every ``max_delay_seconds``;
+the dedup watermark is advanced before the ack is queued, and whatever is
+still queued is flushed on shutdown.
+"""
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.consumer.ack_batcher import AckBatcher
+from src.consumer.consumer import DEFAULT_ACK_WAIT_SECONDS
+from tests.test_consumer_dedup import FakeMsg, RecordingSeparator, make_consumer, payload
+from tests.test_consumer_window import FakeSubscription
+from tests.test_separator_pipeline import eventually
+
+
+class OrderedMsg:
+    def __init__(self, name: str, log: list[str], fail: bool = False) -> None:
+        self.name, self.log, self.fail = name, log, fail
+
+    async def _record(self, action: str) -> None:
+        if self.fail:
+            raise RuntimeError('disconnected')
+        self.log.append(f'{action}:{self.name}')
+
+    async def ack(self) -> None:
+        await self._record('ack')
+
+    async def nak(self) -> None:
+        await self._record('nak')
+
+    async def term(self) -> None:
+        await self._record('term')
+
+
+def batch_count():
+    return REGISTRY.get_sample_value('neemba_consumer_ack_batch_size_count') or 0.0
+
+
+def test_flush_delay_must_stay_inside_ack_wait():
+    with pytest.raises(ValueError):
+        AckBatcher(ack_wait_seconds=DEFAULT_ACK_WAIT_SECONDS,
+                   max_delay_seconds=DEFAULT_ACK_WAIT_SECONDS)
+    with pytest.raises(ValueError):
+        AckBatcher(ack_wait_seconds=DEFAULT_ACK_WAIT_SECONDS, max_delay_seconds=0)
+
+
+async def test_settlements_are_sent_in_order_in_one_batch():
+    before = batch_count()
+    log: list[str] = []
+    batcher = AckBatcher(ack_wait_seconds=30, max_delay_seconds=0.05)
+    batcher.start()
+    try:
+        batcher.settle(OrderedMsg('a', log), 'ack')
+        batcher.settle(OrderedMsg('b', log, fail=True), 'ack')
+        batcher.settle(OrderedMsg('c', log), 'nak')
+        batcher.settle(OrderedMsg('d', log), 'term')
+        assert log == []
+
+        assert await eventually(lambda: len(log) == 3)
+    finally:
+        await batcher.close()
+
+    # A failed ack does not hold up the rest of the batch.
+    assert log == ['ack:a', 'nak:c', 'term:d']
+    assert batch_count() == before + 1
+
+
+async def test_a_full_batch_is_sent_without_waiting_for_the_delay():
+    log: list[str] = []
+    batcher = AckBatcher(ack_wait_seconds=30, max_delay_seconds=5.0, max_batch_size=3)
+    batcher.start()
+    try:
+        for name in 'xyz':
+            batcher.settle(OrderedMsg(name, log), 'ack')
+        assert await eventually(lambda: len(log) == 3, timeout=1.0)
+    finally:
+        await batcher.close()
+
+
+async def test_close_flushes_queued_settlements():
+    log: list[str] = []
+    batcher = AckBatcher(ack_wait_seconds=30, max_delay_seconds=5.0)
+    batcher.start()
+    batcher.settle(OrderedMsg('late', log), 'ack')
+
+    await batcher.close()
+
+    assert log == ['ack:late']
+    assert not batcher.running
+
+
+async def test_watermark_is_advanced_before_the_ack_is_sent():
+    separator, subscription = RecordingSeparator(), FakeSubscription()
+    consumer = make_consumer(separator)
+    consumer.subscription = subscription
+    consumer._acks.max_delay_seconds = 5.0
+    first = subscription.publish(1, 'session-1')
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        assert await eventually(lambda: separator.offers == [('session-1', 1)])
+        assert not first.acked
+        # The broker redelivers before the batched ack went out.
+        redelivered = FakeMsg(payload(1))
+        subscription.queue.put_nowait(redelivered)
+        await asyncio.sleep(0.05)
+        assert separator.offers == [('session-1', 1)]
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    # Shutdown flushed both acks.
+    assert first.acked and redelivered.acked
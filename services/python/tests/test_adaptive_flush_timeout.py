@@ -0,0 +1,93 @@
+"""Adaptive per-session flush timeout.
+
+A fixed 2 s timeout is slow for quick speakers and cuts slow ones off
+mid-sentence. In adaptive mode each session lane learns its timeout from the
+configured percentile of its own inter-delta gaps, clamped to [min, max],
+and exports it per lane.
+"""
+import asyncio
+from unittest import mock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.separator.kss_separator import SentenceSeparator
+from tests.test_separator_pipeline import FakePusher, FakeTranslator, eventually, simple_split
+from tests.test_separator_segments import dto
+
+
+def make_separator(pusher=None, **kwargs) -> SentenceSeparator:
+    options = {'adaptive_flush_timeout': True, 'flush_timeout_quantile': 0.9,
+               'flush_timeout_min_seconds': 0.8, 'flush_timeout_max_seconds': 4.0}
+    options.update(kwargs)
+    with mock.patch('src.separator.kss_separator.Kss'):
+        separator = SentenceSeparator(FakeTranslator(), pusher or FakePusher(), **options)
+    separator.splitter = simple_split
+    return separator
+
+
+def exported(session):
+    return REGISTRY.get_sample_value(
+        'neemba_separator_flush_timeout_seconds', {'session': session})
+
+
+def learn(separator, session, gaps):
+    lane = separator._lane(session)
+    now = 100.0
+    separator._observe_gap(lane, now)
+    for gap in gaps:
+        now += gap
+        separator._observe_gap(lane, now)
+    return lane
+
+
+def test_fixed_timeout_applies_until_enough_gaps_are_seen():
+    separator = make_separator()
+    lane = learn(separator, 'warming-up', [1.5] * 5)
+
+    assert lane.flush_timeout == 2.0
+    assert exported('warming-up') == 2.0
+
+
+def test_slow_speaker_gets_a_longer_timeout():
+    separator = make_separator()
+    lane = learn(separator, 'slow', [1.0] * 20 + [2.5] * 10)
+
+    assert lane.flush_timeout == pytest.approx(2.5)
+    assert exported('slow') == pytest.approx(2.5)
+
+
+def test_learned_timeout_is_clamped():
+    separator = make_separator()
+    quick = learn(separator, 'quick', [0.05] * 40)
+    # Gaps longer than the max are pauses between utterances: ignored.
+    paused = learn(separator, 'paused', [3.9] * 30 + [60.0] * 30)
+
+    assert quick.flush_timeout == 0.8
+    assert paused.flush_timeout == pytest.approx(3.9)
+
+
+def test_fixed_mode_keeps_the_configured_timeout():
+    separator = make_separator(adaptive_flush_timeout=False)
+    lane = separator._lane('fixed')
+
+    assert lane.gaps is None
+    assert lane.flush_timeout == 2.0
+
+
+async def test_quick_speaker_tail_flushes_before_the_fixed_timeout():
+    pusher = FakePusher()
+    separator = make_separator(pusher, flush_timeout_seconds=2.0,
+                               flush_timeout_min_seconds=0.1)
+    await separator.start()
+    try:
+        for sequence in range(1, 26):
+            await separator.offer(dto(f' 단어{sequence}', segment_id=1, sequence=sequence))
+            await asyncio.sleep(0.01)
+        assert await eventually(lambda: separator._lanes['session-1'].flush_timeout == 0.1)
+        finished = asyncio.get_running_loop().time()
+
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+        assert asyncio.get_running_loop().time() - finished < 1.0
+    finally:
+        await separator.stop()
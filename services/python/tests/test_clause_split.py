@@ -0,0 +1,110 @@
+"""Clause-level splitting of run-on speech.
+
+Without a sentence-final ending the tail grows until the flush timeout ships
+it as one huge chunk. Past a configured length or age the separator now
+translates the tail's head up to its last clause boundary on its own.
+"""
+import asyncio
+from unittest import mock
+
+from prometheus_client import REGISTRY
+
+from src.config import get_clause_split_config
+from src.separator.clauses import last_clause_boundary
+from src.separator.kss_separator import SentenceSeparator
+from tests.test_separator_pipeline import FakePusher, FakeTranslator, eventually, simple_split
+from tests.test_separator_segments import dto
+
+RUN_ON = ['오늘 우리가', ' 함께 모여서', ' 하나님께 예배를', ' 드리고 말씀을', ' 듣는데 우리의', ' 마음이']
+
+
+def make_separator(pusher, **kwargs) -> SentenceSeparator:
+    with mock.patch('src.separator.kss_separator.Kss'):
+        separator = SentenceSeparator(FakeTranslator(), pusher, flush_timeout_seconds=5.0, **kwargs)
+    separator.splitter = simple_split
+    return separator
+
+
+def clause_splits(reason):
+    return REGISTRY.get_sample_value(
+        'neemba_separator_clause_splits_total', {'reason': reason}) or 0.0
+
+
+def test_clause_splitting_is_opt_in(monkeypatch):
+    for key in ('CLAUSE_SPLIT_ENABLED', 'CLAUSE_SPLIT_MAX_CHARS', 'CLAUSE_SPLIT_MAX_AGE_SECONDS'):
+        monkeypatch.delenv(key, raising=False)
+    assert get_clause_split_config()['enabled'] is False
+
+    monkeypatch.setenv('CLAUSE_SPLIT_ENABLED', 'true')
+    monkeypatch.setenv('CLAUSE_SPLIT_MAX_CHARS', '80')
+    config = get_clause_split_config()
+    assert config['enabled'] is True and config['max_chars'] == 80
+
+
+def test_boundary_prefers_the_last_comma():
+    text = '사랑하는 성도 여러분, 오늘도 우리가 모였는데 그 이유는'
+    assert text[:last_clause_boundary(text)] == '사랑하는 성도 여러분,'
+
+
+def test_boundary_falls_back_to_a_connective_ending():
+    text = '오늘 우리가 함께 모여서 예배를 드리고 말씀을 듣는데 우리의 마음이'
+    assert text[:last_clause_boundary(text)] == '오늘 우리가 함께 모여서 예배를 드리고 말씀을 듣는데'
+
+
+def test_no_boundary_or_too_short_a_head():
+    assert last_clause_boundary('아무 경계가 없는 긴 문장') is None
+    assert last_clause_boundary('짧고 그리고 더 긴 나머지', min_chars=10) is None
+
+
+async def feed(separator, deltas, pause=0.0):
+    for sequence, delta in enumerate(deltas, start=1):
+        await separator.offer(dto(delta, segment_id=1, sequence=sequence))
+        await asyncio.sleep(pause or 0.01)
+
+
+async def test_long_tail_is_cut_at_a_clause_boundary():
+    before = clause_splits('length')
+    pusher = FakePusher()
+    separator = make_separator(pusher, clause_max_chars=30)
+    await separator.start()
+    try:
+        await feed(separator, RUN_ON)
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+        await separator.offer(dto(' 평안합니다.', segment_id=1, sequence=len(RUN_ON) + 1))
+        assert await eventually(lambda: len(pusher.pushed) == 2)
+    finally:
+        await separator.stop()
+
+    assert pusher.sources() == [
+        '오늘 우리가 함께 모여서 하나님께 예배를 드리고 말씀을 듣는데',
+        '우리의 마음이 평안합니다.',
+    ]
+    assert clause_splits('length') == before + 1
+
+
+async def test_old_tail_is_cut_at_a_clause_boundary():
+    before = clause_splits('age')
+    pusher = FakePusher()
+    separator = make_separator(pusher, clause_max_age_seconds=0.1)
+    await separator.start()
+    try:
+        await feed(separator, RUN_ON[:4], pause=0.05)
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert pusher.sources()[0].endswith(('모여서', '드리고'))
+    assert clause_splits('age') == before + 1
+
+
+async def test_tail_without_a_boundary_waits_for_the_timeout():
+    pusher = FakePusher()
+    separator = make_separator(pusher, clause_max_chars=10)
+    await separator.start()
+    try:
+        await feed(separator, ['아무 경계가', ' 없는 아주', ' 긴 문장'])
+        await asyncio.sleep(0.1)
+        assert pusher.pushed == []
+        assert separator.state_by_key[('session-1', 1)].buffer == '아무 경계가 없는 아주 긴 문장'
+    finally:
+        await separator.stop()
@@ -0,0 +1,95 @@
+"""Lag-driven window and fetch batch for the transcript consumer.
+
+``worker_concurrency=5`` was hard-coded and doubled as the fetch batch size,
+whatever the backlog. With ``min_concurrency`` set the consumer polls
+JetStream consumer info and moves both between the configured bounds: a
+backlog after a NATS blip or a restart drains at the full window, an idle
+stream stays at the minimum.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from src.consumer.consumer import window_for_lag
+from tests.test_consumer_window import BlockingSeparator, FakeSubscription, make_consumer
+from tests.test_separator_pipeline import eventually
+
+
+class LaggingSubscription(FakeSubscription):
+    def __init__(self) -> None:
+        super().__init__()
+        self.info = SimpleNamespace(num_pending=0, num_ack_pending=0)
+        self.info_error: Exception | None = None
+
+    async def consumer_info(self):
+        if self.info_error is not None:
+            raise self.info_error
+        return self.info
+
+
+def gauge(name):
+    return REGISTRY.get_sample_value(name, {'durable': 'durable'})
+
+
+def test_window_follows_outstanding_messages_between_bounds():
+    assert window_for_lag(10_000, 0, 2, 32) == (32, 32)
+    assert window_for_lag(0, 0, 2, 32) == (2, 2)
+    assert window_for_lag(3, 6, 2, 32) == (9, 3)
+    assert window_for_lag(0, 20, 2, 8) == (8, 2)
+
+
+async def test_backlog_widens_the_window_and_idle_shrinks_it():
+    separator, subscription = BlockingSeparator(), LaggingSubscription()
+    consumer = make_consumer(separator, subscription, worker_concurrency=8,
+                             min_concurrency=2, lag_poll_seconds=0.01)
+    for sequence in range(1, 21):
+        subscription.publish(sequence, 'stuck')
+    subscription.info.num_pending = 20
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        assert await eventually(lambda: len(consumer._in_flight) == 8)
+        assert consumer.window == 8 and consumer.fetch_batch == 8
+        assert gauge('neemba_consumer_window') == 8
+        assert gauge('neemba_consumer_pending_messages') == 20
+
+        separator.release.set()
+        assert await eventually(lambda: len(separator.offers) == 20)
+        subscription.info.num_pending = 0
+        assert await eventually(lambda: consumer.window == 2)
+        assert consumer.fetch_batch == 2
+        assert gauge('neemba_consumer_fetch_batch') == 2
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+async def test_consumer_info_failure_keeps_the_current_window():
+    subscription = LaggingSubscription()
+    subscription.info_error = RuntimeError('nats blip')
+    consumer = make_consumer(BlockingSeparator(), subscription, worker_concurrency=8,
+                             min_concurrency=2, lag_poll_seconds=0.01)
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        await asyncio.sleep(0.05)
+        assert (consumer.window, consumer.fetch_batch) == (8, 8)
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+async def test_without_a_minimum_the_window_is_fixed():
+    subscription = LaggingSubscription()
+    consumer = make_consumer(BlockingSeparator(), subscription, worker_concurrency=5)
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        assert await eventually(lambda: len(subscription.fetches) == 1)
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    assert subscription.fetches[0]['batch'] == 5
+    assert consumer.window == 5
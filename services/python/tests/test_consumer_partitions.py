@@ -0,0 +1,206 @@
+"""Session-affinity partitioning across consumer processes.
+
+Only one process could consume the durable, because the dedup watermark and
+the separator state live in memory. The stream now maps every session to one
+of N partitions (server-side ``partition()`` transform), each with its own
+durable; live workers split the partitions by rendezvous hashing and hand
+partitions over — watermarks passed on, sessions left open — when a worker
+joins or leaves.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from nats.js.errors import KeyNotFoundError, NoKeysError
+
+from src.config import get_consumer_partition_config
+from src.consumer.partitioned import PartitionedConsumer
+from src.consumer.partitions import PartitionLayout, assign_partitions, fnv1a_32
+from tests.test_consumer_dedup import FakeMsg, payload
+from tests.test_consumer_window import FakeSubscription
+from tests.test_separator_pipeline import eventually
+
+SUBJECT = 'transcript.session.*'
+
+
+def test_layout_rewrites_the_session_token_into_a_partition():
+    layout = PartitionLayout(SUBJECT, 8)
+
+    transform = layout.transform()
+    assert transform.src == SUBJECT
+    assert transform.dest == 'transcript.session.{{partition(8,1)}}.{{wildcard(1)}}'
+    assert layout.subject_for(3) == 'transcript.session.3.*'
+    assert layout.durable_for('python-consumer', 3) == 'python-consumer-p3'
+    with pytest.raises(ValueError):
+        PartitionLayout('transcript.session.>', 8)
+
+
+def test_partitioned_mode_requires_sticky_routing(monkeypatch):
+    monkeypatch.delenv('CONSUMER_PARTITION_ROUTING', raising=False)
+    monkeypatch.setenv('CONSUMER_PARTITIONS', '0')
+    assert get_consumer_partition_config()['partitions'] == 0
+
+    monkeypatch.setenv('CONSUMER_PARTITIONS', '8')
+    with pytest.raises(RuntimeError, match='CONSUMER_PARTITION_ROUTING=sticky'):
+        get_consumer_partition_config()
+
+    monkeypatch.setenv('CONSUMER_PARTITION_ROUTING', 'sticky')
+    config = get_consumer_partition_config()
+    assert config['partitions'] == 8 and config['routing'] == 'sticky'
+
+
+def test_partition_hash_is_fnv1a_like_the_server():
+    assert fnv1a_32(b'') == 0x811C9DC5
+    assert fnv1a_32(b'a') == 0xE40C292C
+    assert PartitionLayout(SUBJECT, 8).partition_of('a') == 0xE40C292C % 8
+
+
+def test_rendezvous_assignment_only_moves_partitions_of_the_changed_worker():
+    three = assign_partitions(64, ['w1', 'w2', 'w3'])
+    four = assign_partitions(64, ['w1', 'w2', 'w3', 'w4'])
+
+    assert sorted(p for owned in three.values() for p in owned) == list(range(64))
+    for worker in ('w1', 'w2', 'w3'):
+        # A join only takes partitions away, towards the new worker.
+        assert four[worker] <= three[worker]
+    assert all(len(owned) > 8 for owned in four.values())
+
+
+class FakeKV:
+    def __init__(self) -> None:
+        self.entries: dict[str, bytes] = {}
+
+    async def put(self, key, value):
+        self.entries[key] = value
+
+    async def get(self, key):
+        if key not in self.entries:
+            raise KeyNotFoundError
+        return SimpleNamespace(key=key, value=self.entries[key])
+
+    async def keys(self):
+        if not self.entries:
+            raise NoKeysError
+        return list(self.entries)
+
+    async def delete(self, key):
+        self.entries.pop(key, None)
+
+
+class PartitionSubscription(FakeSubscription):
+    async def unsubscribe(self):
+        pass
+
+
+class FakeBroker:
+    """One subscription per partition subject, shared by whoever pulls it."""
+
+    def __init__(self, layout: PartitionLayout) -> None:
+        self.layout = layout
+        self.subscriptions = {layout.subject_for(p): PartitionSubscription()
+                              for p in range(layout.partitions)}
+        self.members, self.handover = FakeKV(), FakeKV()
+
+    async def pull_subscribe(self, subject, durable, stream):
+        return self.subscriptions[subject]
+
+    def publish(self, sequence, session_id) -> FakeMsg:
+        subject = self.layout.subject_for(self.layout.partition_of(session_id))
+        return self.subscriptions[subject].publish(sequence, session_id)
+
+    def redeliver(self, sequence, session_id) -> FakeMsg:
+        message = FakeMsg(payload(sequence, session_id))
+        subject = self.layout.subject_for(self.layout.partition_of(session_id))
+        self.subscriptions[subject].queue.put_nowait(message)
+        return message
+
+
+class SessionSeparator:
+    def __init__(self) -> None:
+        self.offers: list[tuple[str, int]] = []
+        self.closed: list[str] = []
+
+    async def start(self) -> None: ...
+    async def stop(self) -> None: ...
+
+    async def offer(self, event) -> None:
+        self.offers.append((event.session_id, event.sequence))
+
+    async def close_session(self, session_id) -> None:
+        self.closed.append(session_id)
+
+
+def make_worker(broker, worker_id) -> PartitionedConsumer:
+    consumer = PartitionedConsumer(
+        'nats://unused', SUBJECT, 'transcripts', 'durable', SessionSeparator(),
+        partitions=broker.layout.partitions, worker_id=worker_id,
+        member_ttl_seconds=0.06, handover_timeout_seconds=1.0)
+    consumer.jetstream = broker
+    consumer.members_kv, consumer.handover_kv = broker.members, broker.handover
+    return consumer
+
+
+async def stop(task):
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_workers_split_partitions_and_hand_sessions_over():
+    broker = FakeBroker(PartitionLayout(SUBJECT, 4))
+    sessions = [f'session-{i}' for i in range(12)]
+    first = make_worker(broker, 'worker-a')
+    first_task = asyncio.create_task(first.run())
+    second_task = None
+    try:
+        assert await eventually(lambda: len(first._owned) == 4)
+        for session in sessions:
+            broker.publish(1, session)
+        assert await eventually(lambda: len(first.separator.offers) == 12)
+
+        second = make_worker(broker, 'worker-b')
+        second_task = asyncio.create_task(second.run())
+        assert await eventually(lambda: len(first._owned) + len(second._owned) == 4
+                                and second._owned != {} and first._members == second._members)
+        moved = [s for s in sessions if broker.layout.partition_of(s) in second._owned]
+        # The old owner kept the moved sessions (and their settings) open ...
+        assert first.separator.closed == []
+        # ... and the new owner inherited their watermarks: a redelivery is
+        # recognised as a duplicate instead of being buffered twice.
+        duplicate = broker.redeliver(1, moved[0])
+        assert await eventually(lambda: duplicate.acked)
+        assert second.separator.offers == []
+
+        broker.publish(2, moved[0])
+        assert await eventually(lambda: second.separator.offers == [(moved[0], 2)])
+
+        # A leaving worker hands everything back.
+        await stop(second_task)
+        assert 'worker-b' not in broker.members.entries
+        assert await eventually(lambda: len(first._owned) == 4)
+        handover = json.loads(broker.handover.entries[f'p{broker.layout.partition_of(moved[0])}'])
+        assert handover['from'] == 'worker-b'
+        assert handover['watermarks'][moved[0]] == 2
+    finally:
+        if second_task is not None:
+            await stop(second_task)
+        await stop(first_task)
+
+
+async def test_heartbeat_keeps_running_while_a_handover_is_awaited():
+    broker = FakeBroker(PartitionLayout(SUBJECT, 4))
+    # A live member that never writes its handover: the joining worker
+    # waits out handover_timeout_seconds for every partition it takes over.
+    await broker.members.put('worker-silent', b'1')
+    worker = make_worker(broker, 'worker-a')
+    task = asyncio.create_task(worker.run())
+    try:
+        assert await eventually(lambda: worker._members == {'worker-a', 'worker-silent'})
+        # As if the TTL had expired mid-wait: the heartbeat puts it back.
+        del broker.members.entries['worker-a']
+        assert await eventually(lambda: 'worker-a' in broker.members.entries, timeout=0.5)
+        assert worker._owned == {}
+        assert await eventually(lambda: worker._owned != {})
+    finally:
+        await stop(task)
+    assert 'worker-a' not in broker.members.entries
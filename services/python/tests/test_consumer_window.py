@@ -0,0 +1,144 @@
+"""Sliding-window fetch in ``TranscriptConsumer.run``.
+
+``run`` used to fetch ``worker_concurrency`` messages and gather the whole
+batch before fetching again, so one ``separator.offer`` blocked on a full
+queue stalled intake for every session. Handlers now run in a sliding window
+whose free slots are refilled as soon as any handler finishes, and fetches
+long-poll with idle heartbeats instead of spinning on a 5 s timeout.
+"""
+import asyncio
+
+from nats.js.errors import FetchTimeoutError
+from prometheus_client import REGISTRY
+
+from src.consumer.consumer import TranscriptConsumer
+from tests.test_consumer_dedup import FakeMsg, payload
+from tests.test_separator_pipeline import eventually
+
+
+class BlockingSeparator:
+    """``offer`` for the 'stuck' session blocks until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.offers: list[tuple[str, int]] = []
+        self.release = asyncio.Event()
+
+    async def start(self) -> None: ...
+    async def stop(self) -> None: ...
+
+    async def offer(self, event) -> None:
+        if event.session_id == 'stuck':
+            await self.release.wait()
+        self.offers.append((event.session_id, event.sequence))
+
+
+class FakeSubscription:
+    """Hands out queued messages; an empty queue long-polls like JetStream."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[FakeMsg] = asyncio.Queue()
+        self.fetches: list[dict] = []
+
+    def publish(self, sequence: int, session_id: str) -> FakeMsg:
+        message = FakeMsg(payload(sequence, session_id))
+        self.queue.put_nowait(message)
+        return message
+
+    async def fetch(self, batch=1, timeout=5, heartbeat=None):
+        self.fetches.append({'batch': batch, 'timeout': timeout, 'heartbeat': heartbeat})
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            raise FetchTimeoutError from None
+        messages = [first]
+        while len(messages) < batch and not self.queue.empty():
+            messages.append(self.queue.get_nowait())
+        return messages
+
+
+def make_consumer(separator, subscription, **kwargs) -> TranscriptConsumer:
+    consumer = TranscriptConsumer(
+        'nats://unused', 'subject', 'stream', 'durable',
+        separator=separator, **kwargs)
+    consumer.subscription = subscription
+    return consumer
+
+
+def in_flight():
+    return REGISTRY.get_sample_value('neemba_consumer_in_flight_messages', {'durable': 'durable'})
+
+
+async def test_a_blocked_offer_does_not_stall_other_sessions():
+    separator, subscription = BlockingSeparator(), FakeSubscription()
+    consumer = make_consumer(separator, subscription, worker_concurrency=3)
+    stuck = subscription.publish(1, 'stuck')
+    live = [subscription.publish(sequence, 'live') for sequence in range(1, 11)]
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        # The stuck handler holds one slot; the other two keep draining.
+        assert await eventually(lambda: len(separator.offers) == 10)
+        # Acks go out asynchronously through the AckBatcher.
+        assert await eventually(lambda: all(message.acked for message in live))
+        assert not stuck.acked
+        assert in_flight() == 1
+
+        separator.release.set()
+        assert await eventually(lambda: stuck.acked)
+        assert await eventually(lambda: in_flight() == 0)
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+async def test_fetch_asks_only_for_free_slots():
+    separator, subscription = BlockingSeparator(), FakeSubscription()
+    consumer = make_consumer(separator, subscription, worker_concurrency=4)
+    for sequence in range(1, 4):
+        subscription.publish(sequence, 'stuck')
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        assert await eventually(lambda: len(consumer._in_flight) == 3)
+        assert await eventually(lambda: len(subscription.fetches) == 2)
+        assert subscription.fetches[1]['batch'] == 1
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    # Cancelling run() cancels its in-flight handlers instead of leaking them.
+    assert consumer._in_flight == set()
+
+
+async def test_quiet_stream_long_polls_with_heartbeats():
+    before = REGISTRY.get_sample_value('neemba_consumer_idle_wait_seconds_count') or 0.0
+    subscription = FakeSubscription()
+    consumer = make_consumer(BlockingSeparator(), subscription,
+                             fetch_timeout_seconds=0.05, fetch_heartbeat_seconds=0.01)
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        # An expired long poll is not an error: run() just polls again.
+        assert await eventually(lambda: len(subscription.fetches) >= 2)
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    assert subscription.fetches[0] == {'batch': 5, 'timeout': 0.05, 'heartbeat': 0.01}
+    assert REGISTRY.get_sample_value('neemba_consumer_idle_wait_seconds_count') >= before + 1
+
+
+async def test_fetch_that_returns_messages_is_not_idle_wait():
+    separator, subscription = BlockingSeparator(), FakeSubscription()
+    consumer = make_consumer(separator, subscription)
+    subscription.publish(1, 'live')
+    before = REGISTRY.get_sample_value('neemba_consumer_idle_wait_seconds_count') or 0.0
+
+    runner = asyncio.create_task(consumer.run())
+    try:
+        assert await eventually(lambda: separator.offers == [('live', 1)])
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+    assert (REGISTRY.get_sample_value('neemba_consumer_idle_wait_seconds_count') or 0.0) == before
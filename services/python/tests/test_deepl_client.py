@@ -0,0 +1,129 @@
+"""Async DeepL client: one keep-alive pool, no event-loop blocking.
+
+The old service built a ``deepl.Translator`` per sentence and called it
+synchronously from ``_push_loop`` — every round-trip froze WS sends, NATS
+fetches and keepalives. These tests drive the async client through an httpx
+``MockTransport`` (no network) and pin the request shape, connection reuse,
+error surfacing and the per-call latency histogram.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from deepl import TextResult
+from prometheus_client import REGISTRY
+
+from src.deepL.deepL import (
+    DEEPL_FREE_API_URL,
+    DEEPL_PRO_API_URL,
+    DeeplError,
+    DeeplTranslationService,
+)
+
+
+def ok_handler(requests: list[httpx.Request]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"translations": [
+            {"detected_source_language": "KO", "text": f"EN::{t}", "billed_characters": len(t)}
+            for t in body["text"]
+        ]})
+    return handler
+
+
+def latency_count(outcome: str) -> float:
+    return REGISTRY.get_sample_value(
+        'neemba_deepl_request_seconds_count', {'outcome': outcome}) or 0.0
+
+
+async def test_translate_posts_to_rest_api_and_returns_text_result():
+    requests: list[httpx.Request] = []
+    service = DeeplTranslationService(
+        'key-123:fx', transport=httpx.MockTransport(ok_handler(requests)))
+    try:
+        result = await service.translate('안녕하세요.', 'en-US')
+    finally:
+        await service.aclose()
+
+    assert isinstance(result, TextResult)
+    assert str(result) == 'EN::안녕하세요.'
+    assert result.billed_characters == len('안녕하세요.')
+    request = requests[0]
+    assert request.url.path == '/v2/translate'
+    assert request.headers['authorization'] == 'DeepL-Auth-Key key-123:fx'
+    assert json.loads(request.content)['target_lang'] == 'en-US'
+
+
+def test_free_and_pro_keys_pick_their_endpoint():
+    assert DeeplTranslationService('k:fx').server_url == DEEPL_FREE_API_URL
+    assert DeeplTranslationService('k').server_url == DEEPL_PRO_API_URL
+
+
+async def test_client_is_reused_across_calls():
+    requests: list[httpx.Request] = []
+    service = DeeplTranslationService(
+        'k:fx', transport=httpx.MockTransport(ok_handler(requests)))
+    client = service._client
+    try:
+        await service.translate('하나', 'en-US')
+        await service.translate('둘', 'en-US')
+    finally:
+        await service.aclose()
+
+    # Same pool for every request — no per-sentence client construction.
+    assert service._client is client
+    assert len(requests) == 2
+
+
+async def test_slow_translation_does_not_block_the_event_loop():
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"translations": [{"text": "late"}]})
+
+    service = DeeplTranslationService('k:fx', transport=httpx.MockTransport(slow_handler))
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        assert str(await service.translate('느린 문장', 'en-US')) == 'late'
+    finally:
+        ticker_task.cancel()
+        await service.aclose()
+
+    # Other coroutines kept running while the round-trip was in flight.
+    assert ticks >= 5
+
+
+async def test_error_status_raises_and_is_recorded():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, text='Too many requests')
+
+    service = DeeplTranslationService('k:fx', transport=httpx.MockTransport(handler))
+    before = latency_count('http_429')
+    try:
+        with pytest.raises(DeeplError) as exc_info:
+            await service.translate('문장', 'en-US')
+    finally:
+        await service.aclose()
+
+    assert exc_info.value.status_code == 429
+    assert latency_count('http_429') == before + 1
+
+
+async def test_successful_call_observes_latency():
+    service = DeeplTranslationService('k:fx', transport=httpx.MockTransport(ok_handler([])))
+    before = latency_count('ok')
+    try:
+        await service.translate('문장', 'en-US')
+    finally:
+        await service.aclose()
+
+    assert latency_count('ok') == before + 1
@@ -0,0 +1,158 @@
+"""Multi-key DeepL load balancing.
+
+Requests are spread over several API keys by in-flight count, latency and
+remaining quota; a key that fails auth or runs out of quota is quarantined
+and the request transparently moves to the next key.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from src.deepL.balancer import MAX_LATENCY_SECONDS, DeeplKeyBalancer, key_label
+from src.deepL.deepL import DeeplError, DeeplTranslationService
+
+
+class FakeAccount:
+    """One DeepL account behind an httpx MockTransport."""
+
+    def __init__(self, *, status: int = 200, used: int = 0, limit: int = 500_000,
+                 delay: float = 0.0) -> None:
+        self.status = status
+        self.delay = delay
+        self.used = used
+        self.limit = limit
+        self.translate_calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.delay)
+        if request.url.path == '/v2/usage':
+            if self.status == 403:
+                return httpx.Response(403, text='forbidden')
+            return httpx.Response(200, json={"character_count": self.used, "character_limit": self.limit})
+        self.translate_calls += 1
+        if self.status != 200:
+            return httpx.Response(self.status, text='nope')
+        texts = json.loads(request.content)["text"]
+        return httpx.Response(200, json={"translations": [
+            {"detected_source_language": "KO", "text": f"EN::{t}", "billed_characters": len(t)}
+            for t in texts
+        ]})
+
+
+def service(key: str, account: FakeAccount) -> DeeplTranslationService:
+    return DeeplTranslationService(key, transport=httpx.MockTransport(account.handler))
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_key_label_never_exposes_the_key():
+    assert key_label('0123456789abcdef-wxyz:fx') == '...wxyz'
+
+
+async def test_requests_are_spread_across_keys():
+    a, b = FakeAccount(delay=0.01), FakeAccount(delay=0.01)
+    balancer = DeeplKeyBalancer([service('key-aaaa', a), service('key-bbbb', b)])
+    try:
+        await asyncio.gather(*(balancer.translate(f'문장{i}', 'EN-US') for i in range(10)))
+    finally:
+        await balancer.aclose()
+
+    assert a.translate_calls + b.translate_calls == 10
+    assert a.translate_calls >= 3 and b.translate_calls >= 3
+
+
+async def test_key_with_more_remaining_quota_is_preferred():
+    nearly_empty, fresh = FakeAccount(used=495_000), FakeAccount()
+    balancer = DeeplKeyBalancer([service('key-aaaa', nearly_empty), service('key-bbbb', fresh)])
+    try:
+        await balancer.translate('첫 문장', 'EN-US')
+        await settle()  # usage polls land
+        for i in range(5):
+            await balancer.translate(f'문장{i}', 'EN-US')
+    finally:
+        await balancer.aclose()
+
+    assert fresh.translate_calls >= 5
+    assert REGISTRY.get_sample_value(
+        'neemba_deepl_key_remaining_characters', {'key': '...aaaa'}) == 5_000.0
+
+
+@pytest.mark.parametrize('status', [403, 456])
+async def test_auth_and_quota_errors_quarantine_the_key_and_fail_over(status):
+    broken, healthy = FakeAccount(status=status), FakeAccount()
+    broken_key = f'key-{status}x'
+    balancer = DeeplKeyBalancer([service(broken_key, broken), service('key-good', healthy)])
+    try:
+        # The broken key is first in line (same score, lower index).
+        result = await balancer.translate('안녕하세요', 'EN-US')
+        await balancer.translate('또 만나요', 'EN-US')
+    finally:
+        await balancer.aclose()
+
+    assert str(result) == 'EN::안녕하세요'
+    assert broken.translate_calls == 1
+    assert healthy.translate_calls == 2
+    assert REGISTRY.get_sample_value(
+        'neemba_deepl_key_quarantined', {'key': key_label(broken_key)}) == 1.0
+
+
+async def test_quarantine_expires():
+    now = [0.0]
+    broken = FakeAccount(status=456)
+    balancer = DeeplKeyBalancer(
+        [service('key-only', broken)], quota_quarantine_seconds=60, clock=lambda: now[0])
+    try:
+        with pytest.raises(DeeplError) as exc_info:
+            await balancer.translate('문장', 'EN-US')
+        assert exc_info.value.status_code == 456
+
+        broken.status = 200
+        now[0] = 61.0
+        assert str(await balancer.translate('문장', 'EN-US')) == 'EN::문장'
+    finally:
+        await balancer.aclose()
+
+    assert REGISTRY.get_sample_value('neemba_deepl_key_quarantined', {'key': '...only'}) == 0.0
+
+
+async def test_throttling_is_surfaced_not_quarantined():
+    throttled = FakeAccount(status=429)
+    balancer = DeeplKeyBalancer([service('key-slow', throttled), service('key-fast', FakeAccount())])
+    try:
+        with pytest.raises(DeeplError):
+            await balancer.translate('문장', 'EN-US')
+        # The penalized key is no longer first choice for the retry.
+        assert str(await balancer.translate('문장', 'EN-US')) == 'EN::문장'
+    finally:
+        await balancer.aclose()
+
+    assert throttled.translate_calls == 1
+
+
+async def test_error_penalty_is_capped():
+    account = FakeAccount(status=503)
+    balancer = DeeplKeyBalancer([service('key-down', account)])
+    try:
+        for _ in range(20):
+            with pytest.raises(DeeplError):
+                await balancer.translate('문장', 'EN-US')
+        assert balancer._keys[0].latency_seconds == MAX_LATENCY_SECONDS
+    finally:
+        await balancer.aclose()
+
+
+def test_deepl_api_keys_env_builds_a_balancer(monkeypatch):
+    from src.translation.registry import create_translator
+
+    monkeypatch.setenv('DEEPL_API_KEYS', 'key-one:fx, key-two:fx')
+    translator = create_translator('deepl')
+
+    assert isinstance(translator, DeeplKeyBalancer)
+    assert translator.key_labels == ['...-one', '...-two']
+    asyncio.run(translator.aclose())
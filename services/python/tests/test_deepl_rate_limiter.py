@@ -0,0 +1,94 @@
+"""Client-side AIMD rate limiter in front of DeepL.
+
+Requests are paced by a character token bucket and a concurrency limit; both
+probe upward while DeepL answers and are cut multiplicatively on 429/5xx so
+a throttled account is not hammered with the backlog.
+"""
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.deepL.deepL import DeeplError
+from src.translation.ratelimit import RateLimitedTranslator
+
+
+class CountingBackend:
+    def __init__(self, *, delay: float = 0.0, fail_with: Exception | None = None) -> None:
+        self.delay = delay
+        self.fail_with = fail_with
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def translate_batch(self, source_texts, target_language):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_with is not None:
+                raise self.fail_with
+            return [f'{target_language}::{text}' for text in source_texts]
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        return None
+
+
+async def test_in_flight_requests_are_capped_by_the_concurrency_limit():
+    backend = CountingBackend(delay=0.02)
+    limiter = RateLimitedTranslator(
+        backend, initial_concurrency=2, max_concurrency=2, max_chars_per_second=1e6)
+
+    results = await asyncio.gather(*(limiter.translate(f'문장{i}', 'EN-US') for i in range(8)))
+
+    assert results == [f'EN-US::문장{i}' for i in range(8)]
+    assert backend.peak_in_flight == 2
+    assert REGISTRY.get_sample_value('neemba_deepl_in_flight_requests') == 0.0
+
+
+async def test_throttling_cuts_both_limits_and_successes_probe_back_up():
+    backend = CountingBackend(fail_with=DeeplError(429, 'too many requests'))
+    limiter = RateLimitedTranslator(
+        backend, initial_concurrency=8, max_concurrency=8, max_chars_per_second=1000.0)
+    rate_before = limiter.chars_per_second
+
+    with pytest.raises(DeeplError):
+        await limiter.translate('문장', 'EN-US')
+
+    assert limiter.concurrency_limit == 4
+    assert limiter.chars_per_second == rate_before / 2
+    assert REGISTRY.get_sample_value('neemba_deepl_limiter_concurrency_limit') == 4.0
+
+    backend.fail_with = None
+    for _ in range(40):
+        await limiter.translate('문장', 'EN-US')
+
+    assert limiter.concurrency_limit == 8
+    assert limiter.chars_per_second == 1000.0
+
+
+async def test_non_throttle_errors_leave_the_limits_alone():
+    limiter = RateLimitedTranslator(
+        CountingBackend(fail_with=DeeplError(400, 'bad request')), initial_concurrency=4)
+
+    with pytest.raises(DeeplError):
+        await limiter.translate('문장', 'EN-US')
+
+    assert limiter.concurrency_limit == 4
+
+
+async def test_characters_are_paced_by_the_token_bucket():
+    before = REGISTRY.get_sample_value('neemba_deepl_characters_total') or 0.0
+    # Starts at half the ceiling: 100 chars/s with a 100-char bucket.
+    limiter = RateLimitedTranslator(
+        CountingBackend(), max_chars_per_second=200.0, min_chars_per_second=10.0)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    for _ in range(3):
+        await limiter.translate('가' * 50, 'EN-US')
+
+    # Two requests drain the bucket; the third waits for it to refill.
+    assert loop.time() - started >= 0.15
+    assert REGISTRY.get_sample_value('neemba_deepl_characters_total') == before + 150
@@ -0,0 +1,150 @@
+"""Multi-target-language fan-out per session.
+
+One session may declare several target languages: the text is split once,
+each sentence is translated per language, the primary language still reaches
+the hub slot client, and every language reaches the clients subscribed to it
+(``/ws?sessionId=&lang=``).
+"""
+import asyncio
+
+from src.ws.websocket import WebSocketHub
+from tests.test_separator_pipeline import eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+from tests.test_ws_disconnect_recovery import FakeWS, _drain, _teardown
+
+
+class LangPusher:
+    def __init__(self) -> None:
+        self.pushed: list[tuple[str, str, bool]] = []
+
+    async def push_to_client(self, push_text, sequence, *, source_text=None,
+                             session_id=None, segment_id=None, source_lang=None,
+                             target_lang=None, confidence=None, primary=True):
+        self.pushed.append((target_lang, push_text, primary))
+
+
+class LangTranslator:
+    async def translate(self, source_text, target_language):
+        return f'{target_language}::{source_text}'
+
+
+async def test_sentence_is_split_once_and_translated_per_language():
+    split_calls: list[str] = []
+
+    def counting_split(text: str) -> list[str]:
+        split_calls.append(text)
+        return simple_split(text)
+
+    pusher = LangPusher()
+    separator = make_separator(counting_split, translator=LangTranslator(), pusher=pusher)
+    separator.set_target_languages('session-1', ['en-US', 'zh', 'vi'])
+    await separator.start()
+    try:
+        await separator.offer(dto('환영합니다.', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+    finally:
+        await separator.stop()
+
+    assert split_calls == ['환영합니다.']
+    assert sorted(pusher.pushed) == [
+        ('en-US', 'en-US::환영합니다.', True),
+        ('vi', 'vi::환영합니다.', False),
+        ('zh', 'zh::환영합니다.', False),
+    ]
+
+
+async def test_stalled_extra_language_does_not_hold_back_the_primary():
+    release = asyncio.Event()
+
+    class StallingTranslator(LangTranslator):
+        async def translate(self, source_text, target_language):
+            if target_language == 'zh':
+                await release.wait()
+            return await super().translate(source_text, target_language)
+
+    pusher = LangPusher()
+    separator = make_separator(simple_split, translator=StallingTranslator(), pusher=pusher)
+    separator.set_target_languages('session-1', ['en-US', 'zh'])
+    await separator.start()
+    try:
+        await separator.offer(dto('하나입니다.', segment_id=1, sequence=1))
+        await separator.offer(dto(' 둘입니다.', segment_id=1, sequence=2))
+        # Each language keeps its own order: en-US flows while zh is stuck.
+        assert await eventually(lambda: pusher.pushed == [
+            ('en-US', 'en-US::하나입니다.', True),
+            ('en-US', 'en-US::둘입니다.', True),
+        ])
+
+        release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 4)
+    finally:
+        await separator.stop()
+
+    assert [text for lang, text, _ in pusher.pushed if lang == 'zh'] == [
+        'zh::하나입니다.', 'zh::둘입니다.']
+
+
+async def test_session_without_declared_languages_stays_single_target():
+    pusher = LangPusher()
+    separator = make_separator(simple_split, translator=LangTranslator(), pusher=pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('하나입니다.', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert pusher.pushed == [('en-US', 'en-US::하나입니다.', True)]
+
+
+async def test_hub_routes_each_language_to_its_subscribers():
+    hub = WebSocketHub()
+    slot, zh_client, vi_client = FakeWS(), FakeWS(), FakeWS()
+    await hub.attach(slot, 's1')
+    await hub.attach_subscriber(zh_client, 's1', 'zh')
+    await hub.attach_subscriber(vi_client, 's1', 'VI')
+    await _drain()
+    try:
+        await hub.broadcast_to_session('s1', {'sentence': 'Welcome.'}, target_lang='en-US')
+        await hub.broadcast_to_session('s1', {'sentence': '欢迎。'}, target_lang='zh', primary=False)
+        await hub.broadcast_to_session('s1', {'sentence': 'Chào mừng.'}, target_lang='vi', primary=False)
+        await _drain()
+
+        # The slot client keeps receiving only the primary language.
+        assert slot.sent == ['Welcome.']
+        assert zh_client.sent == ['欢迎。']
+        assert vi_client.sent == ['Chào mừng.']
+    finally:
+        await _teardown(hub)
+
+
+async def test_slot_detach_keeps_the_language_subscribers():
+    hub = WebSocketHub()
+    slot, zh_client = FakeWS(), FakeWS()
+    await hub.attach(slot, 's1')
+    await hub.attach_subscriber(zh_client, 's1', 'zh')
+    try:
+        # An error on the primary socket detaches the slot only.
+        await hub.detach('s1')
+        await hub.broadcast_to_session('s1', {'sentence': '欢迎。'}, target_lang='zh', primary=False)
+        await _drain()
+
+        assert zh_client.sent == ['欢迎。']
+    finally:
+        await _teardown(hub)
+
+
+async def test_subscribers_are_closed_when_the_session_stops():
+    hub = WebSocketHub()
+    slot, zh_client = FakeWS(), FakeWS()
+    await hub.attach(slot, 's1')
+    await hub.attach_subscriber(zh_client, 's1', 'zh')
+
+    await hub.detach('s1')
+    await hub.close_subscribers('s1')
+    await hub.broadcast_to_session('s1', {'sentence': '늦은 문장'}, target_lang='zh', primary=False)
+    await _drain()
+
+    assert zh_client.sent == []
+    assert hub._subscribers == {}
+    await _teardown(hub)
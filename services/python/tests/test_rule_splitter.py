@@ -0,0 +1,164 @@
+"""Rule-based fast path in front of KSS.
+
+Unambiguous buffers (plain terminal punctuation, nothing mid-sentence that
+could be a sentence-final ending) are split without a KSS call; the rest
+still go to KSS. The regression corpus pins the fast path's boundaries to
+what KSS itself returns, and must keep doing so as the rules grow.
+"""
+import pytest
+from prometheus_client import REGISTRY
+
+from src.separator.rule_splitter import split_unambiguous
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+# Sermon/STT-style text, plus inputs where KSS splits on a sentence-final
+# ending with no punctuation (those must stay on the KSS path).
+CORPUS = [
+    '안녕하세요.',
+    '감사합니다. 아멘.',
+    '오늘 우리가 함께 읽을 본문은',
+    '오늘 우리가 함께 읽을 본문은 요한복음 3장 16절 말씀입니다.',
+    '하나님이 세상을 이처럼 사랑하사 독생자를 주셨으니',
+    '이는 그를 믿는 자마다 멸망하지 않고 영생을 얻게 하려 하심이라.',
+    '여러분 기도하겠습니다.',
+    '정말요! 대단하네요.',
+    '이거 진짜야?',
+    '그게 무슨 뜻인가요? 다시 한번 설명해 주시겠어요?',
+    '안녕하세요 반갑습니다',
+    '밥 먹었어 너는',
+    '좋아요 그럼 가죠',
+    '그가 왔다 그리고 갔다',
+    '비가 오네 우산 챙겨',
+    '그래서 제가 말씀드린 거는 그런 거죠 알겠습니까',
+    '요한복음 3. 16절',
+    '그래서... 우리가',
+    '그는 "좋다"고 말했다.',
+    '바다 위에 배가 떠 있다',
+    '한 개 두 개 세 개',
+    '우리는 모두 주님의 은혜로 살아갑니다.',
+    '지난주에 말씀드린 것처럼',
+    '교회에서 봉사하시는 분들께 감사드립니다. 다음 주에도 함께해요.',
+    '성경 말씀을 읽겠습니다.',
+    '3시에 모임이 있습니다.',
+    '우리 함께 찬양합시다! 할렐루야!',
+    '이제 마지막으로 광고를 전해 드리겠습니다.',
+    '혹시 질문 있으신 분',
+    '그 말을 듣고 제자들이 놀랐습니다. 예수께서 말씀하셨습니다.',
+    '사랑하는 성도 여러분,',
+    '사랑하는 성도 여러분, 오늘도 평안하셨습니까?',
+    '주님께서 우리에게 주신 사명을 기억합시다.',
+    '우리가 어디로 가야 할지',
+    '믿음 소망 사랑 그중에 제일은 사랑이라.',
+    '이 땅에 평화가 있기를 원합니다.',
+    '그러므로 우리는',
+    '헌금 시간입니다. 찬송가 405장을 부르겠습니다.',
+    '먼저 대표 기도가 있겠습니다.',
+    '오늘 설교 제목은 참된 안식입니다.',
+    '아버지 집에는 거할 곳이 많도다.',
+    '그 사람이 그랬어 그래서 내가 갔지',
+    '너 어디 가 지금',
+    '그것을 보았음 그리고 기록함',
+    '이제 시작할게요.',
+    '네 알겠습니다.',
+    '예 맞아요 그렇습니다.',
+    '그가 좋다고 했어요.',
+    '밥을 먹고 갔어요',
+    '했다고 그가 말했다',
+    '저는 교회에서 일해요',
+    '우리 서로 사랑합시다.',
+    '여기 서 있는 사람들과 함께',
+    '예수께서 제자들과 함께 가셨습니다.',
+    '이제 다시 시작하겠습니다. 모두 일어나 주세요.',
+    '너 정말 왔어 여기',
+    '그거 좋다 정말',
+    '혹시 이거 보셨어요?',
+    '아마 내일 비가 올 거예요.',
+    '주께서 우리와 함께하십니다.',
+    '저희 교회는 매주 일요일 11시에 예배를 드립니다.',
+    '우리가 먹고 마시고 누리는 모든 것이',
+    '오직 믿음으로 구원을 받습니다.',
+    '어디서 왔니 너는',
+    '그래 가고 싶으면 가',
+    '나 지금 간다 기다려',
+    '내가 갔거든 근데',
+    '그게 무엇인가 우리는 모른다',
+    '갔다면서 우리는',
+    '했습니다만 우리는',
+    '그랬군 우리는',
+    '그는 떠났고 우리는 남았다',
+    '좋았지만 우리는',
+    '했나 우리는',
+    '하겠습니다 이제 우리는',
+    '있습니다 여러분',
+    '네가 했잖아 그거',
+    '뭐야 그게',
+    '있잖아 우리',
+    '그럴걸 아마',
+]
+
+
+@pytest.fixture(scope='module')
+def kss():
+    from kss import Kss  # type: ignore
+
+    return Kss('split_sentences')
+
+
+def test_fast_path_boundaries_match_kss(kss):
+    decided = 0
+    for text in CORPUS:
+        sentences = split_unambiguous(text)
+        if sentences is None:
+            continue
+        decided += 1
+        assert sentences == kss(text), text
+    # The fast path has to actually take a good share of plain text.
+    assert decided >= len(CORPUS) // 3
+
+
+@pytest.mark.parametrize('text', [
+    '밥 먹었어 너는',  # ending without punctuation
+    '요한복음 3. 16절',  # '.' after a digit
+    '그래서... 우리가',  # ellipsis
+    '그는 "좋다"고 말했다.',  # quotes
+    '감사합니다.아멘.',  # no space after '.'
+    'Thank you. 감사합니다.',
+    '   ',
+])
+def test_ambiguous_text_goes_to_kss(text):
+    assert split_unambiguous(text) is None
+
+
+def test_fast_path_strips_like_kss():
+    assert split_unambiguous(' 감사합니다.  아멘! 오늘 우리가 ') == ['감사합니다.', '아멘!', '오늘 우리가']
+
+
+def count(path):
+    return REGISTRY.get_sample_value('neemba_split_path_total', {'path': path}) or 0.0
+
+
+async def test_separator_only_calls_kss_for_ambiguous_buffers():
+    calls = []
+
+    def splitter(text):
+        calls.append(text)
+        return simple_split(text)
+
+    pusher = FakePusher()
+    separator = make_separator(splitter, pusher=pusher)
+    separator._fast_path_split = True
+    fast_before, kss_before = count('fast'), count('kss')
+    await separator.start()
+    try:
+        await separator.offer(dto('감사합니다. 아멘.', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 2)
+        await separator.offer(dto('밥 먹었어 너는.', segment_id=2, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+    finally:
+        await separator.stop()
+
+    assert calls == ['밥 먹었어 너는.']
+    assert pusher.sources() == ['감사합니다.', '아멘.', '밥 먹었어 너는.']
+    assert count('fast') == fast_before + 1
+    assert count('kss') == kss_before + 1
@@ -0,0 +1,82 @@
+"""Single-pass sentence-ending matcher: same answers as the regex version.
+
+``_is_sentence_closed`` used to run up to 18 uncompiled ``re.search`` calls
+per flush. The precomputed-suffix version must agree with it on every input;
+the original is kept here verbatim as the reference.
+"""
+import itertools
+import random
+import re
+
+import pytest
+
+from src.separator.kss_separator import _CLOSING_SUFFIXES, _is_sentence_closed
+
+
+def reference_is_sentence_closed(text: str) -> bool:
+    text = text.strip()
+    if not text:
+        return False
+    if re.search(r'[\.!\?…]\s*$', text):
+        return True
+    endings = [
+        r'[다요죠네]\s*$', r'어요\s*$', r'아요\s*$', r'는데요\s*$', r'은데요\s*$',
+        r'습니다\s*$', r'습니까\s*$', r'지요\s*$', r'게요\s*$', r'을게요\s*$',
+        r'을까요\s*$', r'으니까요\s*$', r'네요\s*$', r'인데요\s*$', r'래요\s*$',
+        r'거예요\s*$', r'니다\s*$',
+    ]
+    return any(re.search(ending, text) for ending in endings)
+
+
+KOREAN_CORPUS = [
+    '오늘 예배에 오신 여러분을 환영합니다',
+    '하나님께서 세상을 이처럼 사랑하사',
+    '함께 기도하시겠습니까',
+    '말씀을 읽겠습니다.',
+    '여러분 안녕하세요',
+    '정말 은혜로운 시간이었죠',
+    '이 찬양을 함께 부르면 좋겠네',
+    '다음 주에 다시 만나요!',
+    '왜 그랬을까?',
+    '그리고 그 다음에…',
+    '요한복음 3장 16절',
+    '오늘 우리가 함께 읽을 본문은',
+    '그래서 우리는',
+    '감사합니다 ',
+    '  아멘\n',
+    '주님께서 말씀하시기를\t',
+    '그렇게 할게요',
+    '제가 먼저 할까요',
+    '바로 그거예요',
+    '좋은 날이었는데요',
+    '이번 주 광고입니다　',
+    '헌금 시간이 있겠습',
+    '축도',
+    '',
+    '   ',
+    '.',
+    'Amen.',
+    'Praise the Lord',
+    '3장',
+    '예배 순서 안내',
+]
+
+
+@pytest.mark.parametrize('text', KOREAN_CORPUS)
+def test_matches_the_regex_implementation_on_the_corpus(text):
+    assert _is_sentence_closed(text) == reference_is_sentence_closed(text)
+
+
+def test_matches_the_regex_implementation_on_generated_tails():
+    # Every corpus line × every short tail built from ending-relevant
+    # characters and whitespace.
+    alphabet = ['다', '요', '죠', '네', '까', '습', '니', '어', '.', '!', '?', '…', ' ', '\n', '가']
+    tails = [''.join(p) for n in range(4) for p in itertools.product(alphabet, repeat=n)]
+    rng = random.Random(12)
+    for tail in tails:
+        text = rng.choice(KOREAN_CORPUS) + tail
+        assert _is_sentence_closed(text) == reference_is_sentence_closed(text), repr(text)
+
+
+def test_redundant_endings_are_folded_away():
+    assert set(_CLOSING_SUFFIXES) == {'.', '!', '?', '…', '다', '요', '죠', '네', '습니까'}
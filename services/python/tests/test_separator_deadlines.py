@@ -0,0 +1,89 @@
+"""Deadline-driven timeout flushes: the sweeper sleeps until the next real
+flush/speculation deadline instead of scanning every segment on a fixed
+interval."""
+import asyncio
+
+from src.separator.scheduler import TimerHeap
+from tests.test_separator_pipeline import FakePusher, eventually
+from tests.test_separator_segments import dto
+from tests.test_separator_timeout import make_separator
+
+
+async def test_timer_heap_serves_the_earliest_deadline_first():
+    timers: TimerHeap[str] = TimerHeap(resolution=0)
+    now = asyncio.get_running_loop().time()
+    timers.arm('late', now + 0.05, 'late')
+    timers.arm('early', now + 0.01, 'early')
+    timers.arm('cancelled', now, 'cancelled')
+    timers.cancel('cancelled')
+
+    assert await asyncio.wait_for(timers.next_due(), 1) == [('early', 'early')]
+    assert await asyncio.wait_for(timers.next_due(), 1) == [('late', 'late')]
+    assert len(timers) == 0
+
+
+async def test_neighbouring_deadlines_share_one_wakeup():
+    timers: TimerHeap[str] = TimerHeap(resolution=0.05)
+    now = asyncio.get_running_loop().time()
+    timers.arm('a', now + 0.01, 'a')
+    timers.arm('b', now + 0.03, 'b')
+
+    assert await asyncio.wait_for(timers.next_due(), 1) == [('a', 'a'), ('b', 'b')]
+
+
+async def test_rearming_later_keeps_the_armed_deadline():
+    timers: TimerHeap[str] = TimerHeap(resolution=0)
+    now = asyncio.get_running_loop().time()
+    timers.arm('segment', now + 0.01, 'v1')
+    # Text arrived: the owner re-checks the real deadline when this fires.
+    timers.arm('segment', now + 10, 'v2')
+
+    assert await asyncio.wait_for(timers.next_due(), 1) == [('segment', 'v1')]
+
+
+async def test_an_earlier_deadline_wakes_a_sleeping_waiter():
+    timers: TimerHeap[str] = TimerHeap(resolution=0)
+    now = asyncio.get_running_loop().time()
+    timers.arm('far', now + 60, 'far')
+    waiter = asyncio.create_task(timers.next_due())
+    await asyncio.sleep(0.01)
+
+    timers.arm('near', now, 'near')
+
+    assert await asyncio.wait_for(waiter, 1) == [('near', 'near')]
+
+
+async def test_text_arriving_pushes_the_timeout_flush_back():
+    pusher = FakePusher()
+    separator = make_separator(timeout=0.3, pusher=pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('미완성', segment_id=1, sequence=1))
+        await asyncio.sleep(0.2)
+        await separator.offer(dto(' 문장', segment_id=1, sequence=2))
+        # The first delta's deadline passes without a flush...
+        await asyncio.sleep(0.15)
+        assert pusher.pushed == []
+        # ...the flush follows one timeout after the last delta.
+        assert await eventually(lambda: pusher.sources() == ['미완성 문장'])
+    finally:
+        await separator.stop()
+
+
+async def test_flushed_and_closed_segments_leave_no_timers():
+    pusher = FakePusher()
+    separator = make_separator(timeout=0.1, pusher=pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('끝난 문장입니다.', segment_id=1, sequence=1))
+        await separator.offer(dto('미완성', segment_id=1, sequence=1, session_id='idle'))
+        await separator.offer(dto('세션 종료 미완성', segment_id=1, sequence=1, session_id='other'))
+        assert await eventually(lambda: len(separator.state_by_key) == 3)
+        await separator.close_session('other')
+
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+        # Only the idle timer of each live lane is left ('other' is retired).
+        assert await eventually(lambda: len(separator._timers) == 2)
+        assert sorted(separator._lanes) == ['idle', 'session-1']
+    finally:
+        await separator.stop()
@@ -0,0 +1,85 @@
+"""Dirty-set flush scheduling: a segment is queued for a flush at most once,
+and every delta that arrives before that flush runs is merged into it."""
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from src.separator.scheduler import DirtySet
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+class Item:
+    pass
+
+
+async def test_marking_a_dirty_item_again_is_a_no_op():
+    dirty: DirtySet[Item] = DirtySet()
+    a, b = Item(), Item()
+
+    assert dirty.mark(a) is True
+    assert dirty.mark(b) is True
+    assert dirty.mark(a) is False
+
+    assert await dirty.drain() == [a, b]
+    assert len(dirty) == 0
+    # Dirty again after its flush started: back in the run queue.
+    assert dirty.mark(a) is True
+    assert a in dirty
+
+
+async def test_drain_waits_for_the_first_mark():
+    dirty: DirtySet[Item] = DirtySet()
+    item = Item()
+    drain = asyncio.create_task(dirty.drain())
+    await asyncio.sleep(0.01)
+    assert not drain.done()
+
+    dirty.mark(item)
+
+    assert await asyncio.wait_for(drain, 1) == [item]
+
+
+SYLLABLES = list('가나다라마바사아자차카타파하거너더러머')
+
+
+def coalesced(suffix):
+    return REGISTRY.get_sample_value(f'neemba_separator_coalesced_deltas_{suffix}') or 0.0
+
+
+async def test_a_burst_of_deltas_is_flushed_once():
+    class GatedBackend:
+        def __init__(self) -> None:
+            self.inputs: list[str] = []
+            self.release = asyncio.Event()
+
+        async def split(self, text):
+            self.inputs.append(text)
+            await self.release.wait()
+            return simple_split(text)
+
+    backend, pusher = GatedBackend(), FakePusher()
+    separator = make_separator(simple_split, pusher=pusher)
+    separator.split_backend = backend
+    flushes_before, deltas_before = coalesced('count'), coalesced('sum')
+    await separator.start()
+    try:
+        await separator.offer(dto('첫', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(backend.inputs) == 1)
+        # 20 more deltas while the first flush is still splitting.
+        for i, syllable in enumerate(SYLLABLES, start=2):
+            await separator.offer(dto(syllable, segment_id=1, sequence=i))
+        await separator.offer(dto('.', segment_id=1, sequence=21))
+        lane = separator._lanes['session-1']
+        assert await eventually(lambda: lane.queue.empty())
+        assert len(lane.dirty) == 1
+
+        backend.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert len(backend.inputs) == 2
+    assert pusher.sources() == ['첫' + ''.join(SYLLABLES) + '.']
+    assert coalesced('count') == flushes_before + 2
+    assert coalesced('sum') == deltas_before + 21
@@ -0,0 +1,75 @@
+"""Incremental splitting: only the unconfirmed tail goes back through KSS.
+
+Each flush used to hand KSS the whole buffer, so a long unpunctuated
+monologue was re-split from scratch on every STT delta (quadratic). The
+separator now remembers how much of the unfinished tail KSS already checked
+and re-examines at most ``split_lookback_chars`` of it.
+"""
+import asyncio
+
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+WORDS = ['오늘', '우리가', '함께', '읽을', '본문은', '요한복음', '삼장', '십육절', '말씀']
+
+
+class RecordingSplitter:
+    def __init__(self) -> None:
+        self.inputs: list[str] = []
+
+    def __call__(self, text: str) -> list[str]:
+        self.inputs.append(text)
+        return simple_split(text)
+
+
+async def feed(separator, splitter, deltas):
+    """Offer one delta at a time, waiting for its flush."""
+    for i, delta in enumerate(deltas, start=1):
+        await separator.offer(dto(delta, segment_id=1, sequence=i))
+        assert await eventually(lambda i=i: len(splitter.inputs) == i)
+        # Let _flush merge the tail back before the next delta arrives.
+        await asyncio.sleep(0.01)
+
+
+async def test_split_input_stays_bounded_while_the_tail_grows():
+    splitter, pusher = RecordingSplitter(), FakePusher()
+    separator = make_separator(splitter, pusher=pusher)
+    separator._split_lookback = 16
+    deltas = [WORDS[0]] + [f' {WORDS[i % len(WORDS)]}' for i in range(1, 200)] + ['.']
+    await separator.start()
+    try:
+        await feed(separator, splitter, deltas)
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert len(''.join(deltas)) > 700
+    # lookback + one delta + the word straddling the cut.
+    assert max(len(text) for text in splitter.inputs[-50:]) <= 16 + 2 * 5
+    assert pusher.sources() == [''.join(deltas)]
+
+
+async def test_incremental_split_emits_the_same_sentences_as_a_full_split():
+    text = ('오늘 우리가 함께 읽을 본문은 요한복음 삼장 십육절 말씀입니다. 하나님이 세상을 '
+            '이처럼 사랑하사 독생자를 주셨으니 이는 그를 믿는 자마다 멸망하지 않고 영생을 '
+            '얻게 하려 하심이라. 아멘.')
+    deltas = [text[i:i + 7] for i in range(0, len(text), 7)]
+    deltas = [d for d in deltas if d.strip()]
+
+    async def run(lookback):
+        splitter, pusher = RecordingSplitter(), FakePusher()
+        separator = make_separator(splitter, pusher=pusher)
+        separator._split_lookback = lookback
+        await separator.start()
+        try:
+            await feed(separator, splitter, deltas)
+            assert await eventually(lambda: pusher.sources()[-1:] == ['아멘.'])
+        finally:
+            await separator.stop()
+        return pusher.sources(), sum(len(t) for t in splitter.inputs)
+
+    full, full_chars = await run(10**9)
+    incremental, incremental_chars = await run(8)
+
+    assert incremental == full
+    assert incremental_chars < full_chars
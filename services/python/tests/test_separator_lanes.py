@@ -0,0 +1,168 @@
+"""Per-session separator lanes.
+
+Every session used to share one input queue, one flush run queue and one
+store/flush task, so a chatty session delayed everyone and a stuck split
+blocked all sessions. Each session now gets its own store → split lane,
+created on its first message and retired by ``close_session`` (or after an
+idle TTL, when the client left without a stop); the shared translation
+workers take sentences from the sessions round-robin.
+"""
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from src.separator.scheduler import RoundRobinQueue
+from tests.test_separator_pipeline import FakePusher, eventually, simple_split
+from tests.test_separator_segments import dto
+from tests.test_translation_workers import make_separator
+
+
+class RecordingTranslator:
+    """Records call order; the first call waits for ``release``."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.release = asyncio.Event()
+
+    async def translate(self, source_text, target_language):
+        self.calls.append(source_text)
+        if len(self.calls) == 1:
+            await self.release.wait()
+        return f'EN::{source_text}'
+
+
+def depth(session, stage):
+    return REGISTRY.get_sample_value(
+        'neemba_separator_lane_depth', {'session': session, 'stage': stage})
+
+
+def test_round_robin_queue_serves_one_item_per_key_per_turn():
+    queue: RoundRobinQueue[str, str] = RoundRobinQueue()
+    for item in ('a1', 'a2', 'a3'):
+        queue.put_nowait('a', item)
+    queue.put_nowait('b', 'b1')
+
+    assert queue.qsize('a') == 3 and queue.qsize() == 4
+    assert [queue.get_nowait() for _ in range(4)] == ['a1', 'b1', 'a2', 'a3']
+    assert queue.empty()
+
+
+async def test_a_stuck_split_only_blocks_its_own_session():
+    class StuckBackend:
+        async def split(self, text):
+            if 'stuck' in text:
+                await asyncio.Event().wait()
+            return simple_split(text)
+
+    pusher = FakePusher()
+    separator = make_separator(RecordingTranslator(), pusher, workers=2)
+    separator.translator.release.set()
+    separator.split_backend = StuckBackend()
+    await separator.start()
+    try:
+        await separator.offer(dto('stuck 문장.', segment_id=1, sequence=1, session_id='stuck'))
+        await separator.offer(dto('다른 세션.', segment_id=1, sequence=1, session_id='live'))
+
+        assert await eventually(lambda: pusher.sources() == ['다른 세션.'])
+    finally:
+        await separator.stop()
+
+
+async def test_a_chatty_session_does_not_queue_ahead_of_others():
+    translator, pusher = RecordingTranslator(), FakePusher()
+    separator = make_separator(translator, pusher, workers=1)
+    await separator.start()
+    try:
+        await separator.offer(dto('가. 나. 다. 라. 마. 바.', segment_id=1, sequence=1, session_id='chatty'))
+        assert await eventually(lambda: translator.calls == ['가.'])
+        await separator.offer(dto('조용한 세션.', segment_id=1, sequence=1, session_id='quiet'))
+        assert await eventually(lambda: separator.sentence_queue.qsize('quiet') == 1)
+
+        translator.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 7)
+    finally:
+        await separator.stop()
+
+    # Served right after the chatty session's next sentence, not after all five.
+    assert translator.calls.index('조용한 세션.') == 2
+
+
+async def test_close_session_retires_the_lane():
+    translator, pusher = RecordingTranslator(), FakePusher()
+    translator.release.set()
+    separator = make_separator(translator, pusher, workers=1)
+    await separator.start()
+    try:
+        await separator.offer(dto('끝나지 않은', segment_id=1, sequence=1, session_id='closing'))
+        assert await eventually(lambda: depth('closing', 'input') is not None)
+        lane = separator._lanes['closing']
+
+        await separator.close_session('closing')
+
+        assert await eventually(lambda: pusher.sources() == ['끝나지 않은'])
+        assert await eventually(lambda: all(task.done() for task in lane.tasks))
+        assert 'closing' not in separator._lanes
+        assert depth('closing', 'input') is None
+        # A new message for the same session opens a fresh lane.
+        await separator.offer(dto('다시 시작.', segment_id=2, sequence=1, session_id='closing'))
+        assert await eventually(lambda: pusher.sources()[-1] == '다시 시작.')
+        assert separator._lanes['closing'] is not lane
+    finally:
+        await separator.stop()
+
+
+async def test_offer_racing_close_session_does_not_leak_a_lane():
+    translator, pusher = RecordingTranslator(), FakePusher()
+    translator.release.set()
+    separator = make_separator(translator, pusher, workers=1)
+    dropped = REGISTRY.get_sample_value('neemba_separator_dropped_deltas_total') or 0.0
+    await separator.start()
+    try:
+        await separator.offer(dto('마지막 말', segment_id=1, sequence=1, session_id='racing'))
+        lane = separator._lanes['racing']
+
+        # The late delta lands while the lane is still closing.
+        await asyncio.gather(
+            separator.close_session('racing'),
+            separator.offer(dto(' 늦은 말', segment_id=1, sequence=2, session_id='racing')))
+
+        assert await eventually(lambda: 'racing' not in separator._lanes)
+        assert all(task.done() for task in lane.tasks)
+        assert await eventually(lambda: pusher.sources() == ['마지막 말'])
+        assert not any(key[0] == 'racing' for key in separator.state_by_key)
+        assert len(separator._timers) == 0
+        assert depth('racing', 'input') is None
+        assert REGISTRY.get_sample_value('neemba_separator_dropped_deltas_total') == dropped + 1
+    finally:
+        await separator.stop()
+
+
+async def test_idle_lane_is_retired_without_a_stop():
+    retired = REGISTRY.get_sample_value('neemba_separator_idle_lanes_retired_total') or 0.0
+    translator, pusher = RecordingTranslator(), FakePusher()
+    translator.release.set()
+    separator = make_separator(translator, pusher, workers=1)
+    separator._flush_timeout = 0.1
+    separator._lane_idle = 0.3
+    await separator.start()
+    try:
+        # The client vanishes mid-sentence and never sends a stop.
+        await separator.offer(dto('끝나지 않은', segment_id=1, sequence=1, session_id='gone'))
+        lane = separator._lanes['gone']
+
+        # The tail still goes out on its flush timeout, then the lane goes.
+        assert await eventually(lambda: 'gone' not in separator._lanes)
+        assert pusher.sources() == ['끝나지 않은']
+        assert await eventually(lambda: all(task.done() for task in lane.tasks))
+        assert not any(key[0] == 'gone' for key in separator.state_by_key)
+        assert not any(key[0] == 'gone' for key in separator._reorder)
+        assert len(separator._timers) == 0
+        assert depth('gone', 'input') is None
+        assert REGISTRY.get_sample_value('neemba_separator_idle_lanes_retired_total') == retired + 1
+
+        # A returning client opens a fresh lane.
+        await separator.offer(dto('돌아왔습니다.', segment_id=2, sequence=1, session_id='gone'))
+        assert await eventually(lambda: pusher.sources()[-1] == '돌아왔습니다.')
+        assert separator._lanes['gone'] is not lane
+    finally:
+        await separator.stop()
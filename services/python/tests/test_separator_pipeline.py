@@ -36,7 +36,7 @@ class FakePusher:
 
     async def push_to_client(self, push_text, sequence, *, source_text=None,
                              session_id=None, segment_id=None, source_lang=None,
-                             target_lang=None, confidence=None):
+                             target_lang=None, confidence=None, primary=True):
         self.pushed.append((source_text, push_text))
 
     def sources(self) -> list[str | None]:
@@ -44,7 +44,7 @@ class FakePusher:
 
 
 class FakeTranslator:
-    def translate(self, source_text, target_language):
+    async def translate(self, source_text, target_language):
         return f'EN::{source_text}'
 
 
@@ -54,7 +54,7 @@ class FlakyTranslator:
     def __init__(self) -> None:
         self.calls = 0
 
-    def translate(self, source_text, target_language):
+    async def translate(self, source_text, target_language):
         self.calls += 1
         if self.calls == 1:
             raise RuntimeError('deepl boom')
@@ -0,0 +1,160 @@
+"""Speculative translation of the unfinished buffer tail.
+
+Without it the last, unclosed sentence waits for a closing ending or the
+flush timeout before DeepL is even called. In speculative mode an idle tail
+is translated early; when it is finalized unchanged the result is reused,
+otherwise the early translation is discarded (and counted as waste).
+"""
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.separator.kss_separator import PendingSentence
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+class RecordingTranslator:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def translate(self, source_text, target_language):
+        self.calls.append(source_text)
+        return f'EN::{source_text}'
+
+
+def speculations(outcome: str) -> float:
+    return REGISTRY.get_sample_value(
+        'neemba_translation_speculations_total', {'outcome': outcome}) or 0.0
+
+
+def wasted_chars() -> float:
+    return REGISTRY.get_sample_value(
+        'neemba_translation_speculation_wasted_characters_total') or 0.0
+
+
+def speculative_separator(translator, pusher, *, enabled=True):
+    separator = make_separator(simple_split, translator=translator, pusher=pusher)
+    separator._speculative = enabled
+    separator._speculation_idle = 0.05
+    separator._flush_timeout = 0.4
+    return separator
+
+
+async def test_idle_tail_is_translated_early_and_reused_when_finalized():
+    hits = speculations('hit')
+    translator, pusher = RecordingTranslator(), FakePusher()
+    separator = speculative_separator(translator, pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('오늘 우리가 함께 읽을 본문은', segment_id=1, sequence=1))
+        # Translated while the sentence is still open...
+        assert await eventually(lambda: translator.calls == ['오늘 우리가 함께 읽을 본문은'])
+        assert pusher.pushed == []
+        # ...and delivered from that result once the timeout finalizes it.
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert translator.calls == ['오늘 우리가 함께 읽을 본문은']
+    assert pusher.pushed == [('오늘 우리가 함께 읽을 본문은', 'EN::오늘 우리가 함께 읽을 본문은')]
+    assert speculations('hit') == hits + 1
+    assert separator._speculations == {}
+
+
+class FailingOnceTranslator(RecordingTranslator):
+    async def translate(self, source_text, target_language):
+        if not self.calls:
+            self.calls.append(source_text)
+            raise ConnectionError('blip')
+        return await super().translate(source_text, target_language)
+
+
+async def test_failed_speculation_is_not_counted_as_a_hit():
+    hits, failed = speculations('hit'), speculations('failed')
+    translator, pusher = FailingOnceTranslator(), FakePusher()
+    separator = speculative_separator(translator, pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('오늘 우리가 함께 읽을 본문은', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    # The finalized sentence was translated again instead.
+    assert len(translator.calls) == 2
+    assert speculations('hit') == hits
+    assert speculations('failed') == failed + 1
+
+
+async def test_cancelled_worker_does_not_translate_afresh():
+    class SlowTranslator(RecordingTranslator):
+        async def translate(self, source_text, target_language):
+            self.calls.append(source_text)
+            await asyncio.sleep(1)
+            return f'EN::{source_text}'
+
+    translator = SlowTranslator()
+    separator = speculative_separator(translator, FakePusher())
+    text = '오늘 우리가 함께 읽을 본문은'
+    speculation = asyncio.create_task(translator.translate(text, 'en-US'))
+    item = PendingSentence(
+        source_text=text, session_id='session-1', segment_id=1, sequence=1,
+        source_lang='ko', target_lang='en-US', confidence=1.0,
+        deadline=asyncio.get_running_loop().time() + 5, speculation=speculation)
+    worker = asyncio.create_task(separator._translate(item))
+    await asyncio.sleep(0.01)
+
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+    # Cancelled along with the worker, no second DeepL call.
+    assert speculation.cancelled()
+    assert translator.calls == [text]
+
+
+async def test_changed_tail_discards_the_speculation():
+    discarded, wasted = speculations('discarded'), wasted_chars()
+    translator, pusher = RecordingTranslator(), FakePusher()
+    separator = speculative_separator(translator, pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('오늘 우리가 함께 읽을 본문은', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(translator.calls) == 1)
+
+        await separator.offer(dto(' 요한복음 3장.', segment_id=1, sequence=2))
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
+
+    assert pusher.pushed == [('오늘 우리가 함께 읽을 본문은 요한복음 3장.',
+                              'EN::오늘 우리가 함께 읽을 본문은 요한복음 3장.')]
+    assert speculations('discarded') == discarded + 1
+    assert wasted_chars() == wasted + len('오늘 우리가 함께 읽을 본문은')
+
+
+async def test_short_tails_are_not_speculated():
+    translator, pusher = RecordingTranslator(), FakePusher()
+    separator = speculative_separator(translator, pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('아멘', segment_id=1, sequence=1))
+        await asyncio.sleep(0.2)
+        assert translator.calls == []
+    finally:
+        await separator.stop()
+
+
+async def test_speculation_is_off_by_default():
+    translator, pusher = RecordingTranslator(), FakePusher()
+    separator = speculative_separator(translator, pusher, enabled=False)
+    await separator.start()
+    try:
+        await separator.offer(dto('오늘 우리가 함께 읽을 본문은', segment_id=1, sequence=1))
+        await asyncio.sleep(0.2)
+        assert translator.calls == []
+        assert await eventually(lambda: len(pusher.pushed) == 1)
+    finally:
+        await separator.stop()
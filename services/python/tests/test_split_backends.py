@@ -0,0 +1,126 @@
+"""KSS splitting backends: default thread pool vs warm worker processes.
+
+The process backend loads the splitter once per worker at startup, batches
+split jobs from several segments into one round-trip, and exports
+queue-wait / split-duration histograms like the thread backend.
+"""
+import asyncio
+import os
+import signal
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.separator.split_backends import ProcessPoolSplitter, split_in_thread
+
+
+def period_split(text: str) -> list[str]:
+    if 'boom' in text:
+        raise ValueError('exploded')
+    return [part.strip() + '.' for part in text.split('.') if part.strip()]
+
+
+def period_splitter_factory():
+    # Runs inside each worker process (must be importable there).
+    return period_split
+
+
+def count(name, **labels):
+    return REGISTRY.get_sample_value(name, labels or None) or 0.0
+
+
+@pytest.fixture
+async def pool():
+    splitter = ProcessPoolSplitter(
+        workers=2, batch_window_seconds=0.01, splitter_factory=period_splitter_factory)
+    await splitter.start()
+    try:
+        yield splitter
+    finally:
+        await splitter.aclose()
+
+
+async def test_process_backend_splits_in_worker_processes(pool):
+    assert await pool.split('첫 문장. 둘째 문장.') == ['첫 문장.', '둘째 문장.']
+
+
+async def test_concurrent_jobs_share_one_round_trip(pool):
+    batches_before = count('neemba_split_batch_size_count')
+    waits_before = count('neemba_split_queue_wait_seconds_count', backend='process')
+
+    results = await asyncio.gather(*(pool.split(f'세그먼트 {i}.') for i in range(3)))
+
+    assert results == [['세그먼트 0.'], ['세그먼트 1.'], ['세그먼트 2.']]
+    assert count('neemba_split_batch_size_count') == batches_before + 1
+    assert count('neemba_split_batch_size_sum') >= 3
+    assert count('neemba_split_queue_wait_seconds_count', backend='process') == waits_before + 3
+
+
+async def test_worker_errors_reach_the_caller(pool):
+    with pytest.raises(ValueError, match='exploded'):
+        await pool.split('boom.')
+    # The pool survives a failed job.
+    assert await pool.split('다시.') == ['다시.']
+
+
+async def test_dead_worker_is_replaced_and_the_batch_retried(pool):
+    restarts = count('neemba_split_pool_restarts_total')
+    broken = pool._executor
+    for process in list(broken._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+
+    assert await pool.split('살아난 문장.') == ['살아난 문장.']
+    assert pool._executor is not broken
+    assert count('neemba_split_pool_restarts_total') == restarts + 1
+
+
+async def test_thread_backend_records_the_same_histograms():
+    before = count('neemba_split_duration_seconds_count', backend='thread')
+
+    assert await split_in_thread(period_split, '하나. 둘.') == ['하나.', '둘.']
+
+    assert count('neemba_split_duration_seconds_count', backend='thread') == before + 1
+
+
+async def test_separator_splits_dirty_segments_together():
+    from tests.test_separator_pipeline import FakePusher, eventually, make_separator
+
+    class GatedBackend:
+        """Holds every split until released, recording how many overlap."""
+
+        def __init__(self) -> None:
+            self.release = asyncio.Event()
+            self.waiting = 0
+            self.peak = 0
+
+        async def split(self, text):
+            self.waiting += 1
+            self.peak = max(self.peak, self.waiting)
+            await self.release.wait()
+            self.waiting -= 1
+            return period_split(text)
+
+    backend, pusher = GatedBackend(), FakePusher()
+    separator = make_separator(period_split, pusher=pusher)
+    separator.split_backend = backend
+    await separator.start()
+    try:
+        # Queue three segments before the flush loop gets to run.
+        for segment in (1, 2, 3):
+            separator._lane('session-1').dirty.mark(
+                separator.state_by_key.setdefault(('session-1', segment), _state(segment)))
+        assert await eventually(lambda: backend.waiting == 3)
+        backend.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+    finally:
+        await separator.stop()
+
+    assert backend.peak == 3
+    assert sorted(pusher.sources()) == ['세그먼트 1.', '세그먼트 2.', '세그먼트 3.']
+
+
+def _state(segment: int):
+    from src.separator.kss_separator import SegmentState
+
+    return SegmentState(buffer=f'세그먼트 {segment}.', session_id='session-1',
+                        segment_id=segment, sequence=1, target_lang='en-US')
@@ -0,0 +1,117 @@
+"""Micro-batched DeepL requests from the sentence queue.
+
+A burst of sentences out of one KSS split used to cost one DeepL request per
+sentence. ``_push_loop`` now gathers the burst (batch window / max size) and
+translates it concurrently; :class:`BatchingTranslator` folds the
+same-language calls into one ``translate_batch`` request and the results are
+pushed back out in order.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.deepL.deepL import DeeplTranslationService
+from src.translation.batcher import BatchingTranslator
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+class RecordingBatchTranslator:
+    def __init__(self, fail: bool = False) -> None:
+        self.batches: list[tuple[list[str], str]] = []
+        self._fail = fail
+
+    async def translate(self, source_text, target_language):
+        return (await self.translate_batch([source_text], target_language))[0]
+
+    async def translate_batch(self, source_texts, target_language):
+        self.batches.append((list(source_texts), target_language))
+        if self._fail:
+            raise RuntimeError('boom')
+        await asyncio.sleep(0)
+        return [f'{target_language}::{text}' for text in source_texts]
+
+    async def aclose(self) -> None: ...
+
+
+async def test_concurrent_calls_share_one_request_per_language():
+    inner = RecordingBatchTranslator()
+    batcher = BatchingTranslator(inner, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.translate('하나', 'en-US'),
+        batcher.translate('둘', 'zh'),
+        batcher.translate('셋', 'en-US'),
+    )
+
+    assert results == ['en-US::하나', 'zh::둘', 'en-US::셋']
+    assert {lang: texts for texts, lang in inner.batches} == {'en-US': ['하나', '셋'], 'zh': ['둘']}
+    assert len(inner.batches) == 2
+
+
+async def test_full_batch_is_sent_without_waiting_for_the_window():
+    inner = RecordingBatchTranslator()
+    # A window this long would time the test out if max_batch_size were ignored.
+    batcher = BatchingTranslator(inner, window_seconds=30, max_batch_size=2)
+
+    results = await asyncio.wait_for(asyncio.gather(
+        batcher.translate('하나', 'en-US'),
+        batcher.translate('둘', 'en-US'),
+    ), timeout=1)
+
+    assert results == ['en-US::하나', 'en-US::둘']
+    assert inner.batches == [(['하나', '둘'], 'en-US')]
+
+
+async def test_failed_batch_fails_every_caller():
+    batcher = BatchingTranslator(RecordingBatchTranslator(fail=True), window_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.translate('하나', 'en-US'),
+        batcher.translate('둘', 'en-US'),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_burst_from_one_split_is_one_request_delivered_in_order():
+    inner = RecordingBatchTranslator()
+    pusher = FakePusher()
+    separator = make_separator(
+        simple_split, translator=BatchingTranslator(inner, window_seconds=0.01), pusher=pusher)
+    await separator.start()
+    try:
+        await separator.offer(dto('하나입니다.둘입니다.셋입니다.', segment_id=1, sequence=1))
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+    finally:
+        await separator.stop()
+
+    assert inner.batches == [(['하나입니다.', '둘입니다.', '셋입니다.'], 'en-US')]
+    assert pusher.pushed == [
+        ('하나입니다.', 'en-US::하나입니다.'),
+        ('둘입니다.', 'en-US::둘입니다.'),
+        ('셋입니다.', 'en-US::셋입니다.'),
+    ]
+
+
+async def test_deepl_translate_batch_sends_every_text_in_one_call():
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        return httpx.Response(200, json={"translations": [{"text": t.upper()} for t in body["text"]]})
+
+    service = DeeplTranslationService('k:fx', transport=httpx.MockTransport(handler))
+    try:
+        results = await service.translate_batch(['a', 'b', 'c'], 'de')
+        with pytest.raises(ValueError):
+            await service.translate_batch(['x'] * 51, 'de')
+    finally:
+        await service.aclose()
+
+    assert [str(r) for r in results] == ['A', 'B', 'C']
+    assert len(requests) == 1 and requests[0]["text"] == ['a', 'b', 'c']
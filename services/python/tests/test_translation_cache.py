@@ -0,0 +1,126 @@
+"""In-process LRU/TTL translation cache in front of DeepL.
+
+Repeated liturgical phrases must be answered from memory (no DeepL call, no
+billed characters), bounded in size and age, and skippable per session.
+"""
+from prometheus_client import REGISTRY
+
+from src.translation.cache import CachingTranslator, translation_cache_bypassed
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+class CountingTranslator:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    async def translate(self, source_text, target_language):
+        self.calls.append((source_text, target_language))
+        return f'{target_language}::{source_text}'
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_repeated_sentence_is_served_from_cache():
+    inner = CountingTranslator()
+    cache = CachingTranslator(inner)
+
+    first = await cache.translate('평안을 빕니다.', 'en-US')
+    second = await cache.translate('평안을 빕니다.', 'en-US')
+
+    assert first == second == 'en-US::평안을 빕니다.'
+    assert len(inner.calls) == 1
+
+
+async def test_key_normalizes_whitespace_and_separates_languages():
+    inner = CountingTranslator()
+    cache = CachingTranslator(inner)
+
+    await cache.translate('주님의  은혜가\n함께 하시길.', 'en-US')
+    await cache.translate(' 주님의 은혜가 함께 하시길. ', 'EN-us')
+    await cache.translate('주님의 은혜가 함께 하시길.', 'zh')
+
+    # Spacing differences hit; a different target language is its own entry.
+    assert len(inner.calls) == 2
+
+
+async def test_entries_expire_after_ttl():
+    inner = CountingTranslator()
+    clock = FakeClock()
+    cache = CachingTranslator(inner, ttl_seconds=60, clock=clock)
+    before = sample('neemba_translation_cache_evictions_total', {'reason': 'ttl'})
+
+    await cache.translate('아멘.', 'en-US')
+    clock.now += 61
+    await cache.translate('아멘.', 'en-US')
+
+    assert len(inner.calls) == 2
+    assert sample('neemba_translation_cache_evictions_total', {'reason': 'ttl'}) == before + 1
+
+
+async def test_least_recently_used_entry_is_evicted_at_capacity():
+    inner = CountingTranslator()
+    cache = CachingTranslator(inner, max_entries=2)
+    before = sample('neemba_translation_cache_evictions_total', {'reason': 'size'})
+
+    await cache.translate('하나', 'en-US')
+    await cache.translate('둘', 'en-US')
+    await cache.translate('하나', 'en-US')  # refresh: '둘' is now the LRU
+    await cache.translate('셋', 'en-US')    # evicts '둘'
+
+    assert cache.size == 2
+    await cache.translate('하나', 'en-US')
+    assert [text for text, _ in inner.calls] == ['하나', '둘', '셋']
+    assert sample('neemba_translation_cache_evictions_total', {'reason': 'size'}) == before + 1
+
+
+async def test_hits_and_misses_are_counted():
+    cache = CachingTranslator(CountingTranslator())
+    hits = sample('neemba_translation_cache_lookups_total', {'result': 'hit'})
+    misses = sample('neemba_translation_cache_lookups_total', {'result': 'miss'})
+
+    await cache.translate('카운트 문장', 'en-US')
+    await cache.translate('카운트 문장', 'en-US')
+
+    assert sample('neemba_translation_cache_lookups_total', {'result': 'miss'}) == misses + 1
+    assert sample('neemba_translation_cache_lookups_total', {'result': 'hit'}) == hits + 1
+
+
+async def test_bypass_neither_reads_nor_fills_the_cache():
+    inner = CountingTranslator()
+    cache = CachingTranslator(inner)
+
+    with translation_cache_bypassed():
+        await cache.translate('새 번역', 'en-US')
+        await cache.translate('새 번역', 'en-US')
+
+    assert len(inner.calls) == 2
+    assert cache.size == 0
+
+
+async def test_session_can_opt_out_of_the_cache():
+    inner = CountingTranslator()
+    pusher = FakePusher()
+    separator = make_separator(simple_split, translator=CachingTranslator(inner), pusher=pusher)
+    separator.set_translation_cache('fresh', enabled=False)
+    await separator.start()
+    try:
+        for sequence in (1, 2):
+            await separator.offer(dto('같은 문장입니다.', segment_id=1, sequence=sequence, session_id='cached'))
+            await separator.offer(dto('같은 문장입니다.', segment_id=1, sequence=sequence, session_id='fresh'))
+        assert await eventually(lambda: len(pusher.pushed) == 4)
+    finally:
+        await separator.stop()
+
+    # 'cached' hits on its repeat; 'fresh' pays for both of its sentences.
+    assert len(inner.calls) == 3
@@ -0,0 +1,187 @@
+"""Persistent translation memory (``app.translation_memory``) + warm-up job.
+
+Runs against a fake asyncpg pool that models the table as a dict keyed on
+the primary key, so the tests pin the behavior (restart survival, coalesced
+lookups, masked-safe rule, DB-failure degradation, warm-up precedence)
+without a real database.
+"""
+import asyncio
+
+from src.translation.memory import (
+    TranslationMemoryTranslator,
+    source_hash,
+    translation_source_language,
+)
+from src.translation.warmup import seed_translation_memory
+
+
+class _FakeConn:
+    def __init__(self, db: "_FakeDb") -> None:
+        self.db = db
+
+    async def fetch(self, sql: str, *args):
+        self.db.queries.append(sql)
+        if self.db.fail:
+            raise ConnectionError('unreachable')
+        if "FROM app.translation_memory" in sql:
+            source_lang, hashes, targets = args
+            return [
+                {"source_hash": h, "target_lang": t, "translated_text": self.db.memory[(h, source_lang, t)]}
+                for h, t in zip(hashes, targets, strict=True)
+                if (h, source_lang, t) in self.db.memory
+            ]
+        if "FROM app.translations" in sql:
+            before_id, limit = args
+            rows = [r for r in self.db.history if before_id is None or r["id"] < before_id]
+            return sorted(rows, key=lambda r: r["id"], reverse=True)[:limit]
+        raise AssertionError(sql)
+
+    async def executemany(self, sql: str, entries):
+        assert "INSERT INTO app.translation_memory" in sql and "DO NOTHING" in sql
+        for source_hash_, source_lang, target_lang, source_text, translated in entries:
+            self.db.memory.setdefault((source_hash_, source_lang, target_lang), translated)
+            self.db.source_texts.append(source_text)
+
+
+class _FakeAcquire:
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def __aenter__(self):
+        return self._conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeDb:
+    def __init__(self) -> None:
+        self.memory: dict[tuple[str, str, str], str] = {}
+        self.history: list[dict] = []
+        self.queries: list[str] = []
+        self.source_texts: list[str] = []
+        self.fail = False
+
+    def acquire(self):
+        return _FakeAcquire(_FakeConn(self))
+
+
+class CountingTranslator:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def translate(self, source_text, target_language):
+        self.calls.append(source_text)
+        return f'{target_language}::{source_text}'
+
+    async def aclose(self) -> None: ...
+
+
+async def test_translation_survives_a_restart():
+    db = _FakeDb()
+    first_inner = CountingTranslator()
+    first = TranslationMemoryTranslator(first_inner, db)
+    assert await first.translate('은혜와 평강이 있기를.', 'en-US') == 'en-US::은혜와 평강이 있기를.'
+    await first.aclose()  # waits for the write-back
+
+    # A fresh process (new translator, same table) answers without DeepL.
+    second_inner = CountingTranslator()
+    second = TranslationMemoryTranslator(second_inner, db)
+    result = await second.translate('은혜와  평강이 있기를.', 'EN-US')
+
+    assert str(result) == 'en-US::은혜와 평강이 있기를.'
+    assert result.billed_characters == 0
+    assert first_inner.calls == ['은혜와 평강이 있기를.']
+    assert second_inner.calls == []
+
+
+async def test_concurrent_lookups_share_one_query():
+    db = _FakeDb()
+    memory = TranslationMemoryTranslator(CountingTranslator(), db)
+
+    await asyncio.gather(
+        memory.translate('첫째 문장.', 'en-US'),
+        memory.translate('둘째 문장.', 'en-US'),
+        memory.translate('첫째 문장.', 'zh'),
+    )
+
+    lookups = [q for q in db.queries if "FROM app.translation_memory" in q]
+    assert len(lookups) == 1
+
+
+async def test_sentences_with_pii_never_touch_the_memory():
+    db = _FakeDb()
+    inner = CountingTranslator()
+    memory = TranslationMemoryTranslator(inner, db)
+
+    await memory.translate('제 번호는 010-1234-5678 입니다.', 'en-US')
+    await memory.aclose()
+
+    assert db.queries == []
+    assert db.memory == {}
+    assert inner.calls == ['제 번호는 010-1234-5678 입니다.']
+
+
+async def test_db_failure_degrades_to_deepl():
+    db = _FakeDb()
+    db.fail = True
+    inner = CountingTranslator()
+    memory = TranslationMemoryTranslator(inner, db)
+
+    assert await memory.translate('장애 중 문장.', 'en-US') == 'en-US::장애 중 문장.'
+    assert inner.calls == ['장애 중 문장.']
+
+
+async def test_entries_are_keyed_on_the_request_source_language():
+    db = _FakeDb()
+    first = TranslationMemoryTranslator(CountingTranslator(), db)
+    with translation_source_language('en-US'):
+        await first.translate('Grace and peace.', 'ko')
+    await first.aclose()
+    assert list(db.memory) == [(source_hash('Grace and peace.'), 'EN', 'KO')]
+
+    inner = CountingTranslator()
+    second = TranslationMemoryTranslator(inner, db)
+    with translation_source_language('en'):
+        result = await second.translate('Grace and peace.', 'ko')
+    assert result.detected_source_lang == 'EN'
+    # The same text under the default (Korean) source is a different entry.
+    await second.translate('Grace and peace.', 'ko')
+    assert inner.calls == ['Grace and peace.']
+
+
+async def test_cancelled_flush_answers_waiters_as_misses():
+    db = _FakeDb()
+    inner = CountingTranslator()
+    memory = TranslationMemoryTranslator(inner, db)
+
+    waiter = asyncio.create_task(memory.translate('취소된 조회.', 'en-US'))
+    await asyncio.sleep(0)  # waiter registered, flush not yet run
+    memory._flush_task.cancel()
+
+    assert await asyncio.wait_for(waiter, 1.0) == 'en-US::취소된 조회.'
+    assert memory._pending == {} and memory._flush_task is None
+
+
+def history_row(id_: int, source: str, translated: str, source_lang='ko-KR', target_lang='en-US') -> dict:
+    return {"id": id_, "source_text": source, "translated_text": translated,
+            "source_lang": source_lang, "target_lang": target_lang}
+
+
+async def test_warmup_seeds_newest_translation_per_sentence():
+    db = _FakeDb()
+    db.history = [
+        history_row(1, '할렐루야.', 'Hallelujah (old).'),
+        history_row(2, '연락처는 [PHONE] 입니다.', 'Contact is [PHONE].'),
+        history_row(3, '할렐루야.', 'Hallelujah!'),
+        history_row(4, 'Hello.', '안녕하세요.', source_lang='en', target_lang='ko'),
+        history_row(5, '목록.', 'List.', target_lang=None),
+    ]
+
+    await seed_translation_memory(db, page_size=2)
+
+    assert db.memory == {(source_hash('할렐루야.'), 'KO', 'EN-US'): 'Hallelujah!'}
+    # The seeded row is then a hit for the live path.
+    inner = CountingTranslator()
+    assert str(await TranslationMemoryTranslator(inner, db).translate('할렐루야.', 'en-US')) == 'Hallelujah!'
+    assert inner.calls == []
@@ -0,0 +1,253 @@
+"""Deadline budget, hedged retries and circuit breaker around DeepL.
+
+A DeepL failure used to drop the sentence and a slow call had no bound. Now
+each sentence carries a deadline, each DeepL request is retried / hedged
+within it, and a tripped breaker fails fast instead of queueing more calls
+against an unhealthy backend.
+"""
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.deepL.deepL import DeeplError
+from src.translation.batcher import BatchingTranslator
+from src.translation.ratelimit import RateLimitedTranslator
+from src.translation.resilience import (
+    AdmissionTimeoutError,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTranslator,
+    current_translation_deadline,
+    translation_deadline,
+)
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+class ScriptedBackend:
+    """Plays one scripted step per request: an exception to raise or a
+    delay (seconds) before answering."""
+
+    def __init__(self, *steps) -> None:
+        self.steps = list(steps)
+        self.calls = 0
+        self.deadlines: list[float | None] = []
+
+    async def translate_batch(self, source_texts, target_language):
+        self.calls += 1
+        self.deadlines.append(current_translation_deadline())
+        step = self.steps.pop(0) if self.steps else 0
+        if isinstance(step, BaseException):
+            raise step
+        await asyncio.sleep(step)
+        return [f'{target_language}::{text}' for text in source_texts]
+
+    async def aclose(self):
+        return None
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def resilient(backend, **kwargs) -> ResilientTranslator:
+    kwargs.setdefault('backoff_seconds', 0)
+    kwargs.setdefault('hedging_enabled', False)
+    return ResilientTranslator(backend, **kwargs)
+
+
+async def test_transient_errors_are_retried():
+    before = sample('neemba_translation_retries_total', reason='http_503')
+    backend = ScriptedBackend(DeeplError(503, 'busy'), 0)
+
+    result = await resilient(backend).translate('안녕하세요', 'EN-US')
+
+    assert result == 'EN-US::안녕하세요'
+    assert backend.calls == 2
+    assert sample('neemba_translation_retries_total', reason='http_503') == before + 1
+
+
+async def test_client_errors_are_not_retried():
+    backend = ScriptedBackend(DeeplError(456, 'quota exceeded'))
+
+    with pytest.raises(DeeplError):
+        await resilient(backend).translate('안녕하세요', 'EN-US')
+
+    assert backend.calls == 1
+
+
+async def test_slow_attempt_times_out_and_is_retried():
+    backend = ScriptedBackend(10, 0)
+
+    result = await resilient(backend, attempt_timeout_seconds=0.05).translate('느림', 'EN-US')
+
+    assert result == 'EN-US::느림'
+    assert backend.calls == 2
+
+
+async def test_slow_request_is_hedged_and_the_fast_copy_wins():
+    before = sample('neemba_translation_hedges_total', winner='hedge')
+    backend = ScriptedBackend(10, 0)
+    translator = resilient(
+        backend, hedging_enabled=True, hedge_initial_delay_seconds=0.02, attempt_timeout_seconds=1.0)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await translator.translate('헤지', 'EN-US')
+
+    assert result == 'EN-US::헤지'
+    assert loop.time() - started < 0.5
+    assert backend.calls == 2
+    assert sample('neemba_translation_hedges_total', winner='hedge') == before + 1
+
+
+def single_slot(backend) -> RateLimitedTranslator:
+    return RateLimitedTranslator(
+        backend, initial_concurrency=1, max_concurrency=1, max_chars_per_second=1e6)
+
+
+async def test_limiter_queueing_neither_hedges_nor_trips_the_breaker():
+    hedges = (sample('neemba_translation_hedges_total', winner='primary')
+              + sample('neemba_translation_hedges_total', winner='hedge'))
+    backend = ScriptedBackend(*[0.03] * 8)
+    translator = resilient(
+        single_slot(backend), hedging_enabled=True, hedge_initial_delay_seconds=0.05,
+        attempt_timeout_seconds=0.1, breaker_failure_threshold=1)
+
+    # One slot, eight requests: the last waits ~0.2 s to be admitted, well
+    # past both the hedge delay and the attempt timeout.
+    results = await asyncio.gather(*(translator.translate(f'문장{i}', 'EN-US') for i in range(8)))
+
+    assert results == [f'EN-US::문장{i}' for i in range(8)]
+    assert backend.calls == 8
+    assert (sample('neemba_translation_hedges_total', winner='primary')
+            + sample('neemba_translation_hedges_total', winner='hedge')) == hedges
+    assert translator.breaker.state == 'closed'
+
+
+async def test_deadline_spent_in_the_limiter_queue_is_not_a_breaker_failure():
+    backend = ScriptedBackend(0.3)
+    translator = resilient(single_slot(backend), attempt_timeout_seconds=1.0,
+                           breaker_failure_threshold=1)
+    first = asyncio.create_task(translator.translate('먼저', 'EN-US'))
+    await asyncio.sleep(0.01)
+
+    loop = asyncio.get_running_loop()
+    with translation_deadline(loop.time() + 0.05), pytest.raises(AdmissionTimeoutError):
+        await translator.translate('나중', 'EN-US')
+
+    assert translator.breaker.state == 'closed'
+    assert await first == 'EN-US::먼저'
+    assert backend.calls == 1
+
+
+def test_hedge_threshold_follows_observed_p95():
+    translator = resilient(ScriptedBackend(), hedge_min_delay_seconds=0.01)
+    assert translator.hedge_delay() == translator.hedge_initial_delay_seconds
+
+    for i in range(100):
+        translator.latency.observe((i + 1) / 1000)
+
+    assert translator.hedge_delay() == pytest.approx(0.096)
+
+
+async def test_breaker_opens_fails_fast_and_recovers_through_a_trial():
+    now = [0.0]
+    backend = ScriptedBackend(*(DeeplError(500, 'down') for _ in range(2)))
+    translator = resilient(
+        backend, max_attempts=1, breaker_failure_threshold=2, breaker_reset_seconds=30,
+        clock=lambda: now[0])
+
+    for _ in range(2):
+        with pytest.raises(DeeplError):
+            await translator.translate('문장', 'EN-US')
+    assert translator.breaker.state == 'open'
+    assert sample('neemba_translation_breaker_state') == 2.0
+
+    with pytest.raises(CircuitOpenError):
+        await translator.translate('문장', 'EN-US')
+    assert backend.calls == 2
+
+    now[0] = 31.0
+    assert await translator.translate('문장', 'EN-US') == 'EN-US::문장'
+    assert translator.breaker.state == 'closed'
+    assert sample('neemba_translation_breaker_state') == 0.0
+
+
+def test_failed_half_open_trial_reopens_the_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=5, clock=lambda: now[0])
+    for _ in range(3):
+        breaker.record_failure()
+    now[0] = 6.0
+
+    assert breaker.allow()
+    # Only one trial request at a time while half-open.
+    assert not breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == 'open'
+
+
+async def test_client_error_during_the_trial_releases_the_trial_slot():
+    now = [0.0]
+    # The 456 stands for the balancer's synthetic "no usable DeepL key".
+    backend = ScriptedBackend(DeeplError(500, 'down'), DeeplError(456, 'quota'))
+    translator = resilient(
+        backend, max_attempts=1, breaker_failure_threshold=1, breaker_reset_seconds=30,
+        clock=lambda: now[0])
+    with pytest.raises(DeeplError):
+        await translator.translate('문장', 'EN-US')
+    now[0] = 31.0
+
+    with pytest.raises(DeeplError):
+        await translator.translate('문장', 'EN-US')
+    # Not stuck half-open with the trial slot taken: the next call is the
+    # new trial, and it closes the breaker.
+    assert await translator.translate('문장', 'EN-US') == 'EN-US::문장'
+    assert translator.breaker.state == 'closed'
+
+
+async def test_spent_deadline_is_not_attempted():
+    backend = ScriptedBackend()
+    loop = asyncio.get_running_loop()
+
+    with translation_deadline(loop.time() - 1), pytest.raises(TimeoutError):
+        await resilient(backend).translate('늦음', 'EN-US')
+
+    assert backend.calls == 0
+
+
+async def test_batch_request_carries_the_earliest_deadline():
+    backend = ScriptedBackend()
+    batcher = BatchingTranslator(backend, window_seconds=0.01)
+
+    async def call(text, deadline):
+        with translation_deadline(deadline):
+            return await batcher.translate(text, 'EN-US')
+
+    await asyncio.gather(call('하나', 100.0), call('둘', 50.0), call('셋', None))
+
+    assert backend.deadlines == [50.0]
+
+
+async def test_sentence_past_its_deadline_is_dropped_not_delayed():
+    class Hanging:
+        async def translate(self, source_text, target_language):
+            if '멈춤' in source_text:
+                await asyncio.sleep(10)
+            return f'EN::{source_text}'
+
+    before = sample('neemba_translation_deadline_exceeded_total')
+    pusher = FakePusher()
+    separator = make_separator(simple_split, translator=Hanging(), pusher=pusher)
+    separator._translation_deadline = 0.1
+    await separator.start()
+    try:
+        await separator.offer(dto('멈춤.다음 문장.', segment_id=1, sequence=1))
+        assert await eventually(lambda: pusher.sources() == ['다음 문장.'])
+    finally:
+        await separator.stop()
+
+    assert sample('neemba_translation_deadline_exceeded_total') == before + 1
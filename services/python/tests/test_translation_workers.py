@@ -0,0 +1,126 @@
+"""Concurrent translation workers with per-session in-order delivery.
+
+A single ``_push_loop`` let one slow DeepL response head-of-line block every
+session. With N workers the slow sentence only delays later sentences of its
+own session — the reorder buffer still delivers each session in source order.
+"""
+import asyncio
+from unittest import mock
+
+from prometheus_client import REGISTRY
+
+from src.separator.kss_separator import SentenceSeparator
+from tests.test_separator_pipeline import FakePusher, eventually, simple_split
+from tests.test_separator_segments import dto
+
+
+class GatedTranslator:
+    """Blocks sentences containing 'slow' until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def translate(self, source_text, target_language):
+        if 'slow' in source_text:
+            await self.release.wait()
+        return f'EN::{source_text}'
+
+
+def make_separator(translator, pusher, workers: int, *,
+                   batch_window_seconds: float = 0, max_batch_size: int = 1) -> SentenceSeparator:
+    with mock.patch('src.separator.kss_separator.Kss'):
+        separator = SentenceSeparator(
+            translator, pusher,
+            # By default one sentence per batch so consecutive sentences
+            # land on different workers.
+            batch_window_seconds=batch_window_seconds, max_batch_size=max_batch_size,
+            translation_workers=workers)
+    separator.splitter = simple_split
+    return separator
+
+
+async def test_slow_sentence_does_not_block_other_sessions():
+    translator = GatedTranslator()
+    pusher = FakePusher()
+    separator = make_separator(translator, pusher, workers=2)
+    await separator.start()
+    try:
+        await separator.offer(dto('A slow 문장.', segment_id=1, sequence=1, session_id='A'))
+        await separator.offer(dto('B 문장.', segment_id=1, sequence=1, session_id='B'))
+
+        assert await eventually(lambda: pusher.sources() == ['B 문장.'])
+
+        translator.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 2)
+    finally:
+        await separator.stop()
+
+
+async def test_slow_sentence_does_not_hold_back_its_burst():
+    translator = GatedTranslator()
+    pusher = FakePusher()
+    # A single worker taking both sessions' sentences as one burst.
+    separator = make_separator(translator, pusher, workers=1,
+                               batch_window_seconds=0.2, max_batch_size=16)
+    await separator.start()
+    try:
+        await separator.offer(dto('A slow 문장.', segment_id=1, sequence=1, session_id='A'))
+        await separator.offer(dto('B 문장.', segment_id=1, sequence=1, session_id='B'))
+
+        assert await eventually(lambda: pusher.sources() == ['B 문장.'])
+
+        translator.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 2)
+    finally:
+        await separator.stop()
+
+
+async def test_session_order_is_kept_when_workers_finish_out_of_order():
+    translator = GatedTranslator()
+    pusher = FakePusher()
+    separator = make_separator(translator, pusher, workers=3)
+    await separator.start()
+    try:
+        await separator.offer(dto('첫째 slow.둘째.셋째.', segment_id=1, sequence=1))
+        # The later sentences are translated already but must wait.
+        await asyncio.sleep(0.1)
+        assert pusher.pushed == []
+
+        translator.release.set()
+        assert await eventually(lambda: len(pusher.pushed) == 3)
+        assert pusher.sources() == ['첫째 slow.', '둘째.', '셋째.']
+        # Nothing in flight → the session's reorder state is released.
+        assert separator._reorder == {}
+    finally:
+        await separator.stop()
+
+
+async def test_failed_sentence_does_not_stall_its_session():
+    class FailFirst:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def translate(self, source_text, target_language):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError('boom')
+            return f'EN::{source_text}'
+
+    pusher = FakePusher()
+    separator = make_separator(FailFirst(), pusher, workers=2)
+    await separator.start()
+    try:
+        await separator.offer(dto('실패.성공.', segment_id=1, sequence=1))
+        assert await eventually(lambda: pusher.sources() == ['성공.'])
+    finally:
+        await separator.stop()
+
+
+async def test_worker_count_is_exported():
+    separator = make_separator(GatedTranslator(), FakePusher(), workers=3)
+    await separator.start()
+    try:
+        assert REGISTRY.get_sample_value('neemba_translation_workers') == 3.0
+        assert REGISTRY.get_sample_value('neemba_translation_workers_busy') == 0.0
+    finally:
+        await separator.stop()
@@ -0,0 +1,90 @@
+"""Pluggable translator backends + the deterministic offline translator.
+
+``TRANSLATOR_BACKEND=offline`` must let the full pipeline run with no network
+and no DeepL key: same protocol, reproducible output, configurable latency
+and error rate.
+"""
+import asyncio
+
+import pytest
+
+from src.deepL.deepL import DeeplError, DeeplTranslationService
+from src.translation.offline import PseudoTranslator, pseudo_translate
+from src.translation.registry import available_translators, create_translator
+from tests.test_separator_pipeline import FakePusher, eventually, make_separator, simple_split
+from tests.test_separator_segments import dto
+
+
+def test_registry_lists_builtin_backends():
+    assert {'deepl', 'offline'} <= set(available_translators())
+
+
+def test_unknown_backend_fails_fast():
+    with pytest.raises(RuntimeError, match='unknown translator backend'):
+        create_translator('babelfish')
+
+
+def test_offline_backend_needs_no_deepl_key(monkeypatch):
+    monkeypatch.delenv('DEEPL_API_KEY', raising=False)
+    monkeypatch.setenv('OFFLINE_TRANSLATOR_LATENCY_MEDIAN_SECONDS', '0')
+    monkeypatch.setenv('OFFLINE_TRANSLATOR_ERROR_RATE', '0.25')
+
+    translator = create_translator('offline')
+
+    assert isinstance(translator, PseudoTranslator)
+    assert translator.latency_median_seconds == 0
+    assert translator.error_rate == 0.25
+
+
+async def test_deepl_backend_reads_its_key(monkeypatch):
+    monkeypatch.setenv('DEEPL_API_KEY', 'key:fx')
+
+    translator = create_translator('deepl')
+    await translator.aclose()
+
+    assert isinstance(translator, DeeplTranslationService)
+
+
+async def test_pseudo_translation_is_deterministic():
+    translator = PseudoTranslator(latency_median_seconds=0)
+
+    first = await translator.translate('은혜로운 아침입니다.', 'en-US')
+    batch = await translator.translate_batch(['은혜로운 아침입니다.', '둘'], 'en-US')
+
+    assert str(first) == str(batch[0]) == pseudo_translate('은혜로운 아침입니다.', 'en-US')
+    assert first.billed_characters == len('은혜로운 아침입니다.')
+
+
+def test_seeded_latency_is_reproducible():
+    a = PseudoTranslator(latency_median_seconds=0.1, latency_sigma=0.8, seed=7)
+    b = PseudoTranslator(latency_median_seconds=0.1, latency_sigma=0.8, seed=7)
+
+    samples = [a._sample_latency() for _ in range(20)]
+
+    assert samples == [b._sample_latency() for _ in range(20)]
+    assert len(set(samples)) > 1
+
+
+async def test_error_rate_raises_deepl_style_errors():
+    translator = PseudoTranslator(latency_median_seconds=0, error_rate=1.0)
+
+    with pytest.raises(DeeplError) as exc_info:
+        await translator.translate('실패', 'en-US')
+
+    assert exc_info.value.status_code == 503
+
+
+async def test_pipeline_runs_end_to_end_on_the_offline_backend():
+    pusher = FakePusher()
+    separator = make_separator(
+        simple_split, translator=PseudoTranslator(latency_median_seconds=0.01, seed=1), pusher=pusher)
+    await separator.start()
+    try:
+        await asyncio.gather(*(
+            separator.offer(dto(f'{i}번째 문장입니다.', segment_id=1, sequence=i)) for i in range(1, 6)))
+        assert await eventually(lambda: len(pusher.pushed) == 5)
+    finally:
+        await separator.stop()
+
+    assert [str(t) for _, t in pusher.pushed] == [
+        pseudo_translate(f'{i}번째 문장입니다.', 'en-US') for i in range(1, 6)]
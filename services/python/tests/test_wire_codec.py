@@ -0,0 +1,76 @@
+"""Pluggable wire codec for transcript messages.
+
+``_parse_request`` did ``json.loads(raw.decode('utf-8'))`` and built the DTO
+field by field. ``decode_request`` parses bytes directly (orjson when
+installed) into the slotted DTO, picks the codec from the ``Content-Type``
+NATS header, and anything it cannot decode stays an unparseable message:
+termed and counted exactly as before.
+"""
+import json
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.consumer import codec
+from src.consumer.codec import UnsupportedContentType, decode_request
+from tests.test_consumer_dedup import FakeMsg, make_consumer
+
+MESSAGE = {
+    'sessionId': 's1', 'segmentId': 3, 'sequence': 7,
+    'transcriptText': '오늘 말씀은 "사랑"입니다.', 'targetLanguage': 'en-US',
+    'sourceLanguage': 'ko-KR',
+}
+
+
+def unparseable():
+    return REGISTRY.get_sample_value('neemba_consumer_unparseable_total') or 0.0
+
+
+def test_json_without_headers_decodes_into_the_slotted_dto():
+    request = decode_request(json.dumps(MESSAGE).encode('utf-8'))
+
+    assert (request.session_id, request.segment_id, request.sequence) == ('s1', 3, 7)
+    assert request.source_text == '오늘 말씀은 "사랑"입니다.'
+    assert (request.target_lang, request.source_lang) == ('en-US', 'ko-KR')
+    assert not hasattr(request, '__dict__')
+
+
+def test_fast_json_parser_matches_the_stdlib():
+    raw = json.dumps({**MESSAGE, 'sourceLanguage': None}, ensure_ascii=False).encode('utf-8')
+
+    assert codec._loads_json(raw) == codec._loads_json_stdlib(raw)
+
+
+def test_content_type_header_selects_the_codec():
+    raw = json.dumps(MESSAGE).encode('utf-8')
+
+    assert decode_request(raw, {'Content-Type': 'application/json; charset=utf-8'}).sequence == 7
+    with pytest.raises(UnsupportedContentType):
+        decode_request(raw, {'Content-Type': 'application/protobuf'})
+
+
+def test_msgpack_payload_decodes_like_json():
+    msgpack = pytest.importorskip('msgpack')
+
+    request = decode_request(msgpack.packb(MESSAGE), {'Content-Type': 'application/msgpack'})
+
+    assert request == decode_request(json.dumps(MESSAGE).encode('utf-8'))
+
+
+@pytest.mark.parametrize('raw, headers', [
+    (b'not-json', None),
+    (b'\xff\xfe', None),
+    (b'[1, 2]', None),
+    (json.dumps({'sessionId': 's1'}).encode('utf-8'), None),
+    (json.dumps(MESSAGE).encode('utf-8'), {'Content-Type': 'application/protobuf'}),
+])
+async def test_undecodable_messages_are_termed_and_counted(raw, headers):
+    consumer = make_consumer()
+    message = FakeMsg(raw)
+    message.headers = headers
+    before = unparseable()
+
+    await consumer._handle_message(message)
+
+    assert message.termed and not message.acked and not message.naked
+    assert unparseable() == before + 1